@@ -0,0 +1,55 @@
+import argparse
+import json
+import sys
+
+from . import suite
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Benchmarks of game_of_life.')
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmarks.')
+    run_parser.add_argument('-s', '--sizes', type=int, nargs='+', default=suite.workloads.SIZES,
+                            help='Board sizes to run (default: all).')
+    run_parser.add_argument('-n', '--generations', type=int, default=10)
+    run_parser.add_argument('-r', '--repeat', type=int, default=3)
+    run_parser.add_argument('--real-tk', action='store_true',
+                            help='Draw on a real canvas, e.g. under Xvfb.')
+    run_parser.add_argument('-o', '--output', help='Write the JSON report to this file.')
+
+    compare_parser = subparsers.add_parser('compare',
+                                           help='Flag regressions against a baseline.')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                                help='Allowed slowdown ratio (default: 0.1).')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = suite.run_suite(sizes=args.sizes,
+                                 generations=args.generations,
+                                 repeat=args.repeat,
+                                 real_tk=args.real_tk,
+                                 log=lambda line: print(line, file=sys.stderr))
+        if args.output is not None:
+            suite.save(report, args.output)
+        else:
+            json.dump(report, sys.stdout, indent=2)
+    elif args.command == 'compare':
+        regressions = suite.compare(suite.load(args.baseline), suite.load(args.current),
+                                    threshold=args.threshold)
+        for name, base_rate, rate in regressions:
+            print('REGRESSION {}: {:.2f} -> {:.2f} generations/s'.format(name, base_rate, rate))
+        if regressions:
+            return 1
+        print('No regression.')
+    else:
+        parser.print_help()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
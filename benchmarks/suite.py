@@ -0,0 +1,196 @@
+"""Timing of the model and view hot paths.
+
+Every benchmark is timed on its own and then run once more under tracemalloc
+to measure its peak memory, so the timing is not slowed down by tracing.
+"""
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from tkinter import Canvas
+from unittest import mock
+
+from game_of_life.model import Patterns
+from game_of_life.view import Grid
+
+from . import workloads
+
+
+def _close(world):
+    if hasattr(world, 'close'):
+        world.close()
+
+
+def _measure(func, repeat, setup=lambda: None, teardown=lambda arg: None):
+    """Return the best time of func(setup()) over repeat runs, and its peak memory.
+
+    Only func() is timed, while the peak memory includes setup() too.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+        teardown(arg)
+
+    tracemalloc.start()
+    try:
+        arg = setup()
+        func(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    teardown(arg)
+    return best, peak
+
+
+def _result(name, size, seconds, peak, generations=1):
+    rate = generations / seconds if seconds > 0 else float('inf')
+    return {
+        'name': name,
+        'size': size,
+        'generations': generations,
+        'seconds': seconds,
+        'generations_per_s': rate,
+        'cells_per_s': rate * size * size,
+        'peak_memory_bytes': peak,
+    }
+
+
+def bench_advance(workload, size, engine, generations, repeat):
+    seconds, peak = _measure(lambda world: world.advance(generations=generations), repeat,
+                             setup=lambda: workloads.create(workload, size, engine),
+                             teardown=_close)
+    name = 'advance/{}/{}/{}'.format(engine, workload.__name__, size)
+    return _result(name, size, seconds, peak, generations)
+
+
+def bench_alives(workload, size, engine, repeat):
+    world = workloads.create(workload, size, engine)
+    seconds, peak = _measure(lambda _: world.alives, repeat)
+    _close(world)
+    name = 'alives/{}/{}/{}'.format(engine, workload.__name__, size)
+    return _result(name, size, seconds, peak)
+
+
+def bench_as_screen_coordinate(size, repeat):
+    results = []
+    for p in Patterns:
+        seconds, peak = _measure(lambda _: p.as_screen_coordinate(size, size), repeat)
+        name = 'as_screen_coordinate/{}/{}'.format(p.name, size)
+        results.append(_result(name, size, seconds, peak))
+    return results
+
+
+class _FakeCanvas(object):
+    """Replaces the Tk calls of Canvas, so Grid runs without a display."""
+
+    def __init__(self):
+        self._items = 0
+
+    def create_rectangle(self, *args, **kwargs):
+        self._items += 1
+        return self._items
+
+    def patches(self):
+        return (mock.patch.object(Canvas, '__init__', return_value=None),
+                mock.patch.object(Canvas, 'bind'),
+                mock.patch.object(Canvas, 'itemconfig'),
+                mock.patch.object(Canvas, 'tk', mock.Mock(), create=True),
+                mock.patch.object(Canvas, '_w', '.grid', create=True),
+                mock.patch.object(Canvas, 'create_rectangle', self.create_rectangle))
+
+
+def bench_grid_set_alives(workload, size, generations, repeat, real_tk=False):
+    """Time Grid.set_alives() following a world for some generations.
+
+    With real_tk the cells are drawn on a real canvas, e.g. under Xvfb.
+    Otherwise the Tk calls of the canvas are mocked away.
+    """
+    frames = []
+    world = workloads.create(workload, size, 'counting')
+    for _ in range(generations):
+        world.advance()
+        frames.append(world.alives)
+
+    patches = () if real_tk else _FakeCanvas().patches()
+    for p in patches:
+        p.start()
+    try:
+        grid = Grid(size, size)
+
+        def run(_):
+            for alives in frames:
+                grid.set_alives(alives)
+            grid.set_alives(())
+
+        seconds, peak = _measure(run, repeat)
+    finally:
+        for p in patches:
+            p.stop()
+
+    name = 'grid.set_alives/{}/{}'.format(workload.__name__, size)
+    return _result(name, size, seconds, peak, generations)
+
+
+# Engines fast enough for each board size.
+ENGINES_BY_SIZE = {
+    50: ('classic', 'counting', 'incremental', 'bitwise', 'numpy'),
+    200: ('counting', 'incremental', 'bitwise', 'numpy'),
+    1024: ('bitwise', 'numpy'),
+    4096: ('bitwise', 'numpy'),
+}
+
+
+def run_suite(sizes=workloads.SIZES, generations=10, repeat=3, real_tk=False, log=None):
+    results = []
+
+    def add(result):
+        results.append(result)
+        if log is not None:
+            log('{name}: {generations_per_s:.2f} generations/s'.format(**result))
+
+    for size in sizes:
+        for engine in ENGINES_BY_SIZE.get(size, ('bitwise',)):
+            for workload in workloads.WORKLOADS:
+                add(bench_advance(workload, size, engine, generations, repeat))
+            add(bench_alives(workloads.soup(0.3), size, engine, repeat))
+        for result in bench_as_screen_coordinate(size, repeat):
+            add(result)
+        if size <= 200:
+            add(bench_grid_set_alives(workloads.soup(0.3), size, generations, repeat,
+                                      real_tk=real_tk))
+
+    return {
+        'python': sys.version,
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=0.1):
+    """Return the benchmarks slower than the baseline by more than threshold.
+
+    Each regression is (name, baseline generations/s, current generations/s).
+    """
+    baseline_rates = {r['name']: r['generations_per_s'] for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        base_rate = baseline_rates.get(result['name'])
+        if base_rate is None:
+            continue
+        if result['generations_per_s'] < base_rate * (1 - threshold):
+            regressions.append((result['name'], base_rate, result['generations_per_s']))
+    return regressions
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,55 @@
+import random
+
+from game_of_life.cli import create_engine_world
+from game_of_life.model import Patterns
+
+
+GOSPER_GLIDER_GUN = (
+    '........................O...........',
+    '......................O.O...........',
+    '............OO......OO............OO',
+    '...........O...O....OO............OO',
+    'OO........O.....O...OO..............',
+    'OO........O...O.OO....O.O...........',
+    '..........O.....O.......O...........',
+    '...........O...O....................',
+    '............OO......................',
+)
+
+
+def soup(density, seed=0):
+    """Return a function filling a world randomly with the given density."""
+    def fill(width, height):
+        rand = random.Random(seed)
+        return [(x, y) for y in range(height) for x in range(width)
+                if rand.random() < density]
+    fill.__name__ = 'soup-{}'.format(density)
+    return fill
+
+
+def glider_gun(width, height):
+    """Gosper glider gun at the top left corner."""
+    return [(x + 1, y + 1)
+            for y, row in enumerate(GOSPER_GLIDER_GUN)
+            for x, c in enumerate(row) if c == 'O']
+
+
+def pattern(p):
+    def fill(width, height):
+        return list(p.as_screen_coordinate(width, height))
+    fill.__name__ = 'pattern-{}'.format(p.name.lower().replace(' ', '-'))
+    return fill
+
+
+# Board sizes from small windows to huge headless boards.
+SIZES = (50, 200, 1024, 4096)
+
+WORKLOADS = ((soup(0.1), soup(0.3), soup(0.5), glider_gun) +
+             tuple(pattern(p) for p in Patterns if p.alives))
+
+
+def create(workload, size, engine, workers=None):
+    world = create_engine_world(size, size, engine, workers=workers)
+    for x, y in workload(size, size):
+        world.set_alive(x, y)
+    return world
@@ -1,10 +1,5 @@
-import logging
-
 from game_of_life import cli
 
 
-logging.basicConfig(level=logging.DEBUG)
-
-
 if __name__ == '__main__':
     cli.main()
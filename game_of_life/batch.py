@@ -0,0 +1,267 @@
+"""Stepping many small worlds of the same size together.
+
+Stepping a small world costs mostly Python overhead, whatever the engine.
+A batch packs the rows of many worlds side by side into wide int bitmasks,
+so one step of the bitwise engine advances all of them at once.
+"""
+import logging
+from functools import reduce
+from operator import or_
+
+from .model import BOUNDED, RUNNING, STILL, DEAD, CYCLE
+from .model import _step_rows, _rows_to_cells, create_world
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorldBatch(object):
+    """Worlds of the same size and rule, stepped together as one wide board.
+
+    Row y of every world is stored in one int, each world in a slot of whole
+    bytes: its cells, then always-dead guard columns so worlds never see the
+    cells of their neighbors. _step_rows() then advances all the worlds with
+    the same number of Python operations as a single one.
+
+    A world is dropped from the batch once it dies, stands still or cycles.
+    Dead and still worlds are found every generation from the whole rows at
+    once. Under B0 rules an empty world is filled at the next generation, so
+    it is only dropped as part of a cycle. Cycles are looked for every
+    check_every generations only, by comparing the cells of each world with
+    the ones of its last history checks. Once one repeats, the world is
+    stepped on its own to find the exact period and the generation the cycle
+    started at, so a cycling world ends as a World tracking its history
+    would: at the first generation repeating an earlier one. A cycle is only
+    found once two checks after its start are a multiple of its period apart
+    though, so one starting shortly before the end of advance() may not be
+    found yet. Dropped worlds are kept running in their slots until more
+    than half of the slots are dropped, then the batch is repacked without
+    them.
+    """
+    ENGINES = ('batch',)
+    SUPPORTS_B0 = True
+    TOPOLOGIES = (BOUNDED,)
+
+    def __init__(self, worlds, check_every=10, history=16):
+        worlds = list(worlds)
+        if not worlds:
+            raise ValueError('worlds must not be empty')
+        if check_every <= 0:
+            raise ValueError('check_every must be larger than 0')
+        if history <= 0:
+            raise ValueError('history must be larger than 0')
+        size, rule = worlds[0].size, worlds[0].rule
+        for world in worlds:
+            if world.size != size or world.rule != rule:
+                raise ValueError('Worlds must have the same size and rule')
+            if world.topology not in self.TOPOLOGIES:
+                raise ValueError('Worlds must be bounded')
+
+        width, height = size
+        self._size = size
+        self._rule = rule
+        self.check_every = check_every
+        self.history = history
+        # Bytes and bits of a slot, at least one guard column included.
+        self._slot_bytes = width // 8 + 1
+        self._slot_bits = 8 * self._slot_bytes
+        self._board_mask = (1 << width) - 1
+
+        count = len(worlds)
+        self._start_generations = [world.generation for world in worlds]
+        self._steps = 0
+        self._end_steps = [None] * count
+        self._statuses = [RUNNING] * count
+        self._periods = [None] * count
+        self._final_rows = [None] * count
+        # The world in each slot, and the cells of the running worlds at the
+        # last checks for cycles.
+        self._slots = list(range(count))
+        self._running = dict()
+        self._checks = dict()
+
+        rows = [0] * height
+        for slot, world in enumerate(worlds):
+            offset = slot * self._slot_bits
+            for x, y in world.alives:
+                rows[y] |= 1 << (offset + x)
+        self._rows = rows
+        self._set_slots(self._slots)
+
+        alive = self._slot_bytes_of(reduce(or_, rows, 0))
+        for slot, index in enumerate(self._slots):
+            self._running[index] = slot
+            self._checks[index] = []
+            if not self._any_in_slot(alive, slot) and not rule.has_b0:
+                self._finish(index, DEAD, None)
+        self._check_cycles()
+
+    def __len__(self):
+        return len(self._statuses)
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def rule(self):
+        return self._rule
+
+    @property
+    def running(self):
+        """The number of worlds still in the batch."""
+        return len(self._running)
+
+    def generation(self, index):
+        steps = self._end_steps[index]
+        if steps is None:
+            steps = self._steps
+        return self._start_generations[index] + steps
+
+    def status(self, index):
+        """One of RUNNING, STILL, DEAD and CYCLE."""
+        return self._statuses[index]
+
+    def period(self, index):
+        """Period of the cycle the world is in, 1 if still, None if not found."""
+        return self._periods[index]
+
+    def alives(self, index):
+        rows = self._final_rows[index]
+        if rows is None:
+            rows = self._board_rows(self._running[index])
+        return tuple(_rows_to_cells(rows))
+
+    def to_world(self, index, engine='counting'):
+        """Create a World with the cells and the generation of a world of the batch."""
+        world = create_world(self._size[0], self._size[1], engine=engine, rule=self._rule)
+        for x, y in self.alives(index):
+            world.set_alive(x, y)
+        world._generation = self.generation(index)
+        return world
+
+    def to_worlds(self, engine='counting'):
+        return [self.to_world(index, engine=engine) for index in range(len(self))]
+
+    def _set_slots(self, slots):
+        self._slots = slots
+        self._mask = 0
+        for slot in range(len(slots)):
+            self._mask |= self._board_mask << (slot * self._slot_bits)
+        self._n_bytes = len(slots) * self._slot_bytes
+
+    def _slot_bytes_of(self, row):
+        return row.to_bytes(self._n_bytes, 'little')
+
+    def _any_in_slot(self, data, slot):
+        start = slot * self._slot_bytes
+        return data[start:start + self._slot_bytes].count(0) != self._slot_bytes
+
+    def _board_rows(self, slot):
+        offset = slot * self._slot_bits
+        mask = self._board_mask
+        return [row >> offset & mask for row in self._rows]
+
+    def _state_rows(self, state):
+        """Return the rows of a world from the bytes of its slot in every row."""
+        size = self._slot_bytes
+        return [int.from_bytes(state[start:start + size], 'little')
+                for start in range(0, len(state), size)]
+
+    def _step_board(self, rows):
+        return _step_rows(rows, self._board_mask, self._rule)
+
+    def _finish(self, index, status, period, steps=None, rows=None):
+        """Drop a world from the running ones, keeping its final cells.
+
+        The world ends at the current steps with the cells of its slot,
+        unless steps and rows are given.
+        """
+        slot = self._running.pop(index)
+        del self._checks[index]
+        self._final_rows[index] = rows if rows is not None else self._board_rows(slot)
+        self._end_steps[index] = steps if steps is not None else self._steps
+        self._statuses[index] = status
+        self._periods[index] = period
+
+    def _find_cycle(self, start_steps, start_state, state):
+        """Return the steps a cycle started at, its period and the rows it repeats.
+
+        state repeats an earlier check, start_state is the check before the
+        cycle started, taken at start_steps.
+        """
+        rows = self._state_rows(state)
+        period = 1
+        next_rows = self._step_board(rows)
+        while next_rows != rows:
+            period += 1
+            next_rows = self._step_board(next_rows)
+
+        first = self._state_rows(start_state)
+        later = first
+        for _ in range(period):
+            later = self._step_board(later)
+        steps = start_steps
+        while first != later:
+            first = self._step_board(first)
+            later = self._step_board(later)
+            steps += 1
+        return steps, period, later
+
+    def _check_cycles(self):
+        data = [self._slot_bytes_of(row) for row in self._rows]
+        size = self._slot_bytes
+        for index, slot in list(self._running.items()):
+            start = slot * size
+            state = b''.join(row[start:start + size] for row in data)
+            checks = self._checks[index]
+            for position, (steps, seen) in enumerate(checks):
+                # The oldest check is only kept as the start of the search for
+                # the exact cycle, but the first one is as early as it gets.
+                if seen == state and (position or steps == 0):
+                    start_steps, start_state = checks[position - 1] if position else checks[0]
+                    cycle_steps, period, rows = self._find_cycle(start_steps, start_state, state)
+                    self._finish(index, CYCLE if period > 1 else STILL, period,
+                                 steps=cycle_steps + period, rows=rows)
+                    break
+            else:
+                checks.append((self._steps, state))
+                if len(checks) > self.history + 1:
+                    del checks[0]
+
+    def _repack(self):
+        """Move the running worlds to the first slots, dropping the others."""
+        size = self._slot_bytes
+        data = [self._slot_bytes_of(row) for row in self._rows]
+        running = sorted(self._running.items(), key=lambda item: item[1])
+        self._rows = [int.from_bytes(b''.join(row[slot * size:(slot + 1) * size]
+                                              for _, slot in running), 'little')
+                      for row in data]
+        self._set_slots([index for index, _ in running])
+        self._running = {index: slot for slot, index in enumerate(self._slots)}
+        logger.debug('Batch repacked, %d worlds left', len(self._slots))
+
+    def advance(self, generations=1):
+        """Advance the running worlds, stopping early once none is left."""
+        if generations < 0:
+            raise ValueError('generations must not be negative')
+
+        for _ in range(generations):
+            if not self._running:
+                break
+            next_rows = _step_rows(self._rows, self._mask, self._rule)
+            changed = self._slot_bytes_of(
+                reduce(or_, (row ^ next_row for row, next_row in zip(self._rows, next_rows)), 0))
+            alive = self._slot_bytes_of(reduce(or_, next_rows, 0))
+            self._rows = next_rows
+            self._steps += 1
+
+            for index, slot in list(self._running.items()):
+                if not self._any_in_slot(alive, slot) and not self._rule.has_b0:
+                    self._finish(index, DEAD, None)
+                elif not self._any_in_slot(changed, slot):
+                    self._finish(index, STILL, 1)
+            if self._running and self._steps % self.check_every == 0:
+                self._check_cycles()
+            if len(self._running) <= len(self._slots) // 2:
+                self._repack()
@@ -0,0 +1,200 @@
+"""Periodic checkpoints of long runs, and resuming from them.
+
+A checkpoint is a snapshot (see game_of_life.snapshot) named after its
+generation. The snapshot is encoded in memory by the stepping thread, then
+written by a background thread to a temporary file which is renamed into
+place, so a checkpoint file is always complete and stepping never waits for
+the disk.
+"""
+import logging
+import os
+import re
+import threading
+import time
+
+from . import snapshot
+
+
+logger = logging.getLogger(__name__)
+
+_NAME = 'checkpoint-{:012d}.gols'
+_NAME_PATTERN = re.compile(r'^checkpoint-(\d+)\.gols$')
+
+
+def list_checkpoints(directory):
+    """Return the paths of the checkpoints in directory, oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for filename in os.listdir(directory):
+        match = _NAME_PATTERN.match(filename)
+        if match:
+            found.append((int(match.group(1)), os.path.join(directory, filename)))
+    return [path for _, path in sorted(found)]
+
+
+def latest_checkpoint(directory):
+    checkpoints = list_checkpoints(directory)
+    return checkpoints[-1] if checkpoints else None
+
+
+def resume(directory, factory):
+    """Load the latest checkpoint into the world returned by factory(width, height).
+
+    Return None if there is no checkpoint.
+    """
+    path = latest_checkpoint(directory)
+    if path is None:
+        return None
+    logger.info('Resuming from %s', path)
+    return snapshot.load(path, factory)
+
+
+def _write_atomically(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class _Writer(threading.Thread):
+    """Background thread writing the latest submitted checkpoint.
+
+    If a checkpoint is submitted while the previous one is still waiting to
+    be written, the previous one is dropped.
+    """
+
+    def __init__(self, on_written):
+        super().__init__(name='checkpoint-writer', daemon=True)
+        self._on_written = on_written
+        self._condition = threading.Condition()
+        self._pending = None
+        self._closed = False
+        self.error = None
+
+    def submit(self, path, data):
+        with self._condition:
+            self._pending = (path, data)
+            self._condition.notify()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self.join()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                path, data = self._pending
+                self._pending = None
+            try:
+                _write_atomically(path, data)
+            except OSError as e:
+                logger.error('Failed to write checkpoint %s: %s', path, e)
+                self.error = e
+            else:
+                self._on_written(path)
+
+
+class Checkpointer(object):
+    """Write checkpoints of a world every some generations or seconds.
+
+    Call maybe_checkpoint() after advancing the world. Only the last keep
+    checkpoints are kept in directory. Call close(), or use it as a context
+    manager, to wait for the last checkpoint to be written.
+    """
+
+    def __init__(self, directory, every_generations=None, every_seconds=None, keep=2):
+        if every_generations is None and every_seconds is None:
+            raise ValueError('every_generations or every_seconds must be given')
+        if every_generations is not None and every_generations <= 0:
+            raise ValueError('every_generations must be larger than 0')
+        if every_seconds is not None and every_seconds <= 0:
+            raise ValueError('every_seconds must be larger than 0')
+        if keep <= 0:
+            raise ValueError('keep must be larger than 0')
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.every_generations = every_generations
+        self.every_seconds = every_seconds
+        self.keep = keep
+        self._last_generation = None
+        self._last_time = time.monotonic()
+        self._writer = _Writer(self._remove_old)
+        self._writer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._writer.close()
+
+    @property
+    def last_generation(self):
+        """Generation of the last checkpoint submitted, or None."""
+        return self._last_generation
+
+    def next_generation(self, generation):
+        """Return the generation of the next checkpoint by generations, or None."""
+        if self.every_generations is None:
+            return None
+        return (generation // self.every_generations + 1) * self.every_generations
+
+    def is_due(self, world):
+        if world.generation == self._last_generation:
+            return False
+        if (self.every_generations is not None and
+                world.generation % self.every_generations == 0):
+            return True
+        if (self.every_seconds is not None and
+                time.monotonic() - self._last_time >= self.every_seconds):
+            return True
+        return False
+
+    def maybe_checkpoint(self, world):
+        if self.is_due(world):
+            self.checkpoint(world)
+
+    def checkpoint(self, world):
+        """Encode the world now, and write it in the background."""
+        if self._writer.error is not None:
+            raise self._writer.error
+        path = os.path.join(self.directory, _NAME.format(world.generation))
+        self._writer.submit(path, snapshot.encode(world))
+        self._last_generation = world.generation
+        self._last_time = time.monotonic()
+
+    def _remove_old(self, path):
+        logger.debug('Checkpoint %s written', path)
+        for old_path in list_checkpoints(self.directory)[:-self.keep]:
+            os.remove(old_path)
+
+
+def run(world, generations, checkpointer, chunk=100):
+    """Advance the world until the given generation, checkpointing on the way.
+
+    The world is advanced by at most chunk generations at a time, and never
+    past the next checkpoint due by generations. The final state is always
+    checkpointed.
+    """
+    while world.generation < generations:
+        n = min(chunk, generations - world.generation)
+        next_checkpoint = checkpointer.next_generation(world.generation)
+        if next_checkpoint is not None:
+            n = min(n, next_checkpoint - world.generation)
+        world.advance(generations=n)
+        checkpointer.maybe_checkpoint(world)
+
+    if checkpointer.last_generation != world.generation:
+        checkpointer.checkpoint(world)
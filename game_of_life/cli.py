@@ -1,11 +1,341 @@
+import argparse
+import itertools
 import logging
+import sys
+import time
 
-from game_of_life.presenter import GameOfLifePresenter
+from . import checkpoint
+from . import sweep
+from .batch import WorldBatch
+from .model import World, BitWorld, DenseWorld, HashLife, Patterns, create_world
+from .model import BOUNDED, TORUS, INFINITE
+from .parallel import ParallelWorld, SharedMemoryWorld
+from .patterns import PatternLibrary, read_cells
+from .rules import Rule
 
 
-logging.basicConfig(level=logging.DEBUG)
+# Renderers of the window, see game_of_life.view.create_grid. Not imported
+# from the view, which needs Tk.
+RENDERERS = ('auto', 'canvas', 'image')
 
+ENGINES = (World.ENGINES + BitWorld.ENGINES + DenseWorld.ENGINES +
+           ParallelWorld.ENGINES + SharedMemoryWorld.ENGINES + ('hashlife',))
 
-def main():
-    g = GameOfLifePresenter(50, 50, 50)
-    g.run()
+TOPOLOGIES = (BOUNDED, TORUS, INFINITE)
+
+# Engines stepping the worlds of a sweep. The parallel engines would compete
+# with the worker processes of the sweep. The "batch" engine steps the soups
+# of a chunk together in a WorldBatch.
+SWEEP_ENGINES = World.ENGINES + BitWorld.ENGINES + DenseWorld.ENGINES + WorldBatch.ENGINES
+
+
+def create_engine_world(width, height, engine, workers=None, rule=None, topology=BOUNDED):
+    """Create an empty world for any of the ENGINES.
+
+    The "hashlife" engine steps a World through HashLife, so it gets a World
+    with the "counting" engine.
+    """
+    if engine in ParallelWorld.ENGINES:
+        return ParallelWorld(width, height, workers=workers, rule=rule)
+    if engine in SharedMemoryWorld.ENGINES:
+        return SharedMemoryWorld(width, height, workers=workers, rule=rule)
+    if engine == 'hashlife':
+        engine = 'counting'
+    return create_world(width, height, engine=engine, rule=rule, topology=topology)
+
+
+def supports_topology(engine, topology):
+    """Whether the engine can step worlds of the topology."""
+    if engine == 'hashlife':
+        # HashLife is unbounded, and clips its cells into a bounded world.
+        return topology != TORUS
+    for cls in (World, BitWorld, DenseWorld, ParallelWorld, SharedMemoryWorld, WorldBatch):
+        if engine in cls.ENGINES:
+            return topology in cls.TOPOLOGIES
+    return False
+
+
+def write_board(world, path):
+    """Write the cells of a world in the plaintext (.cells) format.
+
+    Only the cells within the size of an infinite world are written.
+    """
+    width, height = world.size
+    rows = [bytearray(b'.' * width) for _ in range(height)]
+    for x, y in world.alives_in(0, 0, width, height):
+        rows[y][x] = ord('O')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('!Generation: {}\n'.format(world.generation))
+        for row in rows:
+            f.write(row.decode('ascii'))
+            f.write('\n')
+
+
+def _parse_size(value):
+    try:
+        width, height = (int(v) for v in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError('size must be like 50x50')
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError('size must be larger than 0')
+    return width, height
+
+
+def _parse_seeds(value):
+    try:
+        if '-' in value:
+            first, last = (int(v) for v in value.split('-'))
+        else:
+            first = last = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError('seeds must be like 7 or 0-999')
+    if first < 0 or last < first:
+        raise argparse.ArgumentTypeError('seeds must be like 7 or 0-999')
+    return range(first, last + 1)
+
+
+def _parse_rule(value):
+    try:
+        return Rule.parse(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(prog='game-of-life',
+                                     description="Conway's Game of Life.")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Log debug messages.')
+    subparsers = parser.add_subparsers(dest='command')
+
+    gui_parser = subparsers.add_parser('gui', help='Open the window (default).')
+    gui_parser.add_argument('--pattern-dir',
+                            help='Directory of RLE and plaintext patterns to choose from.')
+    gui_parser.add_argument('-s', '--size', type=_parse_size, default=(50, 50),
+                            help='Board size as WIDTHxHEIGHT (default: 50x50).')
+    gui_parser.add_argument('-r', '--renderer', choices=RENDERERS, default='auto',
+                            help='Draw the board with a canvas item per cell, or into '
+                                 'one image for large boards (default: auto).')
+    gui_parser.add_argument('--threaded', action='store_true',
+                            help='Step the world in a background thread, drawing only '
+                                 'the latest generation at every frame.')
+    gui_parser.add_argument('--min-delay', type=int, default=50,
+                            help='Delay between generations at full speed, in ms '
+                                 '(default: 50).')
+    gui_parser.add_argument('--rule', type=_parse_rule, default=None,
+                            help='Life-like rule in B/S notation such as B36/S23, or a '
+                                 'name such as highlife (default: B3/S23).')
+    gui_parser.add_argument('-t', '--topology', choices=TOPOLOGIES, default=BOUNDED,
+                            help='Hard edges, edges wrapping around, or no edges with '
+                                 'only part of the world shown (default: bounded).')
+
+    run_parser = subparsers.add_parser('run', help='Run headless, without any window.')
+    run_parser.add_argument('-s', '--size', type=_parse_size, default=(50, 50),
+                            help='Board size as WIDTHxHEIGHT (default: 50x50).')
+    run_parser.add_argument('-n', '--generations', type=int, default=100,
+                            help='Generation to run until (default: 100).')
+    run_parser.add_argument('-e', '--engine', choices=ENGINES, default='counting',
+                            help='Engine stepping the world (default: counting).')
+    run_parser.add_argument('-w', '--workers', type=int, default=None,
+                            help='Worker processes of the parallel engines.')
+    run_parser.add_argument('--rule', type=_parse_rule, default=None,
+                            help='Life-like rule in B/S notation such as B36/S23, or a '
+                                 'name such as highlife (default: B3/S23).')
+    run_parser.add_argument('-t', '--topology', choices=TOPOLOGIES, default=BOUNDED,
+                            help='Hard edges, edges wrapping around, or no edges with '
+                                 'the size as the region written (default: bounded).')
+    initial = run_parser.add_mutually_exclusive_group()
+    initial.add_argument('-p', '--pattern', choices=[p.name for p in Patterns],
+                         help='Built-in pattern placed at the center.')
+    initial.add_argument('-f', '--file',
+                         help='RLE or plaintext file with the initial board.')
+    initial.add_argument('-d', '--density', type=float,
+                         help='Fill the board randomly with this density.')
+    run_parser.add_argument('--seed', type=int, default=None,
+                            help='Seed of the random board.')
+    run_parser.add_argument('-o', '--output',
+                            help='Write the final board to this plaintext file.')
+    run_parser.add_argument('--checkpoint-dir',
+                            help='Write checkpoints of the run to this directory.')
+    run_parser.add_argument('--checkpoint-every', type=int, default=None,
+                            help='Checkpoint every this many generations.')
+    run_parser.add_argument('--checkpoint-seconds', type=float, default=None,
+                            help='Checkpoint every this many seconds (default: 600).')
+    run_parser.add_argument('--resume', action='store_true',
+                            help='Resume from the latest checkpoint, if any.')
+
+    sweep_parser = subparsers.add_parser(
+        'sweep', help='Run random soups for every combination of the parameters.')
+    sweep_parser.add_argument('-o', '--output', required=True,
+                              help='JSON Lines file the results are written to.')
+    sweep_parser.add_argument('-s', '--sizes', type=_parse_size, nargs='+', default=[(64, 64)],
+                              help='Board sizes as WIDTHxHEIGHT (default: 64x64).')
+    sweep_parser.add_argument('-d', '--densities', type=float, nargs='+', default=[0.35],
+                              help='Densities of the random soups (default: 0.35).')
+    sweep_parser.add_argument('--seeds', type=_parse_seeds, nargs='+', default=[range(100)],
+                              help='Seeds of the random soups, as numbers or ranges such '
+                                   'as 0-999 (default: 0-99).')
+    sweep_parser.add_argument('--rules', type=_parse_rule, nargs='+', default=[None],
+                              help='Rules in B/S notation or names (default: B3/S23).')
+    sweep_parser.add_argument('-n', '--generations', type=int, default=1000,
+                              help='Generation to stop each soup at if it is still '
+                                   'running (default: 1000).')
+    sweep_parser.add_argument('-e', '--engine', choices=SWEEP_ENGINES, default='bitwise',
+                              help='Engine stepping each soup (default: bitwise).')
+    sweep_parser.add_argument('-t', '--topology', choices=TOPOLOGIES, default=BOUNDED,
+                              help='Topology of the boards (default: bounded).')
+    sweep_parser.add_argument('-w', '--workers', type=int, default=None,
+                              help='Worker processes (default: one per CPU).')
+    sweep_parser.add_argument('--chunk-size', type=int, default=16,
+                              help='Soups sent to a worker at once (default: 16).')
+    sweep_parser.add_argument('--resume', action='store_true',
+                              help='Skip the soups with a result in the output already.')
+
+    return parser
+
+
+def _populate(world, args):
+    width, height = world.size
+    if args.file is not None:
+        cells, _, _ = read_cells(args.file)
+    elif args.density is not None:
+        cells = sweep.soup_cells(width, height, args.density, args.seed)
+    elif args.pattern is not None:
+        pattern = next(p for p in Patterns if p.name == args.pattern)
+        cells = pattern.as_screen_coordinate(width, height)
+    else:
+        cells = []
+
+    for x, y in cells:
+        if x < width and y < height:
+            world.set_alive(x, y)
+
+
+def _advance_with_checkpoints(world, args):
+    every_seconds = args.checkpoint_seconds
+    if every_seconds is None and args.checkpoint_every is None:
+        every_seconds = 600
+    with checkpoint.Checkpointer(args.checkpoint_dir,
+                                 every_generations=args.checkpoint_every,
+                                 every_seconds=every_seconds) as checkpointer:
+        checkpoint.run(world, args.generations, checkpointer)
+
+
+def run(args, out=sys.stdout):
+    def factory(width, height):
+        return create_engine_world(width, height, args.engine, workers=args.workers,
+                                   rule=args.rule, topology=args.topology)
+
+    world = None
+    if args.resume:
+        world = checkpoint.resume(args.checkpoint_dir, factory)
+    resumed = world is not None
+    if not resumed:
+        world = factory(*args.size)
+    width, height = world.size
+    try:
+        if not resumed:
+            _populate(world, args)
+
+        start = time.perf_counter()
+        start_generation = world.generation
+        if args.engine == 'hashlife':
+            life = HashLife.from_world(world)
+            life.advance(max(0, args.generations - start_generation))
+            world = life.to_world(topology=args.topology)
+        elif args.checkpoint_dir is not None:
+            _advance_with_checkpoints(world, args)
+        else:
+            world.advance(generations=max(0, args.generations - start_generation))
+        elapsed = time.perf_counter() - start
+        generations = world.generation - start_generation
+
+        population = len(world.alives)
+        if args.output is not None:
+            write_board(world, args.output)
+    finally:
+        if hasattr(world, 'close'):
+            world.close()
+
+    rate = generations / elapsed if elapsed > 0 else float('inf')
+    out.write('engine: {}\n'.format(args.engine))
+    out.write('generations: {}\n'.format(generations))
+    out.write('seconds: {:.6f}\n'.format(elapsed))
+    out.write('generations/s: {:.2f}\n'.format(rate))
+    out.write('cells/s: {:.0f}\n'.format(rate * width * height))
+    out.write('population: {}\n'.format(population))
+
+
+def run_sweep(args, out=sys.stdout):
+    jobs = sweep.make_jobs(args.sizes, args.densities,
+                           itertools.chain.from_iterable(args.seeds), args.rules)
+    stats = sweep.run_sweep(jobs, args.output, args.generations,
+                            engine=args.engine, topology=args.topology,
+                            workers=args.workers, chunk_size=args.chunk_size,
+                            resume=args.resume)
+
+    rate = stats.completed / stats.seconds if stats.seconds > 0 else float('inf')
+    out.write('jobs: {}\n'.format(stats.completed))
+    out.write('skipped: {}\n'.format(stats.skipped))
+    out.write('seconds: {:.6f}\n'.format(stats.seconds))
+    out.write('jobs/s: {:.2f}\n'.format(rate))
+
+
+def main(argv=None):
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        if args.resume and args.checkpoint_dir is None:
+            parser.error('--resume requires --checkpoint-dir')
+        if args.engine == 'hashlife' and args.checkpoint_dir is not None:
+            parser.error('the hashlife engine does not support checkpoints')
+        if (args.rule is not None and args.rule.has_b0 and
+                (args.engine == 'hashlife' or args.engine in World.ENGINES)):
+            parser.error('the {} engine does not support B0 rules'.format(args.engine))
+        if not supports_topology(args.engine, args.topology):
+            parser.error('the {} engine does not support the {} topology'.format(
+                args.engine, args.topology))
+        if args.topology == INFINITE and args.checkpoint_dir is not None:
+            parser.error('infinite worlds can not be checkpointed')
+        if args.workers is not None and args.workers <= 0:
+            parser.error('--workers must be larger than 0')
+        if args.pattern is not None:
+            pattern = next(p for p in Patterns if p.name == args.pattern)
+            try:
+                pattern.as_screen_coordinate(*args.size)
+            except ValueError as e:
+                parser.error('the {} pattern does not fit: {}'.format(args.pattern, e))
+    rule = getattr(args, 'rule', None)
+    if args.command != 'run' and rule is not None and rule.has_b0:
+        parser.error('the window does not support B0 rules')
+    if args.command == 'sweep':
+        if args.workers is not None and args.workers <= 0:
+            parser.error('--workers must be larger than 0')
+        if args.chunk_size <= 0:
+            parser.error('--chunk-size must be larger than 0')
+        if args.engine in World.ENGINES and any(r is not None and r.has_b0 for r in args.rules):
+            parser.error('the {} engine does not support B0 rules'.format(args.engine))
+        if not supports_topology(args.engine, args.topology):
+            parser.error('the {} engine does not support the {} topology'.format(
+                args.engine, args.topology))
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    if args.command == 'run':
+        run(args)
+    elif args.command == 'sweep':
+        run_sweep(args)
+    else:
+        # Only the window needs Tk, so it is imported here: headless runs
+        # work on machines without a display or without Tk at all.
+        from .presenter import GameOfLifePresenter
+        library = None
+        if getattr(args, 'pattern_dir', None) is not None:
+            library = PatternLibrary(args.pattern_dir)
+        width, height = getattr(args, 'size', (50, 50))
+        g = GameOfLifePresenter(width, height, getattr(args, 'min_delay', 50),
+                                pattern_library=library,
+                                renderer=getattr(args, 'renderer', 'auto'),
+                                threaded=getattr(args, 'threaded', False),
+                                rule=rule,
+                                topology=getattr(args, 'topology', BOUNDED))
+        g.run()
@@ -0,0 +1,127 @@
+"""Bounded history of the generations of a world, for rewinding.
+
+The history is a ring of segments. Each segment starts with a keyframe, the
+full set of alive cells of a generation, followed by the deltas of the next
+generations: the cells changed by each of them. A generation is rebuilt from
+the keyframe before it in at most keyframe_interval delta applications. The
+oldest segments are evicted when the history grows over its memory cap.
+"""
+from collections import deque
+
+
+# Rough memory taken by one cell stored in a frozenset: the (x, y) tuple and
+# its slot in the set.
+CELL_BYTES = 72
+
+
+class _Segment(object):
+    __slots__ = ('generation', 'keyframe', 'deltas', 'cells')
+
+    def __init__(self, generation, keyframe):
+        self.generation = generation
+        self.keyframe = keyframe
+        self.deltas = []
+        self.cells = len(keyframe)
+
+    @property
+    def last_generation(self):
+        return self.generation + len(self.deltas)
+
+
+class History(object):
+
+    def __init__(self, keyframe_interval=32, max_bytes=64 * 1024 * 1024):
+        if keyframe_interval <= 0:
+            raise ValueError('keyframe_interval must be larger than 0')
+        if max_bytes <= 0:
+            raise ValueError('max_bytes must be larger than 0')
+
+        self.keyframe_interval = keyframe_interval
+        self.max_bytes = max_bytes
+        self._segments = deque()
+        self._cells = 0
+
+    def __len__(self):
+        return sum(len(s.deltas) + 1 for s in self._segments)
+
+    def __contains__(self, generation):
+        return any(s.generation <= generation <= s.last_generation for s in self._segments)
+
+    @property
+    def first_generation(self):
+        """Oldest generation in the history, or None if empty."""
+        return self._segments[0].generation if self._segments else None
+
+    @property
+    def last_generation(self):
+        """Newest generation in the history, or None if empty."""
+        return self._segments[-1].last_generation if self._segments else None
+
+    @property
+    def size_bytes(self):
+        """Estimated memory taken by the history."""
+        return self._cells * CELL_BYTES
+
+    def clear(self):
+        self._segments.clear()
+        self._cells = 0
+
+    def record(self, world):
+        """Record the current generation of the world.
+
+        If the world is right after the last generation recorded, only its
+        changed cells are stored. Recording a generation already in the
+        history, e.g. after rewinding or editing cells, drops that generation
+        and the ones after it first.
+        """
+        generation = world.generation
+        last = self.last_generation
+        follows = last is not None and generation == last + 1
+        if last is not None and generation <= last:
+            # The changed cells of the world do not lead from the generation
+            # before, so a keyframe is needed.
+            self._truncate(generation)
+
+        segment = self._segments[-1] if self._segments else None
+        if follows and len(segment.deltas) + 1 < self.keyframe_interval:
+            delta = world.changed
+            segment.deltas.append(delta)
+            segment.cells += len(delta)
+            self._cells += len(delta)
+        else:
+            segment = _Segment(generation, frozenset(world.alives))
+            self._segments.append(segment)
+            self._cells += segment.cells
+
+        self._evict()
+
+    def seek(self, generation):
+        """Return the alive cells of a generation in the history, as a frozenset."""
+        for segment in self._segments:
+            if segment.generation <= generation <= segment.last_generation:
+                break
+        else:
+            raise KeyError(generation)
+
+        cells = set(segment.keyframe)
+        for delta in segment.deltas[:generation - segment.generation]:
+            # A changed cell is toggled, whichever the direction.
+            cells.symmetric_difference_update(delta)
+        return frozenset(cells)
+
+    def _truncate(self, generation):
+        """Drop the generations from the given one on."""
+        while self._segments and self._segments[-1].generation >= generation:
+            self._cells -= self._segments.pop().cells
+        if self._segments:
+            segment = self._segments[-1]
+            keep = generation - segment.generation - 1
+            for delta in segment.deltas[keep:]:
+                segment.cells -= len(delta)
+                self._cells -= len(delta)
+            del segment.deltas[keep:]
+
+    def _evict(self):
+        # The newest segment is always kept.
+        while len(self._segments) > 1 and self.size_bytes > self.max_bytes:
+            self._cells -= self._segments.popleft().cells
@@ -1,4 +1,111 @@
-from functools import wraps
+import logging
+import time
+from collections import Counter, deque, namedtuple
+from functools import lru_cache, reduce, wraps
+from operator import xor
+
+from . import snapshot
+from .rules import CONWAY, as_rule
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+logger = logging.getLogger(__name__)
+
+# Status of a world tracking its history.
+RUNNING = 'running'
+STILL = 'still'
+DEAD = 'dead'
+CYCLE = 'cycle'
+
+# Topologies of a world. A bounded world has hard edges with always-dead
+# cells beyond them, a torus wraps around its edges, and an infinite world
+# has no edges at all: its size is only the region shown and saved.
+BOUNDED = 'bounded'
+TORUS = 'torus'
+INFINITE = 'infinite'
+
+_MASK64 = (1 << 64) - 1
+
+# Cells born and died during an advance(), as frozensets.
+Delta = namedtuple('Delta', ('births', 'deaths'))
+
+# Statistics passed to the observers of a world after every advance().
+AdvanceStats = namedtuple('AdvanceStats',
+                          ('generation', 'generations', 'seconds',
+                           'births', 'deaths', 'population'))
+
+
+def _cell_key(x, y):
+    """Return the random-looking 64-bit Zobrist key of a cell."""
+    # splitmix64 finalizer of the packed coordinate.
+    z = (((x & 0xffffffff) << 32 | (y & 0xffffffff)) + 0x9e3779b97f4a7c15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xbf58476d1ce4e5b9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94d049bb133111eb) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _hash_cells(cells):
+    return reduce(xor, (_cell_key(x, y) for x, y in cells), 0)
+
+
+def _rows_to_cells(rows, start=0):
+    """Return the cells of rows stored as int bitmasks, the first row being y=start."""
+    cells = []
+    for y, row in enumerate(rows, start):
+        while row:
+            lowest = row & -row
+            cells.append((lowest.bit_length() - 1, y))
+            row ^= lowest
+    return cells
+
+
+def _bitmap_to_rows(bitmap, width, height):
+    """Return the int bitmasks of the rows of a snapshot bitmap."""
+    size = snapshot.row_bytes(width)
+    mask = (1 << width) - 1
+    return [int.from_bytes(bitmap[y * size:(y + 1) * size], 'little') & mask
+            for y in range(height)]
+
+
+def _rows_cells_in(rows, x0, x1, start=0):
+    """Return the cells of rows stored as int bitmasks within x0 <= x < x1."""
+    window = ((1 << max(x1 - x0, 0)) - 1) << x0
+    return _rows_to_cells([row & window for row in rows], start=start)
+
+
+def _unbounded_neighbors(x, y):
+    return ((x-1, y-1), (x-1, y), (x-1, y+1),
+            (x, y-1), (x, y+1),
+            (x+1, y-1), (x+1, y), (x+1, y+1))
+
+
+def _torus_neighbors(width, height):
+    """Return a function giving the neighbors of a cell on a torus.
+
+    The wrapped coordinates are looked up in tables built once, instead of
+    being computed with a modulo for every neighbor.
+    """
+    left = [(x - 1) % width for x in range(width)]
+    right = [(x + 1) % width for x in range(width)]
+    up = [(y - 1) % height for y in range(height)]
+    down = [(y + 1) % height for y in range(height)]
+
+    def neighbors(x, y):
+        l, r, u, d = left[x], right[x], up[y], down[y]
+        return ((l, u), (l, y), (l, d),
+                (x, u), (x, d),
+                (r, u), (r, y), (r, d))
+
+    return neighbors
+
+
+def _rows_to_bitmap(rows, width):
+    size = snapshot.row_bytes(width)
+    return b''.join(row.to_bytes(size, 'little') for row in rows)
 
 
 class OutOfBoundError(Exception):
@@ -9,7 +116,8 @@ class OutOfBoundError(Exception):
 def check_boundary(f):
     @wraps(f)
     def wrapper(self, x, y, *args, **kwargs):
-        if x < 0 or x >= self._size[0] or y < 0 or y >= self._size[1]:
+        x0, y0, x1, y1 = self._bounds
+        if not (x0 <= x < x1 and y0 <= y < y1):
             raise OutOfBoundError('{}, {}'.format(x, y))
         else:
             return f(self, x, y, *args, **kwargs)
@@ -18,33 +126,278 @@ def check_boundary(f):
 
 
 class World(object):
+    # Engines available for stepping the world. "classic" evaluates every
+    # neighbor of every alive cell on its own, "counting" makes one pass over
+    # the alive cells to count their neighbors and applies the rule once per
+    # candidate cell, "incremental" only re-evaluates the neighborhoods of
+    # the cells changed in the last generation. All give exactly the same
+    # result.
+    ENGINES = ('classic', 'counting', 'incremental')
+    # These engines only go through the alive cells and their neighbors, so
+    # they can't run rules making cells born without alive neighbors.
+    SUPPORTS_B0 = False
+    TOPOLOGIES = (BOUNDED, TORUS, INFINITE)
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, engine='classic', rule=None, topology=BOUNDED):
         if x <= 0:
             raise ValueError('x must be larger than 0')
         if y <= 0:
             raise ValueError('y must be larger than 0')
+        if engine not in self.ENGINES:
+            raise ValueError('engine must be one of {}'.format(', '.join(self.ENGINES)))
+        rule = as_rule(rule)
+        if rule.has_b0 and not self.SUPPORTS_B0:
+            raise ValueError('The {} engine does not support B0 rules'.format(engine))
+        if topology not in self.TOPOLOGIES:
+            raise ValueError('topology of the {} engine must be one of {}'.format(
+                engine, ', '.join(self.TOPOLOGIES)))
+        if topology == TORUS and (x < 3 or y < 3):
+            # Smaller tori would make cells neighbors of themselves.
+            raise ValueError('A torus must be at least 3x3 cells')
 
         self._size = (x, y)
+        self._engine = engine
+        self._rule = rule
+        self._topology = topology
+        # The cells accepted by set_alive() and the like. Cells of an infinite
+        # world may be anywhere.
+        if topology == INFINITE:
+            self._bounds = (-float('inf'), -float('inf'), float('inf'), float('inf'))
+        else:
+            self._bounds = (0, 0, x, y)
+        # The neighbors are computed by a function specialized for the
+        # topology. Those of a bounded world are not filtered: the cells just
+        # outside of the world, the halo, are dropped from the results instead.
+        if topology == TORUS:
+            self._neighbors = _torus_neighbors(x, y)
+        else:
+            self._neighbors = _unbounded_neighbors
+        self._halo_cells = None
         self._alives = set()
         self._corners = ((0, 0), (x-1, 0), (0, y-1), (x-1, y-1))
+        self._generation = 0
+        # Cells changed by the last advance(), and the cells the incremental
+        # engine has to re-evaluate: the ones changed in the last generation
+        # and the ones set by hand since.
+        self._changed = frozenset()
+        self._delta = None
+        self._dirty = set()
+        # Zobrist hash of the alive cells, and the hashes of the recent
+        # generations. The hash is None after the world is edited by hand.
+        self._hash = None
+        self._history = None
+        self._history_index = None
+        self._period = None
+        self._observers = []
 
     @property
     def size(self):
         return self._size
 
+    @property
+    def engine(self):
+        return self._engine
+
+    @property
+    def rule(self):
+        return self._rule
+
+    @property
+    def topology(self):
+        return self._topology
+
     @property
     def alives(self):
         return tuple(self._alives)
 
+    @property
+    def _halo(self):
+        """The cells just outside of a bounded world, as a frozenset."""
+        if self._halo_cells is None:
+            x, y = self._size
+            self._halo_cells = frozenset(
+                [(cell_x, cell_y) for cell_x in range(-1, x + 1) for cell_y in (-1, y)] +
+                [(cell_x, cell_y) for cell_x in (-1, x) for cell_y in range(y)])
+        return self._halo_cells
+
+    def _clip(self, x0, y0, x1, y1):
+        bx0, by0, bx1, by1 = self._bounds
+        return max(x0, bx0), max(y0, by0), min(x1, bx1), min(y1, by1)
+
+    def alives_in(self, x0, y0, x1, y1):
+        """Return the alive cells with x0 <= x < x1 and y0 <= y < y1.
+
+        Costs the smaller of the area of the region and the population, so
+        showing part of a crowded world does not go through all its cells.
+        """
+        x0, y0, x1, y1 = self._clip(x0, y0, x1, y1)
+        if (x1 - x0) * (y1 - y0) < len(self._alives):
+            alives = self._alives
+            return tuple((x, y) for y in range(y0, y1) for x in range(x0, x1)
+                         if (x, y) in alives)
+        return tuple((x, y) for x, y in self._alives
+                     if x0 <= x < x1 and y0 <= y < y1)
+
+    @property
+    def generation(self):
+        return self._generation
+
+    @property
+    def changed(self):
+        """Cells born or died during the last advance(), as a frozenset."""
+        return self._changed
+
+    @property
+    def delta(self):
+        """Cells born and died during the last advance(), as a Delta.
+
+        Split from changed on first use, in O(changes). Like changed, it is
+        only meaningful until the world is edited by hand.
+        """
+        if self._delta is None:
+            changed = self.changed
+            births = frozenset(cell for cell in changed if self.is_alive(*cell))
+            self._delta = Delta(births, changed - births)
+        return self._delta
+
+    @property
+    def state_hash(self):
+        """Zobrist hash of the alive cells, if the history is tracked."""
+        if self._history is not None and self._hash is None:
+            self._reset_history()
+        return self._hash
+
+    @property
+    def period(self):
+        """Period of the cycle the world is in, or None if not found yet.
+
+        1 means the world is still. If advance() is called with more than one
+        generation at a time, the period found may be a multiple of the
+        actual one.
+        """
+        return self._period
+
+    @property
+    def status(self):
+        """One of RUNNING, STILL, DEAD and CYCLE, or None if not tracked."""
+        if self._history is None:
+            return None
+        if self.state_hash == 0 and not self._rule.has_b0:
+            # A non-empty world hashing to zero is astronomically unlikely.
+            # Under B0 an empty world is filled at the next generation, so it
+            # is a state like any other.
+            return DEAD
+        if self._period is None:
+            return RUNNING
+        return STILL if self._period == 1 else CYCLE
+
+    def add_observer(self, callback):
+        """Call callback with an AdvanceStats after every advance().
+
+        Computing the statistics costs O(population), so it is only done while
+        there are observers.
+        """
+        self._observers.append(callback)
+
+    def remove_observer(self, callback):
+        self._observers.remove(callback)
+
+    def _notify_observers(self, generations, seconds):
+        delta = self.delta
+        stats = AdvanceStats(generation=self._generation,
+                             generations=generations,
+                             seconds=seconds,
+                             births=len(delta.births),
+                             deaths=len(delta.deaths),
+                             population=len(self.alives))
+        for callback in list(self._observers):
+            callback(stats)
+
+    def track_history(self, size=64):
+        """Keep the hashes of the last generations to detect cycles.
+
+        Cycles of period up to size generations are detected.
+        """
+        if size <= 0:
+            raise ValueError('size must be larger than 0')
+        self._history = deque(maxlen=size)
+        self._reset_history()
+
+    def _reset_history(self):
+        self._hash = _hash_cells(self.alives)
+        self._history.clear()
+        self._history_index = dict()
+        self._period = None
+        self._record_history()
+
+    def _record_history(self):
+        seen = self._history_index.get(self._hash)
+        if seen is not None:
+            self._period = self._generation - seen
+
+        if len(self._history) == self._history.maxlen:
+            generation, state_hash = self._history[0]
+            if self._history_index.get(state_hash) == generation:
+                del self._history_index[state_hash]
+        self._history.append((self._generation, self._hash))
+        self._history_index[self._hash] = self._generation
+
+    def save(self, path):
+        """Save the world as a binary snapshot, see game_of_life.snapshot."""
+        snapshot.save(self, path)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Load a world from a binary snapshot saved by save().
+
+        The rule defaults to the rule of the snapshot.
+        """
+        if kwargs.get('rule') is None:
+            kwargs['rule'] = snapshot.read_header(path).rule
+        return snapshot.load(path, lambda x, y: cls(x, y, **kwargs))
+
+    def restore(self, alives, generation):
+        """Replace the alive cells and the generation, e.g. to rewind the world.
+
+        Only the cells differing from the current ones are set.
+        """
+        if generation < 0:
+            raise ValueError('generation must not be negative')
+        alives = frozenset(alives)
+        current = frozenset(self.alives)
+        for x, y in current - alives:
+            self.set_dead(x, y)
+        for x, y in alives - current:
+            self.set_alive(x, y)
+        self._generation = generation
+        self._changed = frozenset()
+        self._delta = None
+
+    def _to_bitmap(self):
+        if self._topology == INFINITE:
+            raise ValueError('Infinite worlds can not be saved')
+        rows = [0] * self._size[1]
+        for x, y in self.alives:
+            rows[y] |= 1 << x
+        return _rows_to_bitmap(rows, self._size[0])
+
+    def _from_bitmap(self, bitmap):
+        self._alives = set(_rows_to_cells(_bitmap_to_rows(bitmap, *self._size)))
+        self._dirty = set(self._alives)
+        self._hash = None
+
     @check_boundary
     def set_alive(self, x, y):
         self._alives.add((x, y))
+        self._dirty.add((x, y))
+        self._hash = None
 
     @check_boundary
     def set_dead(self, x, y):
         if self.is_alive(x, y):
             self._alives.remove((x, y))
+            self._dirty.add((x, y))
+            self._hash = None
 
     @check_boundary
     def is_alive(self, x, y):
@@ -58,45 +411,413 @@ class World(object):
             self.set_alive(x, y)
 
     def _calc_neighbors(self, x, y):
-        all_nbrs = ((x-1, y-1),
-                    (x-1, y),
-                    (x-1, y+1),
-                    (x, y-1),
-                    (x, y+1),
-                    (x+1, y-1),
-                    (x+1, y),
-                    (x+1, y+1))
-        return tuple(
-            (x, y) for x, y in all_nbrs
-            if x >= 0 and x < self._size[0] and y >= 0 and y < self._size[1])
+        neighbors = self._neighbors(x, y)
+        if self._topology == BOUNDED:
+            halo = self._halo
+            return tuple(nbr for nbr in neighbors if nbr not in halo)
+        return neighbors
 
     def _calc_aliveness(self, x, y):
+        alives = self._alives
         neighbors = self._calc_neighbors(x, y)
-        alive_nbrs_count = len(tuple(nbr for nbr in neighbors
-                                     if self.is_alive(nbr[0], nbr[1])))
+        alive_nbrs_count = len(tuple(nbr for nbr in neighbors if nbr in alives))
 
-        if self.is_alive(x, y):
-            if alive_nbrs_count in (0, 1):
-                return False
-            elif alive_nbrs_count in (2, 3):
-                return True
-            elif alive_nbrs_count >= 4:
-                return False
-        else:
-            if alive_nbrs_count == 3:
-                return True
-            else:
-                return False
+        return self._rule.table[9 * ((x, y) in alives) + alive_nbrs_count]
+
+    def _drop_halo(self, cells):
+        """Remove the cells outside of a bounded world from a set of cells."""
+        if self._topology == BOUNDED:
+            # Only costs the size of the smaller of the two sets.
+            cells -= self._halo & cells
 
-    def advance(self):
+    def _calc_neighbor_counts(self):
+        if self._topology == TORUS:
+            neighbors = self._neighbors
+            return Counter(nbr for x, y in self._alives for nbr in neighbors(x, y))
+        # Cells outside of a bounded world are counted too. They are never
+        # alive, so they do not affect the counts of cells inside the world
+        # and are dropped after the rule is applied.
+        return Counter(nbr
+                       for x, y in self._alives
+                       for nbr in ((x-1, y-1), (x-1, y), (x-1, y+1),
+                                   (x, y-1), (x, y+1),
+                                   (x+1, y-1), (x+1, y), (x+1, y+1)))
+
+    def _advance_classic(self):
         next_alives = set()
         for x, y in self._alives:
-            nbrs = self._calc_neighbors(x, y)
+            # The cell itself too, it may survive without alive neighbors.
+            nbrs = self._calc_neighbors(x, y) + ((x, y),)
             for nbr in nbrs:
                 if self._calc_aliveness(nbr[0], nbr[1]):
                     next_alives.add(nbr)
 
-        self._alives = next_alives
+        return next_alives
+
+    def _advance_counting(self):
+        alives = self._alives
+        table = self._rule.table
+        counts = self._calc_neighbor_counts()
+        next_alives = set(
+            cell for cell, count in counts.items()
+            if table[9 * (cell in alives) + count])
+        if table[9]:
+            # Alive cells without alive neighbors are not counted, and
+            # survive under S0 rules.
+            next_alives.update(cell for cell in alives if cell not in counts)
+        self._drop_halo(next_alives)
+        return next_alives
+
+    def _advance_incremental(self):
+        # Only the cells next to a changed cell may change in this generation,
+        # the others keep their state. The alive cells are updated in place.
+        alives = self._alives
+        neighbors = self._neighbors
+        candidates = set(self._dirty)
+        for x, y in self._dirty:
+            candidates.update(neighbors(x, y))
+        self._drop_halo(candidates)
+        table = self._rule.table
+        births = []
+        deaths = []
+        for cell in candidates:
+            count = len(alives.intersection(neighbors(*cell)))
+            if cell in alives:
+                if not table[9 + count]:
+                    deaths.append(cell)
+            elif table[count]:
+                births.append(cell)
+
+        alives.difference_update(deaths)
+        alives.update(births)
+        return births + deaths
+
+    def _step(self):
+        """Advance one generation and return the changed cells."""
+        if self._engine == 'incremental':
+            changed = self._advance_incremental()
+            self._dirty = set(changed)
+        else:
+            if self._engine == 'counting':
+                next_alives = self._advance_counting()
+            else:
+                next_alives = self._advance_classic()
+            changed = self._alives.symmetric_difference(next_alives)
+            self._alives = next_alives
+            self._dirty = set()
+        return changed
+
+    def _run(self, generations):
+        """Advance the given generations and return the changed cells.
+
+        Stops early once nothing changes anymore, since the following
+        generations would all be the same.
+        """
+        changed = set()
+        for _ in range(generations):
+            step_changed = self._step()
+            if not step_changed:
+                break
+            # A cell changed twice is back to its original state.
+            changed.symmetric_difference_update(step_changed)
+        return frozenset(changed)
+
+    def advance(self, generations=1):
+        if generations < 0:
+            raise ValueError('generations must not be negative')
+        if self._history is not None and self._hash is None:
+            self._reset_history()
+
+        if self._observers:
+            start = time.perf_counter()
+        self._changed = self._run(generations)
+        self._delta = None
+        self._generation += generations
+        if self._observers:
+            seconds = time.perf_counter() - start
+
+        if self._history is not None and generations:
+            self._hash ^= _hash_cells(self.changed)
+            self._record_history()
+        if self._observers:
+            self._notify_observers(generations, seconds)
+
+
+@lru_cache(maxsize=None)
+def _reversed_bits():
+    """Return every byte with its bits reversed, indexed by the byte.
+
+    Snapshots store the first cell in the lowest bit, but bitorder='little'
+    of numpy.packbits() and numpy.unpackbits() needs NumPy 1.17.
+    """
+    return numpy.array([int('{:08b}'.format(byte)[::-1], 2) for byte in range(256)],
+                       dtype=numpy.uint8)
+
+
+class DenseWorld(World):
+    """World stored as a 2-D uint8 NumPy array, stepped with vectorized slices.
+
+    Requires NumPy. Use create_world() to fall back to World when NumPy is not
+    installed.
+    """
+    ENGINES = ('numpy',)
+    SUPPORTS_B0 = True
+    TOPOLOGIES = (BOUNDED, TORUS)
+
+    def __init__(self, x, y, engine='numpy', rule=None, topology=BOUNDED):
+        if numpy is None:
+            raise ImportError('DenseWorld requires NumPy')
+        super().__init__(x, y, engine=engine, rule=rule, topology=topology)
+        del self._alives
+
+        # The board is padded by one cell on every side so that the neighbor
+        # sums can be taken with plain shifted slices. The padding is always
+        # dead for a bounded world, which gives the same hard-edge boundary
+        # as World._calc_neighbors, and a copy of the opposite edges for a
+        # torus.
+        self._padded = numpy.zeros((x+2, y+2), dtype=numpy.uint8)
+        self._board = self._padded[1:-1, 1:-1]
+        self._counts = numpy.empty((x, y), dtype=numpy.uint8)
+        self._table = numpy.array(self._rule.table, dtype=numpy.uint8)
+
+    @property
+    def alives(self):
+        xs, ys = numpy.nonzero(self._board)
+        return tuple(zip(xs.tolist(), ys.tolist()))
+
+    def alives_in(self, x0, y0, x1, y1):
+        x0, y0, x1, y1 = self._clip(x0, y0, x1, y1)
+        if x0 >= x1 or y0 >= y1:
+            return ()
+        xs, ys = numpy.nonzero(self._board[x0:x1, y0:y1])
+        return tuple(zip((xs + x0).tolist(), (ys + y0).tolist()))
+
+    def _to_bitmap(self):
+        return _reversed_bits()[numpy.packbits(self._board.T, axis=1)].tobytes()
+
+    def _from_bitmap(self, bitmap):
+        x, y = self._size
+        packed = numpy.frombuffer(bitmap, dtype=numpy.uint8).reshape(y, snapshot.row_bytes(x))
+        self._board[...] = numpy.unpackbits(_reversed_bits()[packed], axis=1)[:, :x].T
+        self._hash = None
+
+    @check_boundary
+    def set_alive(self, x, y):
+        self._board[x, y] = 1
+        self._hash = None
+
+    @check_boundary
+    def set_dead(self, x, y):
+        self._board[x, y] = 0
+        self._hash = None
+
+    @check_boundary
+    def is_alive(self, x, y):
+        return bool(self._board[x, y])
+
+    def _wrap_edges(self):
+        """Copy the opposite edges of the board into the padding."""
+        p = self._padded
+        p[0, 1:-1] = p[-2, 1:-1]
+        p[-1, 1:-1] = p[1, 1:-1]
+        # The corners come with the columns, the rows being copied already.
+        p[:, 0] = p[:, -2]
+        p[:, -1] = p[:, 1]
+
+    def _calc_neighbor_counts(self):
+        if self._topology == TORUS:
+            self._wrap_edges()
+        p = self._padded
+        counts = self._counts
+        numpy.add(p[:-2, :-2], p[:-2, 1:-1], out=counts)
+        counts += p[:-2, 2:]
+        counts += p[1:-1, :-2]
+        counts += p[1:-1, 2:]
+        counts += p[2:, :-2]
+        counts += p[2:, 1:-1]
+        counts += p[2:, 2:]
+        return counts
+
+    def _run(self, generations):
+        start_board = self._board.copy()
+        for _ in range(generations):
+            counts = self._calc_neighbor_counts()
+            counts += 9 * self._board
+            next_board = self._table[counts]
+            if numpy.array_equal(next_board, self._board):
+                break
+            self._board[...] = next_board
+
+        xs, ys = numpy.nonzero(self._board != start_board)
+        return frozenset(zip(xs.tolist(), ys.tolist()))
+
+
+@lru_cache(maxsize=None)
+def _block_terms(rule):
+    """Return the terms of the next state of a row under rule, for _step_rows().
+
+    The next state depends on the count of alive cells in the 3x3 block
+    around a cell, the cell itself included. Each term is a block count, as
+    the indexes of the bit planes equal to its 4 bits, and the state the cell
+    must be in now: True for alive, False for dead, None for either.
+    """
+    terms = []
+    for count in range(10):
+        born = count <= 8 and rule.table[count]
+        survives = count >= 1 and rule.table[9 + count - 1]
+        if born or survives:
+            planes = tuple(2 * i + (count >> i & 1) for i in range(4))
+            state = None if born and survives else survives
+            terms.append(planes + (state,))
+    return tuple(terms)
+
+
+def _step_rows(rows, mask, rule=CONWAY):
+    """Calculate the next generation of rows stored as int bitmasks.
+
+    Bit x of rows[y] is the cell (x, y). Each row is computed from the rows
+    above and below it with bitwise adders, so every cell of the row is
+    handled at once. Bits outside of the mask and rows outside of the list are
+    treated as dead cells.
+    """
+    terms = _block_terms(rule)
+    next_rows = []
+    above = 0
+    below = rows[0]
+    for y in range(len(rows)):
+        current = below
+        below = rows[y+1] if y + 1 < len(rows) else 0
+
+        # Count the alive cells in each column of the 3 rows, as 2 bits.
+        col_lo = above ^ current ^ below
+        col_hi = (above & current) | (below & (above ^ current))
+
+        # Sum the columns on the left, in the middle and on the right. The
+        # result is the count of alive cells in the 3x3 block, as 4 bits.
+        lo_l, lo_r = (col_lo << 1) & mask, col_lo >> 1
+        hi_l, hi_r = (col_hi << 1) & mask, col_hi >> 1
+        bit0 = lo_l ^ col_lo ^ lo_r
+        carry = (lo_l & col_lo) | (lo_r & (lo_l ^ col_lo))
+        hi_sum = hi_l ^ col_hi ^ hi_r
+        hi_carry = (hi_l & col_hi) | (hi_r & (hi_l ^ col_hi))
+        bit1 = hi_sum ^ carry
+        bit2 = hi_carry ^ (hi_sum & carry)
+        bit3 = hi_carry & hi_sum & carry
+
+        # Each bit and its complement, so the cells with a given block count
+        # are the AND of one plane per bit. The block count includes the cell
+        # itself: a dead cell is born if its count is in the births of the
+        # rule, an alive cell survives if its count minus one is in the
+        # survivals.
+        planes = (~bit0 & mask, bit0, ~bit1 & mask, bit1,
+                  ~bit2 & mask, bit2, ~bit3 & mask, bit3)
+        next_row = 0
+        for p0, p1, p2, p3, state in terms:
+            cells = planes[p0] & planes[p1] & planes[p2] & planes[p3]
+            if state is None:
+                next_row |= cells
+            elif state:
+                next_row |= cells & current
+            else:
+                next_row |= cells & ~current
+        next_rows.append(next_row)
+
+        above = current
+
+    return next_rows
+
+
+def _step_torus_rows(rows, mask, rule=CONWAY):
+    """Calculate the next generation of rows wrapping around at the edges.
+
+    The rows are padded with a copy of the opposite edges, one column on
+    each side and one row above and below, and stepped by _step_rows().
+    """
+    width = mask.bit_length()
+    padded = [(row & 1) << (width + 1) | row << 1 | row >> (width - 1) for row in rows]
+    padded = [padded[-1]] + padded + [padded[0]]
+    next_rows = _step_rows(padded, mask << 2 | 3, rule)
+    return [row >> 1 & mask for row in next_rows[1:-1]]
+
+
+class BitWorld(World):
+    """World storing each row as an int bitmask, using one bit per cell.
+
+    Rows are stepped with bitwise adders over three rows at a time, which
+    processes a whole row per Python operation.
+    """
+    ENGINES = ('bitwise',)
+    SUPPORTS_B0 = True
+    TOPOLOGIES = (BOUNDED, TORUS)
+
+    def __init__(self, x, y, engine='bitwise', rule=None, topology=BOUNDED):
+        super().__init__(x, y, engine=engine, rule=rule, topology=topology)
+        del self._alives
+
+        self._mask = (1 << x) - 1
+        self._rows = [0] * y
+
+    @property
+    def alives(self):
+        return tuple(_rows_to_cells(self._rows))
+
+    def alives_in(self, x0, y0, x1, y1):
+        x0, y0, x1, y1 = self._clip(x0, y0, x1, y1)
+        return tuple(_rows_cells_in(self._rows[y0:y1], x0, x1, start=y0))
+
+    def _to_bitmap(self):
+        return _rows_to_bitmap(self._rows, self._size[0])
+
+    def _from_bitmap(self, bitmap):
+        self._rows = _bitmap_to_rows(bitmap, *self._size)
+        self._hash = None
+
+    @check_boundary
+    def set_alive(self, x, y):
+        self._rows[y] |= 1 << x
+        self._hash = None
+
+    @check_boundary
+    def set_dead(self, x, y):
+        self._rows[y] &= ~(1 << x)
+        self._hash = None
+
+    @check_boundary
+    def is_alive(self, x, y):
+        return bool(self._rows[y] >> x & 1)
+
+    def _calc_next_rows(self):
+        if self._topology == TORUS:
+            return _step_torus_rows(self._rows, self._mask, self._rule)
+        return _step_rows(self._rows, self._mask, self._rule)
+
+    def _run(self, generations):
+        start_rows = self._rows
+        for _ in range(generations):
+            next_rows = self._calc_next_rows()
+            if next_rows == self._rows:
+                break
+            self._rows = next_rows
+
+        return frozenset(_rows_to_cells(
+            [row ^ start_row for row, start_row in zip(self._rows, start_rows)]))
+
+
+def create_world(x, y, engine='counting', rule=None, topology=BOUNDED):
+    """Create a world stepped by the given engine, under the given rule.
+
+    Engine "numpy" creates a DenseWorld, and falls back to World with the
+    "counting" engine if NumPy is not installed. Engine "bitwise" creates a
+    BitWorld. Other engines create a World.
+    """
+    if engine in BitWorld.ENGINES:
+        return BitWorld(x, y, engine=engine, rule=rule, topology=topology)
+    if engine in DenseWorld.ENGINES:
+        if numpy is not None:
+            return DenseWorld(x, y, engine=engine, rule=rule, topology=topology)
+        logger.warning('NumPy is not installed, falling back to the "counting" engine.')
+        engine = 'counting'
+    return World(x, y, engine=engine, rule=rule, topology=topology)
 
 
 class Pattern(object):
@@ -140,3 +861,358 @@ Patterns = [
     Pattern('Exploder', [(0, 2), (0, -2), (-2, 2), (-2, 1), (-2, 0), (-2, -1), (-2, -2),
                          (2, 2), (2, 1), (2, 0), (2, -1), (2, -2)])
 ]
+
+
+class _Node(object):
+    """Canonical quadtree node of HashLife.
+
+    A node of level k is a square of 2^k x 2^k cells made of four nodes of
+    level k-1. Level 0 nodes are single cells. Nodes are created only through
+    HashLife._join(), so equal nodes are always the same object.
+    """
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population')
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+class HashLife(object):
+    """Unbounded universe stepped with the HashLife algorithm.
+
+    Cells are stored in a quadtree of canonical nodes, and the result of
+    advancing each node is memoized, so advance() can jump by huge numbers of
+    generations on structured patterns. The universe has no boundary: use
+    to_world() to clip the cells into a World of a given size. Since a World
+    has hard edges, the result only equals stepping the World itself if the
+    pattern never reaches the edges of the World.
+
+    The node cache is bounded by max_nodes. When it grows larger, nodes
+    unreachable from the current universe are evicted between jumps.
+
+    B0 rules are not supported, since they would fill the unbounded universe.
+    """
+    _OFF = _Node(0, None, None, None, None, 0)
+    _ON = _Node(0, None, None, None, None, 1)
+
+    def __init__(self, max_nodes=1000000, rule=None):
+        if max_nodes <= 0:
+            raise ValueError('max_nodes must be larger than 0')
+        rule = as_rule(rule)
+        if rule.has_b0:
+            raise ValueError('HashLife does not support B0 rules')
+
+        self.max_nodes = max_nodes
+        self._rule = rule
+        self._size = None
+        self._nodes = dict()
+        self._results = dict()
+        self._empties = [self._OFF]
+        self._generation = 0
+        # The root covers the cells from (origin) to (origin + 2^level - 1).
+        self._root = self._empty(3)
+        self._origin = (-4, -4)
+
+    @classmethod
+    def from_world(cls, world, **kwargs):
+        kwargs.setdefault('rule', world.rule)
+        life = cls(**kwargs)
+        life._size = world.size
+        life._generation = world.generation
+        life._set_alives(world.alives)
+        return life
+
+    @classmethod
+    def from_pattern(cls, pattern, **kwargs):
+        life = cls(**kwargs)
+        # Pattern coordinates point upward, while the world's point downward.
+        life._set_alives((x, -y) for x, y in pattern.alives)
+        return life
+
+    def to_world(self, x=None, y=None, engine='counting', topology=BOUNDED):
+        """Create a World with the alive cells inside its boundary.
+
+        The size defaults to the size of the World this universe was created
+        from. An INFINITE World gets all the alive cells.
+        """
+        if x is None or y is None:
+            if self._size is None:
+                raise ValueError('Size of the world must be given')
+            x, y = self._size
+
+        world = create_world(x, y, engine=engine, rule=self._rule, topology=topology)
+        for cell_x, cell_y in self.alives:
+            if topology == INFINITE or (0 <= cell_x < x and 0 <= cell_y < y):
+                world.set_alive(cell_x, cell_y)
+        world._generation = self._generation
+        return world
+
+    def to_pattern(self, name):
+        return Pattern(name, ((x, -y) for x, y in self.alives))
+
+    @property
+    def rule(self):
+        return self._rule
+
+    @property
+    def generation(self):
+        return self._generation
+
+    @property
+    def population(self):
+        return self._root.population
+
+    @property
+    def node_count(self):
+        return len(self._nodes)
+
+    @property
+    def alives(self):
+        alives = []
+        stack = [(self._root, self._origin[0], self._origin[1])]
+        while stack:
+            node, x, y = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                alives.append((x, y))
+                continue
+            half = 1 << (node.level - 1)
+            stack.append((node.nw, x, y))
+            stack.append((node.ne, x + half, y))
+            stack.append((node.sw, x, y + half))
+            stack.append((node.se, x + half, y + half))
+        return tuple(alives)
+
+    def set_alive(self, x, y):
+        """Set a cell alive, rebuilding only the nodes on its path from the root."""
+        while not self._contains(x, y):
+            self._expand()
+        self._root = self._set_cell(self._root, x - self._origin[0], y - self._origin[1])
+
+    def is_alive(self, x, y):
+        if not self._contains(x, y):
+            return False
+        node = self._root
+        x, y = x - self._origin[0], y - self._origin[1]
+        while node.level > 0:
+            half = 1 << (node.level - 1)
+            if y < half:
+                node = node.nw if x < half else node.ne
+            else:
+                node = node.sw if x < half else node.se
+            x, y = x % half, y % half
+        return node is self._ON
+
+    def advance(self, generations=1):
+        if generations < 0:
+            raise ValueError('generations must not be negative')
+
+        j = 0
+        while generations:
+            if generations & 1:
+                self._jump(j)
+            generations >>= 1
+            j += 1
+
+    def _jump(self, j):
+        """Advance the universe by 2^j generations."""
+        # Make sure the pattern can't escape from the root while advancing:
+        # pad until the alive cells stay inside the center quarter and the
+        # root is large enough to be advanced by 2^j at once.
+        while self._root.level < j + 2 or not self._is_padded(self._root):
+            self._expand()
+        # The successor of the expanded root has the same area as the root.
+        self._root = self._successor(self._grow(self._root), j)
+        self._generation += 1 << j
+        self._shrink()
+        if len(self._nodes) > self.max_nodes:
+            self._collect()
+
+    def _contains(self, x, y):
+        x, y = x - self._origin[0], y - self._origin[1]
+        return 0 <= x < (1 << self._root.level) and 0 <= y < (1 << self._root.level)
+
+    def _set_cell(self, node, x, y):
+        """Return the node with the cell (x, y) relative to it alive."""
+        if node.level == 0:
+            return self._ON
+        half = 1 << (node.level - 1)
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        if y < half:
+            if x < half:
+                nw = self._set_cell(nw, x, y)
+            else:
+                ne = self._set_cell(ne, x - half, y)
+        elif x < half:
+            sw = self._set_cell(sw, x, y - half)
+        else:
+            se = self._set_cell(se, x - half, y - half)
+        return self._join(nw, ne, sw, se)
+
+    def _set_alives(self, cells):
+        """Build the root from scratch with the cells alive, faster than set_alive() in bulk."""
+        cells = set(cells) | set(self.alives)
+        if not cells:
+            return
+
+        min_x = min(c[0] for c in cells)
+        min_y = min(c[1] for c in cells)
+        span = max(max(c[0] for c in cells) - min_x,
+                   max(c[1] for c in cells) - min_y) + 1
+        level = max(3, span.bit_length())
+        self._origin = (min_x, min_y)
+        self._root = self._build(level, min_x, min_y, list(cells))
+
+    def _build(self, level, x, y, cells):
+        if not cells:
+            return self._empty(level)
+        if level == 0:
+            return self._ON
+
+        half = 1 << (level - 1)
+        quadrants = ([], [], [], [])
+        for cell in cells:
+            quadrants[(cell[0] >= x + half) + 2 * (cell[1] >= y + half)].append(cell)
+        return self._join(self._build(level - 1, x, y, quadrants[0]),
+                          self._build(level - 1, x + half, y, quadrants[1]),
+                          self._build(level - 1, x, y + half, quadrants[2]),
+                          self._build(level - 1, x + half, y + half, quadrants[3]))
+
+    def _join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = _Node(nw.level + 1, nw, ne, sw, se,
+                         nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def _empty(self, level):
+        while len(self._empties) <= level:
+            e = self._empties[-1]
+            self._empties.append(self._join(e, e, e, e))
+        return self._empties[level]
+
+    def _grow(self, node):
+        """Return a node one level higher with the given node at its center."""
+        e = self._empty(node.level - 1)
+        return self._join(self._join(e, e, e, node.nw),
+                          self._join(e, e, node.ne, e),
+                          self._join(e, node.sw, e, e),
+                          self._join(node.se, e, e, e))
+
+    def _expand(self):
+        half = 1 << (self._root.level - 1)
+        self._root = self._grow(self._root)
+        self._origin = (self._origin[0] - half, self._origin[1] - half)
+
+    def _center(self, node):
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _is_padded(self, node):
+        return self._center(self._center(node)).population == node.population
+
+    def _shrink(self):
+        """Drop empty borders of the root while keeping it padded."""
+        root = self._root
+        while root.level > 3 and self._is_padded(root):
+            quarter = 1 << (root.level - 2)
+            root = self._center(root)
+            self._origin = (self._origin[0] + quarter, self._origin[1] + quarter)
+        self._root = root
+
+    def _collect(self):
+        """Evict the nodes and results unreachable from the root."""
+        reachable = set()
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.level == 0 or node in reachable:
+                continue
+            reachable.add(node)
+            stack.extend((node.nw, node.ne, node.sw, node.se))
+
+        self._nodes = {key: node for key, node in self._nodes.items() if node in reachable}
+        self._results = {key: node for key, node in self._results.items()
+                         if key[0] in reachable and (node.level == 0 or node in reachable)}
+        # Keep only the empty nodes that survived, the others are recreated
+        # on demand.
+        self._empties = [self._OFF]
+        while True:
+            e = self._empties[-1]
+            e = self._nodes.get((e, e, e, e))
+            if e is None:
+                break
+            self._empties.append(e)
+        logger.debug('HashLife cache collected, %d nodes left', len(self._nodes))
+
+    def _life_4x4(self, node):
+        """Advance the center 2x2 cells of a level 2 node by 1 generation."""
+        # The 16 cells as bits, bit 4 * y + x being the cell (x, y).
+        cells = 0
+        for shift, quadrant in ((0, node.nw), (2, node.ne), (8, node.sw), (10, node.se)):
+            cells |= (quadrant.nw.population | quadrant.ne.population << 1 |
+                      quadrant.sw.population << 4 | quadrant.se.population << 5) << shift
+        block_table = self._rule.block_table
+
+        def next_cell(x, y):
+            # The 3x3 block around the cell, as the 9 bits of block_table.
+            shift = 4 * (y - 1) + x - 1
+            block = ((cells >> shift & 0b111) | (cells >> shift + 4 & 0b111) << 3 |
+                     (cells >> shift + 8 & 0b111) << 6)
+            return self._ON if block_table[block] else self._OFF
+
+        return self._join(next_cell(1, 1), next_cell(2, 1),
+                          next_cell(1, 2), next_cell(2, 2))
+
+    def _successor(self, node, j):
+        """Return the center half of a node advanced by 2^j generations.
+
+        j must not be larger than node.level - 2.
+        """
+        if node.population == 0:
+            return node.nw
+
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            join = self._join
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            # Nine overlapping sub-squares, each advanced by up to 2^j.
+            sub_j = min(j, node.level - 3)
+            c1 = self._successor(nw, sub_j)
+            c2 = self._successor(join(nw.ne, ne.nw, nw.se, ne.sw), sub_j)
+            c3 = self._successor(ne, sub_j)
+            c4 = self._successor(join(nw.sw, nw.se, sw.nw, sw.ne), sub_j)
+            c5 = self._successor(join(nw.se, ne.sw, sw.ne, se.nw), sub_j)
+            c6 = self._successor(join(ne.sw, ne.se, se.nw, se.ne), sub_j)
+            c7 = self._successor(sw, sub_j)
+            c8 = self._successor(join(sw.ne, se.nw, sw.se, se.sw), sub_j)
+            c9 = self._successor(se, sub_j)
+
+            if j < node.level - 2:
+                # The sub-squares are already advanced by 2^j generations,
+                # just take their centers.
+                result = join(join(c1.se, c2.sw, c4.ne, c5.nw),
+                              join(c2.se, c3.sw, c5.ne, c6.nw),
+                              join(c4.se, c5.sw, c7.ne, c8.nw),
+                              join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                # Advance the sub-squares by another 2^(j-1) generations.
+                result = join(self._successor(join(c1, c2, c4, c5), sub_j),
+                              self._successor(join(c2, c3, c5, c6), sub_j),
+                              self._successor(join(c4, c5, c7, c8), sub_j),
+                              self._successor(join(c5, c6, c8, c9), sub_j))
+
+        self._results[key] = result
+        return result
@@ -0,0 +1,280 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:
+    # Python < 3.8.
+    SharedMemory = None
+
+from .model import World, BitWorld, BOUNDED
+from .model import _step_rows, _rows_to_cells, _rows_cells_in, check_boundary
+from .rules import CONWAY
+
+
+def _step_tile(rows, mask, has_top_halo, has_bottom_halo, rule=CONWAY):
+    """Advance the rows of a tile, and drop the halo rows from the result."""
+    next_rows = _step_rows(rows, mask, rule)
+    return next_rows[int(has_top_halo):len(next_rows) - int(has_bottom_halo)]
+
+
+class ParallelWorld(BitWorld):
+    """BitWorld advancing horizontal tiles of rows in a pool of processes.
+
+    Every generation each tile is sent to a worker together with a halo of one
+    row above and below it, so the result is the same as BitWorld.advance().
+    The pool is started on the first advance(); call close(), or use the world
+    as a context manager, to shut it down.
+    """
+    ENGINES = ('parallel',)
+    # The tiles would need halos wrapping around for a torus.
+    TOPOLOGIES = (BOUNDED,)
+
+    def __init__(self, x, y, engine='parallel', workers=None, rule=None):
+        if workers is not None and workers <= 0:
+            raise ValueError('workers must be larger than 0')
+        super().__init__(x, y, engine=engine, rule=rule)
+
+        self._workers = workers or os.cpu_count() or 1
+        self._executor = None
+
+    @property
+    def workers(self):
+        return self._workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _calc_tiles(self):
+        n_rows = self._size[1]
+        n_tiles = min(self._workers, n_rows)
+        bounds = [n_rows * i // n_tiles for i in range(n_tiles + 1)]
+        return tuple(zip(bounds[:-1], bounds[1:]))
+
+    def _calc_next_rows(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+
+        rows = self._rows
+        futures = []
+        for start, stop in self._calc_tiles():
+            has_top_halo = start > 0
+            has_bottom_halo = stop < len(rows)
+            futures.append(self._executor.submit(
+                _step_tile,
+                rows[start - has_top_halo:stop + has_bottom_halo],
+                self._mask, has_top_halo, has_bottom_halo, self._rule))
+
+        next_rows = []
+        for future in futures:
+            next_rows.extend(future.result())
+        return next_rows
+
+
+def _read_rows(buf, row_bytes, start, stop):
+    return [int.from_bytes(buf[y * row_bytes:(y + 1) * row_bytes], 'little')
+            for y in range(start, stop)]
+
+
+def _shared_memory_worker(name, width, height, index, start, stop,
+                          start_barrier, done_barrier, state, changed_flags, rule=CONWAY):
+    """Step rows [start, stop) from one board buffer into the other.
+
+    state holds the index of the buffer with the current generation, or -1
+    to stop the worker. changed_flags[index] tells whether any row changed.
+    """
+    shm = SharedMemory(name=name)
+    row_bytes = (width + 7) // 8
+    mask = (1 << width) - 1
+    board_bytes = row_bytes * height
+    try:
+        while True:
+            start_barrier.wait()
+            current = state.value
+            if current < 0:
+                break
+
+            src = shm.buf[current * board_bytes:(current + 1) * board_bytes]
+            dst = shm.buf[(1 - current) * board_bytes:(2 - current) * board_bytes]
+            has_top_halo = start > 0
+            has_bottom_halo = stop < height
+            rows = _read_rows(src, row_bytes, start - has_top_halo, stop + has_bottom_halo)
+            next_rows = _step_tile(rows, mask, has_top_halo, has_bottom_halo, rule)
+            for y, row in enumerate(next_rows, start):
+                dst[y * row_bytes:(y + 1) * row_bytes] = row.to_bytes(row_bytes, 'little')
+            changed_flags[index] = next_rows != rows[int(has_top_halo):stop - start + has_top_halo]
+            del src, dst
+
+            done_barrier.wait()
+    finally:
+        shm.close()
+
+
+class SharedMemoryWorld(World):
+    """World whose board lives in shared memory, stepped by worker processes.
+
+    The board is stored twice in one shared memory block, one row bitmask of
+    fixed size per row: one copy for the current generation and one for the
+    next. Every worker owns a range of rows, reads the rows it needs from the
+    current copy and writes its rows into the next copy, then all of them
+    meet at a barrier. No board data is pickled between generations.
+
+    The workers are started on the first advance(). Call close(), or use the
+    world as a context manager, to stop them and free the shared memory.
+    """
+    # Without shared memory, the engine is not offered at all.
+    ENGINES = ('sharedmem',) if SharedMemory is not None else ()
+    SUPPORTS_B0 = True
+    TOPOLOGIES = (BOUNDED,)
+
+    def __init__(self, x, y, engine='sharedmem', workers=None, rule=None):
+        if SharedMemory is None:
+            raise ImportError('SharedMemoryWorld requires Python 3.8 or later')
+        if workers is not None and workers <= 0:
+            raise ValueError('workers must be larger than 0')
+        super().__init__(x, y, engine=engine, rule=rule)
+        del self._alives
+
+        self._workers = min(workers or os.cpu_count() or 1, y)
+        self._row_bytes = (x + 7) // 8
+        self._board_bytes = self._row_bytes * y
+        self._shm = SharedMemory(create=True, size=2 * self._board_bytes)
+        self._shm.buf[:2 * self._board_bytes] = bytes(2 * self._board_bytes)
+        self._current = 0
+        self._processes = None
+        # The board the changed cells are computed against. None means the
+        # other buffer, which holds the previous generation.
+        self._previous = None
+
+    @property
+    def workers(self):
+        return self._workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._processes is not None:
+            self._state.value = -1
+            self._start_barrier.wait()
+            for process in self._processes:
+                process.join()
+            self._processes = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def _start_workers(self):
+        self._state = multiprocessing.Value('i', 0, lock=False)
+        self._start_barrier = multiprocessing.Barrier(self._workers + 1)
+        self._done_barrier = multiprocessing.Barrier(self._workers + 1)
+        self._changed_flags = multiprocessing.Array('b', self._workers, lock=False)
+
+        height = self._size[1]
+        bounds = [height * i // self._workers for i in range(self._workers + 1)]
+        self._processes = []
+        for index, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+            process = multiprocessing.Process(
+                target=_shared_memory_worker,
+                args=(self._shm.name, self._size[0], height, index, start, stop,
+                      self._start_barrier, self._done_barrier, self._state,
+                      self._changed_flags, self._rule),
+                daemon=True)
+            process.start()
+            self._processes.append(process)
+
+    def _buffer(self, index):
+        return self._shm.buf[index * self._board_bytes:(index + 1) * self._board_bytes]
+
+    def _cell_index(self, x, y):
+        return self._current * self._board_bytes + y * self._row_bytes + x // 8
+
+    @property
+    def alives(self):
+        rows = _read_rows(self._buffer(self._current), self._row_bytes, 0, self._size[1])
+        return tuple(_rows_to_cells(rows))
+
+    def alives_in(self, x0, y0, x1, y1):
+        x0, y0, x1, y1 = self._clip(x0, y0, x1, y1)
+        rows = _read_rows(self._buffer(self._current), self._row_bytes, y0, y1)
+        return tuple(_rows_cells_in(rows, x0, x1, start=y0))
+
+    @property
+    def changed(self):
+        # The board before the last advance() is still around, so the changed
+        # cells are only computed when they are needed.
+        if self._changed is None:
+            height = self._size[1]
+            previous = self._previous
+            if previous is None:
+                previous = self._buffer(1 - self._current)
+            rows = _read_rows(self._buffer(self._current), self._row_bytes, 0, height)
+            prev_rows = _read_rows(previous, self._row_bytes, 0, height)
+            self._changed = frozenset(_rows_to_cells(
+                [row ^ prev_row for row, prev_row in zip(rows, prev_rows)]))
+        return self._changed
+
+    def _to_bitmap(self):
+        # The snapshot bitmap has the same layout as the buffers.
+        return bytes(self._buffer(self._current))
+
+    def _from_bitmap(self, bitmap):
+        self.changed
+        buf = self._buffer(self._current)
+        buf[:] = bitmap
+        # Clear the padding bits after the last cell of every row.
+        width, height = self._size
+        if width % 8:
+            keep = (1 << (width % 8)) - 1
+            for y in range(height):
+                buf[(y + 1) * self._row_bytes - 1] &= keep
+        self._hash = None
+
+    @check_boundary
+    def set_alive(self, x, y):
+        # Compute the changed cells before the board is edited by hand.
+        self.changed
+        self._shm.buf[self._cell_index(x, y)] |= 1 << (x % 8)
+        self._hash = None
+
+    @check_boundary
+    def set_dead(self, x, y):
+        self.changed
+        self._shm.buf[self._cell_index(x, y)] &= ~(1 << (x % 8)) & 0xff
+        self._hash = None
+
+    @check_boundary
+    def is_alive(self, x, y):
+        return bool(self._shm.buf[self._cell_index(x, y)] >> (x % 8) & 1)
+
+    def _run(self, generations):
+        if self._processes is None:
+            self._start_workers()
+
+        self._previous = None
+        if generations != 1:
+            self._previous = bytes(self._buffer(self._current))
+
+        for _ in range(generations):
+            self._state.value = self._current
+            self._start_barrier.wait()
+            self._done_barrier.wait()
+            self._current = 1 - self._current
+            if not any(self._changed_flags):
+                break
+
+        # The changed cells are computed by the changed property.
+        return None
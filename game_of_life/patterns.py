@@ -0,0 +1,179 @@
+"""Reading patterns from RLE and plaintext (.cells) files.
+
+The files are parsed line by line from the stream, so a pattern never sits in
+memory as one string. Cells are yielded with the top left corner of the
+pattern at (0, 0) and y pointing downward, like the cells of a World.
+"""
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from .model import Pattern
+
+
+# Summary of a pattern file, read without building its cells.
+PatternInfo = namedtuple('PatternInfo', ('name', 'path', 'width', 'height', 'population'))
+
+EXTENSIONS = ('.rle', '.cells')
+
+_RLE_RUN = re.compile(r'(\d*)([^\d\s])')
+_RLE_TRAILING_COUNT = re.compile(r'\d+$')
+
+
+def _rle_runs(stream, info):
+    """Yield the (count, tag) runs of an RLE stream.
+
+    The name and the size found in the comments and the header are stored in
+    info.
+    """
+    header_seen = False
+    carry = ''
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('#'):
+            if line[1:2] == 'N':
+                info['name'] = line[2:].strip()
+            continue
+        if not header_seen and line.startswith('x'):
+            header_seen = True
+            for item in line.split(','):
+                key, _, value = item.partition('=')
+                key, value = key.strip(), value.strip()
+                if key == 'x':
+                    info['width'] = int(value)
+                elif key == 'y':
+                    info['height'] = int(value)
+                elif key == 'rule':
+                    info['rule'] = value
+            continue
+
+        # A run count may be split from its tag at the end of the line.
+        line = carry + line
+        trailing = _RLE_TRAILING_COUNT.search(line)
+        carry = trailing.group() if trailing else ''
+        for match in _RLE_RUN.finditer(line):
+            count, tag = match.groups()
+            if tag == '!':
+                return
+            yield int(count) if count else 1, tag
+
+
+def read_rle(stream, info=None):
+    """Yield the alive cells of an RLE stream."""
+    info = dict() if info is None else info
+    x = y = 0
+    for count, tag in _rle_runs(stream, info):
+        if tag == '$':
+            x = 0
+            y += count
+        elif tag in 'b.':
+            x += count
+        else:
+            # "o" and the letters of multi-state rules are alive cells.
+            for i in range(count):
+                yield (x + i, y)
+            x += count
+
+
+def _plaintext_rows(stream, info):
+    for line in stream:
+        if line.startswith('!'):
+            if line.startswith('!Name:'):
+                info['name'] = line[len('!Name:'):].strip()
+            continue
+        yield line.rstrip('\r\n')
+
+
+def read_plaintext(stream, info=None):
+    """Yield the alive cells of a plaintext (.cells) stream.
+
+    "O" and "*" are alive cells, lines starting with "!" are comments.
+    """
+    info = dict() if info is None else info
+    for y, row in enumerate(_plaintext_rows(stream, info)):
+        for x, c in enumerate(row):
+            if c in 'O*':
+                yield (x, y)
+
+
+def _reader(path):
+    if path.lower().endswith('.rle'):
+        return read_rle
+    return read_plaintext
+
+
+def read_cells(path):
+    """Return the alive cells of a pattern file, with the size of the pattern."""
+    info = dict()
+    with open(path, encoding='utf-8') as f:
+        cells = list(_reader(path)(f, info))
+    width = info.get('width', max((c[0] for c in cells), default=-1) + 1)
+    height = info.get('height', max((c[1] for c in cells), default=-1) + 1)
+    return cells, (width, height), info
+
+
+def load_pattern(path):
+    """Load a pattern file as a Pattern centered at (0, 0)."""
+    cells, (width, height), info = read_cells(path)
+    name = info.get('name') or os.path.splitext(os.path.basename(path))[0]
+    center_x, center_y = width // 2, height // 2
+    # Pattern coordinates point upward.
+    return Pattern(name, ((x - center_x, center_y - y) for x, y in cells))
+
+
+def read_info(path):
+    """Read the name, the bounding box and the population of a pattern file.
+
+    The runs or rows are only counted, no cell is built.
+    """
+    info = dict()
+    with open(path, encoding='utf-8') as f:
+        if path.lower().endswith('.rle'):
+            population = sum(count for count, tag in _rle_runs(f, info) if tag not in 'b.$')
+            width, height = info.get('width', 0), info.get('height', 0)
+        else:
+            width = height = population = 0
+            for row in _plaintext_rows(f, info):
+                width = max(width, len(row.rstrip('.')))
+                height += 1
+                population += row.count('O') + row.count('*')
+
+    name = info.get('name') or os.path.splitext(os.path.basename(path))[0]
+    return PatternInfo(name, path, width, height, population)
+
+
+class PatternLibrary(object):
+    """Directory of pattern files, indexed on creation and parsed on demand.
+
+    Only the summary of each file is read when indexing. A pattern is parsed
+    the first time it is taken from the library, and the last cache_size
+    parsed patterns are kept in an LRU cache.
+    """
+
+    def __init__(self, directory, cache_size=32):
+        self._directory = directory
+        self._index = tuple(
+            read_info(os.path.join(directory, filename))
+            for filename in sorted(os.listdir(directory))
+            if filename.lower().endswith(EXTENSIONS))
+        self._load = lru_cache(maxsize=cache_size)(load_pattern)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __getitem__(self, index):
+        return self._load(self._index[index].path)
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def names(self):
+        return tuple(info.name for info in self._index)
+
+    def cache_info(self):
+        return self._load.cache_info()
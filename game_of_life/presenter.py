@@ -1,29 +1,80 @@
 import logging
+import threading
+import time
 import tkinter
+from collections import namedtuple
 
-from .view import MainView
-from .model import World, Patterns
+from .history import History
+from .stepper import Stepper
+from .view import MainView, visible_size
+from .viewport import Viewport
+from .model import World, Patterns, Delta, DEAD, STILL, BOUNDED, INFINITE
 
 
 logger = logging.getLogger(__name__)
 
+# Statistics passed to the observers of the presenter after every generation
+# shown. alives_seconds is the time taken to get the cells to draw.
+FrameStats = namedtuple('FrameStats',
+                        ('generation', 'advance_seconds', 'alives_seconds',
+                         'update_seconds', 'itemconfig_calls',
+                         'births', 'deaths', 'population'))
+
+# Generation stepped by the background thread, ready to be drawn. alives are
+# the cells of the viewport region, in view coordinates.
+Frame = namedtuple('Frame', ('generation', 'alives', 'region', 'status', 'generation_range'))
+
+# Delay between two frames drawn while stepping in the background, in ms.
+FRAME_DELAY = 16
+
 
 class GameOfLifePresenter(object):
 
-    def __init__(self, width, height, min_delay):
+    def __init__(self, width, height, min_delay, pattern_library=None, renderer='auto',
+                 threaded=False, rule=None, topology=BOUNDED):
         self.root = tkinter.Tk()
-        self.main_view = MainView(width, height,
-                                  pattern_options=[p.name for p in Patterns],
-                                  master=self.root)
-        self.world = World(width, height)
+        # Patterns of the library are listed after the built-in ones, and only
+        # parsed when selected.
+        self.pattern_library = pattern_library
+        pattern_options = [p.name for p in Patterns]
+        if pattern_library is not None:
+            pattern_options.extend(pattern_library.names)
+        # Only the cells in the viewport are ever given to the view, so
+        # rendering costs depend on the size of the window, not of the world.
+        self.viewport = Viewport(width, height, *visible_size(width, height, renderer))
+        self.main_view = MainView(self.viewport.columns, self.viewport.rows,
+                                  pattern_options=pattern_options,
+                                  master=self.root,
+                                  renderer=renderer)
+        self.rule = rule
+        self.topology = topology
+        self.world = World(width, height, rule=rule, topology=topology)
+        self.world.track_history()
 
         default_pattern = Patterns[0]
         for x, y in default_pattern.as_screen_coordinate(width, height):
             self.world.set_alive(x, y)
 
+        # Past generations, to step back and to seek with the scrubber.
+        self.history = History()
+        self.history.record(self.world)
+
         self.size = (width, height)
         self.min_delay = min_delay
         self._timer_delay = None
+        # With threaded, the world is stepped by a Stepper thread and the Tk
+        # loop only draws its latest frame. The lock guards the world, the
+        # history and the viewport against the thread.
+        self.threaded = threaded
+        self._stepper = None
+        self._lock = threading.Lock()
+        # Generation last set on the generation scale. Tk runs the command of
+        # the scale whenever its value changes, so setting it sends a
+        # <<Generation-Change>> back, which must not seek.
+        self._shown_generation = None
+        self._rates_start = None
+        self._observers = []
+        self._advance_stats = None
         # Initial speed. Don't change it or the speed will differ from the speed
         # scroller!
         self.set_speed(0.1)
@@ -35,23 +86,62 @@ class GameOfLifePresenter(object):
         self.main_view.bind_all('<<Next-Click>>', self.on_next_click)
         self.main_view.bind_all('<<Speed-Change>>', self.on_speed_change)
         self.main_view.bind_all('<<PatternOption-Change>>', self.on_pattern_option_change)
+        self.main_view.bind_all('<<Back-Click>>', self.on_back_click)
+        self.main_view.bind_all('<<Generation-Change>>', self.on_generation_change)
+        self.main_view.bind_all('<<View-Pan>>', self.on_view_pan)
+        self.main_view.bind_all('<<View-Zoom>>', self.on_view_zoom)
 
     @property
     def is_running(self):
         return self._is_running
 
+    def _shows_whole_world(self):
+        # Cells of an infinite world may be outside of its size too.
+        return self.viewport.covers_world and self.topology != INFINITE
+
+    def _visible_alives(self):
+        """Return the alive cells in the viewport, in view coordinates."""
+        if self._shows_whole_world():
+            return self.world.alives
+        return self.viewport.to_view(self.world.alives_in(*self.viewport.region))
+
+    def _visible_delta(self):
+        """Return the births and deaths of the last advance in the viewport.
+
+        Drawing them costs O(changes), where drawing the alive cells costs
+        O(population).
+        """
+        delta = self.world.delta
+        if self._shows_whole_world():
+            return delta
+        return Delta(self.viewport.visible(delta.births), self.viewport.visible(delta.deaths))
+
     def run(self):
-        self.main_view.update(alives=self.world.alives)
+        self.main_view.update(alives=self._visible_alives())
         self.stop()
         self.root.mainloop()
 
     def start(self):
         self._is_running = True
+        self._rates_start = None
         self.main_view.update(startstop_text='Stop')
-        self.root.after(self._timer_delay, self.on_timer)
+        if self.threaded:
+            self._stepper = Stepper(self._step_in_background,
+                                    delay=self._timer_delay / 1000,
+                                    until=lambda frame: frame.status in (DEAD, STILL))
+            self._stepper.start()
+            self.root.after(FRAME_DELAY, self.on_frame)
+        else:
+            self.root.after(self._timer_delay, self.on_timer)
 
     def stop(self):
         self._is_running = False
+        if self._stepper is not None:
+            self._stepper.stop()
+            self._stepper = None
+            # The last frames may have been dropped.
+            self.main_view.update(alives=self._visible_alives())
+            self._update_generation_scale()
         self.main_view.update(startstop_text='Start')
 
     def set_speed(self, scale):
@@ -59,21 +149,164 @@ class GameOfLifePresenter(object):
             raise ValueError('Speed must be within 0 < scale <= 1')
 
         new_delay = int(self.min_delay / scale)
-        logger.debug('Change delay to {}'.format(new_delay))
+        logger.debug('Change delay to %s', new_delay)
         self._timer_delay = new_delay
+        if self._stepper is not None:
+            self._stepper.delay = new_delay / 1000
+
+    def add_observer(self, callback):
+        """Call callback with a FrameStats after every generation shown.
+
+        Generations stepped in the background are not reported.
+        """
+        if not self._observers:
+            self.world.add_observer(self._on_world_advance)
+        self._observers.append(callback)
+
+    def remove_observer(self, callback):
+        self._observers.remove(callback)
+        if not self._observers:
+            self.world.remove_observer(self._on_world_advance)
+
+    def go_to_generation(self, generation):
+        """Show a generation kept in the history.
+
+        Return False if the generation is not in the history anymore.
+        """
+        with self._lock:
+            try:
+                alives = self.history.seek(generation)
+            except KeyError:
+                logger.debug('Generation %s is not in the history', generation)
+                return False
+
+            self.world.restore(alives, generation)
+            self._shown_generation = generation
+            self.main_view.update(alives=self._visible_alives(), generation=generation)
+        return True
+
+    def _update_generation_scale(self):
+        self._shown_generation = self.world.generation
+        self.main_view.update(generation_range=(self.history.first_generation,
+                                                self.history.last_generation),
+                              generation=self.world.generation)
+
+    def _record_history(self):
+        self.history.record(self.world)
+        self._update_generation_scale()
+
+    def _count_frame(self, generation):
+        """Show the generations/s and frames/s, about every second."""
+        now = time.monotonic()
+        if self._rates_start is None:
+            self._rates_start = (now, generation, 0)
+            return
+        start, start_generation, frames = self._rates_start
+        frames += 1
+        elapsed = now - start
+        if elapsed < 1:
+            self._rates_start = (start, start_generation, frames)
+            return
+        self.main_view.update(rates=((generation - start_generation) / elapsed,
+                                     frames / elapsed))
+        self._rates_start = (now, generation, 0)
+
+    def _on_world_advance(self, stats):
+        self._advance_stats = stats
+
+    def _advance(self):
+        with self._lock:
+            if self._observers:
+                self._advance_instrumented()
+            else:
+                self.world.advance()
+                self.main_view.update(delta=self._visible_delta())
+            self._record_history()
+
+    def _step_in_background(self):
+        """Advance the world by a generation, in the Stepper thread.
+
+        Tk must not be called from here, the frame is drawn by on_frame().
+        """
+        with self._lock:
+            self.world.advance()
+            self.history.record(self.world)
+            return Frame(generation=self.world.generation,
+                         alives=tuple(self._visible_alives()),
+                         region=self.viewport.region,
+                         status=self.world.status,
+                         generation_range=(self.history.first_generation,
+                                           self.history.last_generation))
+
+    def _advance_instrumented(self):
+        grid = self.main_view.world_grid
+        self.world.advance()
+
+        start = time.perf_counter()
+        delta = self._visible_delta()
+        alives_seconds = time.perf_counter() - start
+
+        itemconfig_calls = grid.itemconfig_calls
+        start = time.perf_counter()
+        self.main_view.update(delta=delta)
+        update_seconds = time.perf_counter() - start
+
+        advance_stats = self._advance_stats
+        stats = FrameStats(generation=advance_stats.generation,
+                           advance_seconds=advance_stats.seconds,
+                           alives_seconds=alives_seconds,
+                           update_seconds=update_seconds,
+                           itemconfig_calls=grid.itemconfig_calls - itemconfig_calls,
+                           births=advance_stats.births,
+                           deaths=advance_stats.deaths,
+                           population=advance_stats.population)
+        for callback in list(self._observers):
+            callback(stats)
 
     def on_timer(self):
         if self._is_running:
-            self.world.advance()
-            self.main_view.update(alives=self.world.alives)
-            self.root.after(self._timer_delay, self.on_timer)
+            self._advance()
+            self._count_frame(self.world.generation)
+            if self.world.status in (DEAD, STILL):
+                logger.debug('World is %s, stop the timer.', self.world.status)
+                self.stop()
+            else:
+                self.root.after(self._timer_delay, self.on_timer)
+
+    def on_frame(self):
+        """Draw the latest frame of the Stepper thread, if there is a new one."""
+        stepper = self._stepper
+        if stepper is None:
+            return
+        # Checked before taking the frame, so the last frame is not missed.
+        stepping = stepper.is_alive()
+        frame, is_new = stepper.take()
+        if is_new:
+            # Frames of a viewport panned or zoomed since are outdated.
+            if frame.region == self.viewport.region:
+                self._shown_generation = frame.generation
+                self.main_view.update(alives=frame.alives,
+                                      generation_range=frame.generation_range,
+                                      generation=frame.generation)
+            self._count_frame(frame.generation)
+
+        if stepping:
+            self.root.after(FRAME_DELAY, self.on_frame)
+        else:
+            logger.debug('Stepper stopped, stop running.')
+            self.stop()
 
     def on_cell_click(self, event):
-        logger.debug('on_cell_click! X:{}, Y:{}'.format(event.x, event.y))
-        x, y = event.x, event.y
+        logger.debug('on_cell_click! X:%s, Y:%s', event.x, event.y)
+        x, y = self.viewport.to_world(event.x, event.y)
+        if x >= self.size[0] or y >= self.size[1]:
+            # The view is larger than the world when zoomed out.
+            return
 
-        self.world.toggle_aliveness(x, y)
-        self.main_view.update(alives=self.world.alives)
+        with self._lock:
+            self.world.toggle_aliveness(x, y)
+            self.main_view.update(alives=self._visible_alives())
+            self._record_history()
 
     def on_startstop_toggle(self, event):
         logger.debug('StartStop Toggled!')
@@ -83,19 +316,61 @@ class GameOfLifePresenter(object):
             self.start()
 
     def on_next_click(self, event):
-        self.world.advance()
-        self.main_view.update(alives=self.world.alives)
+        self._advance()
+
+    def on_back_click(self, event):
+        self.stop()
+        self.go_to_generation(self.world.generation - 1)
+
+    def on_generation_change(self, event):
+        logger.debug('Generation change event: %s', event.x)
+        if event.x == self._shown_generation:
+            return
+        with self._lock:
+            generation = self.world.generation
+        if event.x != generation:
+            self.stop()
+            self.go_to_generation(event.x)
+
+    def on_view_pan(self, event):
+        # Dragging the cells right shows the cells on their left.
+        with self._lock:
+            self.viewport.pan(-event.x, -event.y)
+            self.main_view.update(alives=self._visible_alives())
+
+    def on_view_zoom(self, event):
+        grid = self.main_view.world_grid
+        with self._lock:
+            if grid.zoom(event.x):
+                self.viewport.resize(grid.width, grid.height)
+                self.main_view.update(alives=self._visible_alives())
 
     def on_speed_change(self, event):
-        logger.debug('Speed change event: {}'.format(event.x))
+        logger.debug('Speed change event: %s', event.x)
         self.set_speed(event.x/100)
 
     def on_pattern_option_change(self, event):
-        logger.debug('Option Menu change, index: {}'.format(event.x))
-        pattern = Patterns[event.x]
+        logger.debug('Option Menu change, index: %s', event.x)
+        if event.x < len(Patterns):
+            pattern = Patterns[event.x]
+        else:
+            pattern = self.pattern_library[event.x - len(Patterns)]
+
+        try:
+            alive_cells = pattern.as_screen_coordinate(self.size[0], self.size[1])
+        except ValueError as e:
+            logger.warning('Pattern "%s" does not fit: %s', pattern.name, e)
+            return
 
-        self.world = World(self.size[0], self.size[1])
-        for alive_cell in pattern.as_screen_coordinate(self.size[0], self.size[1]):
-            self.world.set_alive(alive_cell[0], alive_cell[1])
+        world = World(self.size[0], self.size[1], rule=self.rule, topology=self.topology)
+        world.track_history()
+        if self._observers:
+            world.add_observer(self._on_world_advance)
+        for alive_cell in alive_cells:
+            world.set_alive(alive_cell[0], alive_cell[1])
 
-        self.main_view.update(alives=self.world.alives)
+        with self._lock:
+            self.world = world
+            self.main_view.update(alives=self._visible_alives())
+            self.history.clear()
+            self._record_history()
@@ -0,0 +1,108 @@
+"""Life-like rules, written in B/S notation such as "B36/S23".
+
+A rule is compiled once into lookup tables, so the engines apply any rule
+with a table lookup instead of testing the neighbor counts.
+"""
+import re
+
+
+_NOTATION = re.compile(r'^B([0-8]*)/S([0-8]*)$', re.IGNORECASE)
+_REVERSED_NOTATION = re.compile(r'^S([0-8]*)/B([0-8]*)$', re.IGNORECASE)
+
+
+class Rule(object):
+    """The neighbor counts for which a dead cell is born and an alive one survives.
+
+    table[9 * alive + count] is the next state of a cell with count alive
+    neighbors. block_table[block] is the next state of the center of a 3x3
+    block given as 9 bits, bit 4 being the center.
+    """
+
+    def __init__(self, births, survivals):
+        births = frozenset(births)
+        survivals = frozenset(survivals)
+        if not all(0 <= count <= 8 for count in births | survivals):
+            raise ValueError('Neighbor counts must be within 0 and 8')
+
+        self._births = births
+        self._survivals = survivals
+        self.table = (tuple(count in births for count in range(9)) +
+                      tuple(count in survivals for count in range(9)))
+        self.block_table = tuple(
+            self.table[9 * (block >> 4 & 1) + bin(block & ~(1 << 4)).count('1')]
+            for block in range(512))
+
+    @classmethod
+    def parse(cls, notation):
+        """Parse a rule from B/S notation, or from one of the names of RULES."""
+        notation = notation.strip()
+        if notation.lower() in RULES:
+            return RULES[notation.lower()]
+
+        match = _NOTATION.match(notation)
+        if match:
+            births, survivals = match.groups()
+        else:
+            match = _REVERSED_NOTATION.match(notation)
+            if match is None:
+                raise ValueError('Invalid rule "{}", must be like B3/S23'.format(notation))
+            survivals, births = match.groups()
+        return cls((int(c) for c in births), (int(c) for c in survivals))
+
+    @property
+    def births(self):
+        return self._births
+
+    @property
+    def survivals(self):
+        return self._survivals
+
+    @property
+    def notation(self):
+        return 'B{}/S{}'.format(''.join(str(c) for c in sorted(self._births)),
+                                ''.join(str(c) for c in sorted(self._survivals)))
+
+    @property
+    def has_b0(self):
+        """Whether dead cells without alive neighbors are born.
+
+        Engines going through the alive cells and their neighbors only can't
+        run such rules.
+        """
+        return 0 in self._births
+
+    def __str__(self):
+        return self.notation
+
+    def __repr__(self):
+        return '<Rule {}>'.format(self.notation)
+
+    def __eq__(self, other):
+        if not isinstance(other, Rule):
+            return NotImplemented
+        return self._births == other._births and self._survivals == other._survivals
+
+    def __hash__(self):
+        return hash((self._births, self._survivals))
+
+
+CONWAY = Rule((3,), (2, 3))
+
+RULES = {
+    'life': CONWAY,
+    'highlife': Rule((3, 6), (2, 3)),
+    'seeds': Rule((2,), ()),
+    'daynight': Rule((3, 6, 7, 8), (3, 4, 6, 7, 8)),
+    'lifewithoutdeath': Rule((3,), range(9)),
+    'replicator': Rule((1, 3, 5, 7), (1, 3, 5, 7)),
+    'maze': Rule((3,), (1, 2, 3, 4, 5)),
+}
+
+
+def as_rule(rule):
+    """Return rule as a Rule: None is CONWAY, strings are parsed."""
+    if rule is None:
+        return CONWAY
+    if isinstance(rule, Rule):
+        return rule
+    return Rule.parse(rule)
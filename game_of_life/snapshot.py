@@ -0,0 +1,149 @@
+"""Compact binary snapshots of worlds.
+
+A snapshot starts with a header holding the size, the generation and the
+rule of the world, followed by the cells either as a bitmap or as a sparse
+list of coordinates, whichever is smaller:
+
+* Bitmap: every row is (width + 7) // 8 bytes, bit x % 8 of byte x // 8 is
+  the cell (x, y).
+* Sparse: the number of alive cells, then the x and y of each one.
+
+All numbers are little-endian.
+"""
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+from .rules import Rule
+
+
+MAGIC = b'GOLS'
+VERSION = 1
+BITMAP = 0
+SPARSE = 1
+
+# Magic, version, encoding, width, height, generation, length of the rule.
+_HEADER = struct.Struct('<4sBBIIQH')
+_COUNT = struct.Struct('<Q')
+_CELL = struct.Struct('<II')
+
+Header = namedtuple('Header', ('encoding', 'width', 'height', 'generation', 'rule'))
+
+
+class SnapshotError(ValueError):
+    """Exception for files which are not valid snapshots."""
+    pass
+
+
+def row_bytes(width):
+    return (width + 7) // 8
+
+
+def _population(bitmap):
+    n = int.from_bytes(bitmap, 'little')
+    if hasattr(n, 'bit_count'):
+        return n.bit_count()
+    return bin(n).count('1')
+
+
+def encode(world):
+    """Return the snapshot of the world as bytes, in the smaller encoding."""
+    width, height = world.size
+    bitmap = world._to_bitmap()
+    population = _population(bitmap)
+    rule = world.rule.notation.encode('ascii')
+
+    if _COUNT.size + population * _CELL.size < len(bitmap):
+        encoding = SPARSE
+        payload = bytearray(_COUNT.pack(population))
+        for x, y in world.alives:
+            payload += _CELL.pack(x, y)
+    else:
+        encoding = BITMAP
+        payload = bitmap
+
+    header = _HEADER.pack(MAGIC, VERSION, encoding, width, height,
+                          world.generation, len(rule))
+    return b''.join((header, rule, payload))
+
+
+def save(world, path):
+    with open(path, 'wb') as f:
+        f.write(encode(world))
+
+
+def _parse_header(data, path):
+    """Return the Header of a snapshot and the offset of its cells."""
+    if len(data) < _HEADER.size:
+        raise SnapshotError('{} is too short to be a snapshot'.format(path))
+    magic, version, encoding, width, height, generation, rule_length = \
+        _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise SnapshotError('{} is not a snapshot'.format(path))
+    if version != VERSION:
+        raise SnapshotError('Unsupported snapshot version {}'.format(version))
+
+    offset = _HEADER.size + rule_length
+    notation = bytes(data[_HEADER.size:offset]).decode('ascii', errors='replace')
+    try:
+        rule = Rule.parse(notation)
+    except ValueError:
+        raise SnapshotError('Unsupported rule {}'.format(notation))
+    return Header(encoding, width, height, generation, rule), offset
+
+
+def read_header(path):
+    """Return the Header of a snapshot without reading its cells."""
+    with open(path, 'rb') as f:
+        data = f.read(_HEADER.size)
+        if len(data) == _HEADER.size:
+            data += f.read(_HEADER.unpack_from(data, 0)[-1])
+    return _parse_header(data, path)[0]
+
+
+def load(path, factory):
+    """Load a snapshot into the world returned by factory(width, height).
+
+    The world must have the rule of the snapshot. The file is memory-mapped,
+    and the bitmap is handed to the world as a buffer so it can build its
+    board without going through cell tuples.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            raise SnapshotError('{} is too short to be a snapshot'.format(path))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return _load_view(view, path, factory)
+            finally:
+                view.release()
+
+
+def _load_view(view, path, factory):
+    header, offset = _parse_header(view, path)
+    encoding, width, height, generation = header[:4]
+
+    world = factory(width, height)
+    if world.rule != header.rule:
+        if hasattr(world, 'close'):
+            world.close()
+        raise SnapshotError('{} is a snapshot of a {} world, not {}'.format(
+            path, header.rule, world.rule))
+    if encoding == BITMAP:
+        size = row_bytes(width) * height
+        if len(view) < offset + size:
+            raise SnapshotError('{} is truncated'.format(path))
+        world._from_bitmap(view[offset:offset + size])
+    elif encoding == SPARSE:
+        count, = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        if len(view) < offset + count * _CELL.size:
+            raise SnapshotError('{} is truncated'.format(path))
+        for x, y in _CELL.iter_unpack(view[offset:offset + count * _CELL.size]):
+            world.set_alive(x, y)
+    else:
+        raise SnapshotError('Unknown encoding {}'.format(encoding))
+
+    world._generation = generation
+    return world
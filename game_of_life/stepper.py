@@ -0,0 +1,74 @@
+"""Stepping a world in a background thread, decoupled from rendering.
+
+The thread calls a step function as fast as its delay allows and publishes
+what it returns into a single slot. The UI takes the latest value from the
+slot whenever it is ready to draw a frame; values published in between are
+dropped, so a slow renderer never slows the simulation down.
+"""
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class Stepper(threading.Thread):
+    """Thread calling step() every delay seconds, keeping only its latest result.
+
+    The results must not be changed once returned, since they are read from
+    another thread. The thread stops when until(result) is true, when step()
+    raises, or when stop() is called.
+    """
+
+    def __init__(self, step, delay=0, until=None):
+        if delay < 0:
+            raise ValueError('delay must not be negative')
+        super().__init__(name='world-stepper', daemon=True)
+        self._step = step
+        self._until = until
+        self.delay = delay
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._latest = None
+        self._has_latest = False
+        # Results replaced before being taken.
+        self.dropped = 0
+        self.error = None
+
+    def take(self):
+        """Return the latest result and whether there was a new one since the last take()."""
+        with self._lock:
+            latest, has_latest = self._latest, self._has_latest
+            self._has_latest = False
+        return latest, has_latest
+
+    def _publish(self, result):
+        with self._lock:
+            if self._has_latest:
+                self.dropped += 1
+            self._latest = result
+            self._has_latest = True
+
+    def stop(self):
+        """Stop the thread, and wait for the step in progress to finish."""
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            start = time.monotonic()
+            try:
+                result = self._step()
+            except Exception as e:
+                logger.exception('Stepping failed')
+                self.error = e
+                return
+            self._publish(result)
+            if self._until is not None and self._until(result):
+                return
+
+            wait = self.delay - (time.monotonic() - start)
+            if wait > 0:
+                self._stop_event.wait(wait)
@@ -0,0 +1,231 @@
+"""Parameter sweeps: many random soups run in a pool of processes.
+
+A sweep is the product of board sizes, densities, seeds and rules. Every job
+fills a board randomly, runs it until it dies, settles into a cycle or
+reaches the maximum generation, and gives a result. Jobs are sent to the
+workers in chunks, with only a few chunks in flight, and each result is
+appended to a JSON Lines file as soon as its chunk completes. Nothing is held
+in memory but the ids of the jobs already done, so a sweep interrupted for
+any reason is resumed by running it again over the same file.
+"""
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .batch import WorldBatch
+from .model import BOUNDED, DEAD, RUNNING, create_world
+from .rules import as_rule
+
+
+logger = logging.getLogger(__name__)
+
+# rule is in B/S notation, so jobs are cheap to send to the workers.
+Job = namedtuple('Job', ('width', 'height', 'density', 'seed', 'rule'))
+
+# Jobs completed and skipped by run_sweep(), and the time it took.
+SweepStats = namedtuple('SweepStats', ('completed', 'skipped', 'seconds'))
+
+
+def job_id(job):
+    """Return the id of a job in the results, e.g. "64x64/0.35/7/B3/S23"."""
+    return '{}x{}/{!r}/{}/{}'.format(job.width, job.height, job.density, job.seed, job.rule)
+
+
+def make_jobs(sizes, densities, seeds, rules=('B3/S23',)):
+    """Generate the jobs of every combination of the parameters.
+
+    sizes are (width, height) pairs, rules are given in B/S notation or by
+    name.
+    """
+    notations = [as_rule(rule).notation for rule in rules]
+    for (width, height), density, seed, rule in itertools.product(
+            sizes, densities, seeds, notations):
+        yield Job(width, height, density, seed, rule)
+
+
+def soup_cells(width, height, density, seed):
+    """Return the cells of a board filled randomly with the given density.
+
+    The same seed always gives the same cells.
+    """
+    rand = random.Random(seed)
+    return [(x, y) for y in range(height) for x in range(width)
+            if rand.random() < density]
+
+
+def _result(job, status, generation, period, population, seconds):
+    if status == RUNNING:
+        lifetime = None
+    elif status == DEAD:
+        lifetime = generation
+        period = None
+    else:
+        lifetime = generation - period
+    result = job._asdict()
+    result.update(id=job_id(job),
+                  status=status,
+                  lifetime=lifetime,
+                  period=period,
+                  generation=generation,
+                  population=population,
+                  seconds=seconds)
+    return result
+
+
+def _soup_world(job, engine='bitwise', topology=BOUNDED):
+    world = create_world(job.width, job.height, engine=engine, rule=job.rule,
+                         topology=topology)
+    for x, y in soup_cells(job.width, job.height, job.density, job.seed):
+        world.set_alive(x, y)
+    return world
+
+
+def run_job(job, generations, engine='bitwise', topology=BOUNDED):
+    """Run a job and return its result as a dict.
+
+    lifetime is the generation the world died or entered its final cycle
+    at, or None if it was still running at the last generation.
+    """
+    start = time.perf_counter()
+    world = _soup_world(job, engine=engine, topology=topology)
+    world.track_history()
+
+    while world.generation < generations and world.status == RUNNING:
+        world.advance()
+
+    return _result(job, world.status, world.generation, world.period,
+                   len(world.alives), time.perf_counter() - start)
+
+
+def run_batch(jobs, generations):
+    """Run jobs together in a WorldBatch per size and rule, and return their results.
+
+    Much faster than run_job() for small boards, with the same results but
+    for a cycle starting shortly before the last generation, which may be
+    left running, see WorldBatch. seconds is the time of the batch shared
+    evenly between its jobs.
+    """
+    groups = dict()
+    for job in jobs:
+        groups.setdefault((job.width, job.height, job.rule), []).append(job)
+
+    results = []
+    for group in groups.values():
+        start = time.perf_counter()
+        batch = WorldBatch(_soup_world(job) for job in group)
+        batch.advance(generations)
+        seconds = (time.perf_counter() - start) / len(group)
+        for index, job in enumerate(group):
+            results.append(_result(job, batch.status(index), batch.generation(index),
+                                   batch.period(index), len(batch.alives(index)), seconds))
+    return results
+
+
+def _run_chunk(jobs, generations, engine, topology):
+    if engine in WorldBatch.ENGINES:
+        return run_batch(jobs, generations)
+    return [run_job(job, generations, engine=engine, topology=topology) for job in jobs]
+
+
+def completed_ids(path):
+    """Return the ids of the jobs with a result in path.
+
+    A last line cut off by an interruption is removed from the file, so new
+    results can be appended after it.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+
+    with open(path, 'r+b') as f:
+        end = 0
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                done.add(json.loads(line)['id'])
+            except (ValueError, KeyError):
+                logger.warning('Skipping invalid result line in %s: %r', path, line)
+            end += len(line)
+        if end < f.seek(0, os.SEEK_END):
+            logger.warning('Dropping the incomplete last line of %s', path)
+            f.truncate(end)
+    return done
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_sweep(jobs, path, generations, engine='bitwise', topology=BOUNDED,
+              workers=None, chunk_size=16, resume=False):
+    """Run the jobs and write their results to path, one JSON object per line.
+
+    Results are written in the order the chunks complete. With resume, jobs
+    with a result in path already are skipped and the new results are
+    appended, otherwise path is overwritten. Return a SweepStats.
+    """
+    if generations < 0:
+        raise ValueError('generations must not be negative')
+    if chunk_size <= 0:
+        raise ValueError('chunk_size must be larger than 0')
+    if workers is not None and workers <= 0:
+        raise ValueError('workers must be larger than 0')
+    workers = workers or os.cpu_count() or 1
+
+    done = completed_ids(path) if resume else set()
+    skipped = 0
+
+    def todo():
+        nonlocal skipped
+        for job in jobs:
+            if job_id(job) in done:
+                skipped += 1
+            else:
+                yield job
+
+    start = time.perf_counter()
+    completed = 0
+    with open(path, 'a' if resume else 'w', encoding='utf-8') as out:
+        def write(results):
+            for result in results:
+                out.write(json.dumps(result, sort_keys=True))
+                out.write('\n')
+            # Flushed per chunk, so an interruption loses running chunks only.
+            out.flush()
+            return len(results)
+
+        # A couple of chunks per worker keeps them busy while bounding the
+        # jobs and results held in memory.
+        max_pending = 2 * workers
+        executor = ProcessPoolExecutor(max_workers=workers)
+        pending = set()
+        try:
+            for chunk in _chunks(todo(), chunk_size):
+                if len(pending) >= max_pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        completed += write(future.result())
+                pending.add(executor.submit(_run_chunk, chunk, generations, engine, topology))
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    completed += write(future.result())
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown()
+
+    seconds = time.perf_counter() - start
+    logger.info('Sweep completed %d jobs in %.1f s, skipped %d', completed, seconds, skipped)
+    return SweepStats(completed, skipped, seconds)
@@ -1,14 +1,47 @@
 import logging
 from functools import partial
-from tkinter import Canvas, Frame, Button, Scale, OptionMenu
+from tkinter import Canvas, Frame, Button, Scale, OptionMenu, PhotoImage, Label
 from tkinter import StringVar
-from tkinter import HORIZONTAL, END
+from tkinter import HORIZONTAL, END, NW
 
 
 logger = logging.getLogger(__name__)
 
+RENDERERS = ('auto', 'canvas', 'image')
+# Largest number of columns and rows drawn with a canvas item per cell, and
+# largest board drawn that way by the "auto" renderer.
+GRID_MAX_SIDE = 100
+GRID_MAX_CELLS = GRID_MAX_SIDE * GRID_MAX_SIDE
+IMAGE_MAX_PIXELS = 800
 
-class Grid(Canvas):
+
+class _PanEvents(object):
+    """Translates dragging with the right button into <<View-Pan>> events.
+
+    The "x" and "y" of the events are the number of cells dragged by.
+    """
+
+    def _bind_pan_events(self):
+        self._drag_origin = None
+        self.bind('<Button-3>', self._start_drag)
+        self.bind('<B3-Motion>', self._translate_drag_event)
+
+    def _start_drag(self, event):
+        self._drag_origin = (event.x, event.y)
+
+    def _translate_drag_event(self, event):
+        if self._drag_origin is None:
+            return
+        size = self._cell_pixels()
+        origin_x, origin_y = self._drag_origin
+        dx = int((event.x - origin_x) / size)
+        dy = int((event.y - origin_y) / size)
+        if dx or dy:
+            self._drag_origin = (origin_x + dx * size, origin_y + dy * size)
+            self.event_generate('<<View-Pan>>', x=dx, y=dy)
+
+
+class Grid(_PanEvents, Canvas):
     CELL_SIZE = 15  # pixel
     OUTLINE_WIDTH = 1  # pixel
     OUTLINE_COLOR = 'black'
@@ -20,7 +53,10 @@ class Grid(Canvas):
 
         self.width = width
         self.height = height
-        self._alive_cells = frozenset()
+        self._alive_cells = set()
+        # Number of calls made to Tcl so far to recolor cells, for
+        # instrumentation. A call recolors any number of cells.
+        self.itemconfig_calls = 0
 
         w_px = (self.CELL_SIZE + self.OUTLINE_WIDTH) * width + self.OUTLINE_WIDTH
         h_px = (self.CELL_SIZE + self.OUTLINE_WIDTH) * height + self.OUTLINE_WIDTH
@@ -33,6 +69,10 @@ class Grid(Canvas):
         self._cells = self._init_cells()
 
         self.bind('<Button-1>', self._translate_click_event)
+        self._bind_pan_events()
+
+    def _cell_pixels(self):
+        return self.CELL_SIZE + self.OUTLINE_WIDTH
 
     def _gen_coors(self, n):
         space = self.CELL_SIZE + self.OUTLINE_WIDTH
@@ -79,27 +119,214 @@ class Grid(Canvas):
 
         return (cell_x, cell_y)
 
-    def _set_alive(self, cell_x, cell_y):
-        self.itemconfig(self._cells[cell_x][cell_y], fill=self.ALIVE_COLOR)
+    def _recolor(self, cells, color):
+        """Fill the given cells with color in a single call to Tcl.
 
-    def _set_dead(self, cell_x, cell_y):
-        self.itemconfig(self._cells[cell_x][cell_y], fill=self.DEAD_COLOR)
+        One itemconfigure per cell costs a round trip each, so the loop over
+        the cells runs in Tcl instead.
+        """
+        if not cells:
+            return
+        items = tuple(self._cells[x][y] for x, y in cells)
+        self.tk.call('foreach', 'item', items,
+                     '{} itemconfigure $item -fill {}'.format(self._w, color))
+        self.itemconfig_calls += 1
 
     def set_alives(self, alive_cells):
-        alive_cells = frozenset(alive_cells)
+        alive_cells = set(alive_cells)
 
         # Calculate the changes from current alive cells to the new alive cells
         now_dead_cells = self._alive_cells - alive_cells
         now_alive_cells = alive_cells - self._alive_cells
 
         # Update cell state
-        for x, y in now_dead_cells:
-            self._set_dead(x, y)
-        for x, y in now_alive_cells:
-            self._set_alive(x, y)
+        self._recolor(now_dead_cells, self.DEAD_COLOR)
+        self._recolor(now_alive_cells, self.ALIVE_COLOR)
 
         self._alive_cells = alive_cells
 
+    def apply_delta(self, births, deaths):
+        """Update the cells born and died since the last update.
+
+        Unlike set_alives(), only the changed cells are gone through.
+        """
+        self._recolor(deaths, self.DEAD_COLOR)
+        self._recolor(births, self.ALIVE_COLOR)
+        self._alive_cells.difference_update(deaths)
+        self._alive_cells.update(births)
+
+
+class PixelGrid(_PanEvents, Canvas):
+    """Board drawn into a single PhotoImage, for boards too large for Grid.
+
+    Grid creates a canvas item per cell. Here a cell is a square of
+    cell_size pixels of one image, and only the rows with changed cells are
+    written to the image, one put() per run of adjacent rows.
+    """
+    ALIVE_COLOR = Grid.ALIVE_COLOR
+    DEAD_COLOR = Grid.DEAD_COLOR
+    MAX_CELL_SIZE = 32  # pixel
+
+    def __init__(self, width, height, cell_size=1, master=None):
+        if cell_size <= 0:
+            raise ValueError('cell_size must be larger than 0')
+        self._master = master
+
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self._alive_cells = set()
+        # Number of put() calls made so far, for instrumentation.
+        self.itemconfig_calls = 0
+
+        w_px = cell_size * width
+        h_px = cell_size * height
+        super().__init__(width=w_px,
+                         height=h_px,
+                         borderwidth=0,
+                         background=self.DEAD_COLOR,
+                         highlightthickness=0,
+                         master=self._master)
+        self._image = PhotoImage(width=w_px, height=h_px, master=self)
+        self._image.put(self.DEAD_COLOR, to=(0, 0, w_px, h_px))
+        self.create_image(0, 0, image=self._image, anchor=NW)
+
+        self.bind('<Button-1>', self._translate_click_event)
+        self._bind_pan_events()
+        # Zoom with the mouse wheel, which is Button-4 and Button-5 on X11.
+        self.bind('<MouseWheel>', self._translate_wheel_event)
+        self.bind('<Button-4>', self._translate_wheel_event)
+        self.bind('<Button-5>', self._translate_wheel_event)
+
+    def _cell_pixels(self):
+        return self.cell_size
+
+    def _translate_wheel_event(self, event):
+        zoom_in = event.num == 4 or getattr(event, 'delta', 0) > 0
+        # XXX: "x" carries the zoom steps, 1 to zoom in and -1 to zoom out.
+        self.event_generate('<<View-Zoom>>', x=1 if zoom_in else -1)
+
+    def zoom(self, steps):
+        """Double the cell size steps times, or halve it if steps is negative.
+
+        The image keeps its size, so the number of cells shown changes and the
+        image is cleared. Return False if the cell size is already at its
+        limit.
+        """
+        if steps >= 0:
+            cell_size = min(self.cell_size << steps, self.MAX_CELL_SIZE)
+        else:
+            cell_size = max(self.cell_size >> -steps, 1)
+        if cell_size == self.cell_size:
+            return False
+
+        w_px, h_px = self.cell_size * self.width, self.cell_size * self.height
+        self.cell_size = cell_size
+        self.width = w_px // cell_size
+        self.height = h_px // cell_size
+        self._alive_cells = set()
+        self._image.put(self.DEAD_COLOR, to=(0, 0, w_px, h_px))
+        return True
+
+    def _translate_click_event(self, event):
+        logger.debug('<Button-1> event received. Translating into <<Cell-Click>>.')
+        cell = self._get_cell_from_pixel_coor(event.x, event.y)
+        if cell is not None:
+            x, y = cell
+            # XXX: Same as Grid, "x" and "y" carry the cell coordinates.
+            self.event_generate('<<Cell-Click>>', x=x, y=y)
+
+    def _get_cell_from_pixel_coor(self, px_x, px_y):
+        cell_x = px_x // self.cell_size
+        cell_y = px_y // self.cell_size
+        if not (0 <= cell_x < self.width and 0 <= cell_y < self.height):
+            return None
+        return (cell_x, cell_y)
+
+    def _put_rows(self, first, last, min_x, max_x):
+        """Write the cells min_x..max_x of the rows first..last to the image."""
+        alive_cells = self._alive_cells
+        alive = ' '.join([self.ALIVE_COLOR] * self.cell_size)
+        dead = ' '.join([self.DEAD_COLOR] * self.cell_size)
+        rows = []
+        for y in range(first, last + 1):
+            row = '{' + ' '.join(alive if (x, y) in alive_cells else dead
+                                 for x in range(min_x, max_x + 1)) + '}'
+            rows.extend([row] * self.cell_size)
+        self._image.put(' '.join(rows), to=(min_x * self.cell_size, first * self.cell_size))
+        self.itemconfig_calls += 1
+
+    def set_alives(self, alive_cells):
+        alive_cells = set(alive_cells)
+        changed = self._alive_cells ^ alive_cells
+        self._alive_cells = alive_cells
+        self._draw(changed)
+
+    def apply_delta(self, births, deaths):
+        """Update the cells born and died since the last update.
+
+        Unlike set_alives(), only the changed cells are gone through.
+        """
+        self._alive_cells.difference_update(deaths)
+        self._alive_cells.update(births)
+        changed = set(births)
+        changed.update(deaths)
+        self._draw(changed)
+
+    def _draw(self, changed):
+        # Range of the changed cells of each changed row.
+        ranges = dict()
+        for x, y in changed:
+            if y in ranges:
+                min_x, max_x = ranges[y]
+                ranges[y] = (min(min_x, x), max(max_x, x))
+            else:
+                ranges[y] = (x, x)
+
+        run = None
+        for y in sorted(ranges):
+            min_x, max_x = ranges[y]
+            if run is not None and run[1] == y - 1:
+                run = (run[0], y, min(run[2], min_x), max(run[3], max_x))
+            else:
+                if run is not None:
+                    self._put_rows(*run)
+                run = (y, y, min_x, max_x)
+        if run is not None:
+            self._put_rows(*run)
+
+
+def _resolve_renderer(width, height, renderer):
+    if renderer not in RENDERERS:
+        raise ValueError('renderer must be one of {}'.format(', '.join(RENDERERS)))
+    if renderer == 'auto':
+        return 'image' if width * height > GRID_MAX_CELLS else 'canvas'
+    return renderer
+
+
+def visible_size(width, height, renderer='auto'):
+    """Return the columns and rows shown at first of a width x height world.
+
+    The whole world is shown if it fits in GRID_MAX_SIDE cells for Grid, or
+    in IMAGE_MAX_PIXELS pixels of one pixel per cell for PixelGrid.
+    """
+    if _resolve_renderer(width, height, renderer) == 'canvas':
+        return min(width, GRID_MAX_SIDE), min(height, GRID_MAX_SIDE)
+    return min(width, IMAGE_MAX_PIXELS), min(height, IMAGE_MAX_PIXELS)
+
+
+def create_grid(width, height, renderer='auto', master=None):
+    """Create the widget showing width x height cells of the board.
+
+    renderer is "canvas" for Grid, "image" for PixelGrid, or "auto" to use
+    PixelGrid for more than GRID_MAX_CELLS cells. PixelGrid cells are sized
+    to fit in about IMAGE_MAX_PIXELS pixels.
+    """
+    if _resolve_renderer(width, height, renderer) == 'canvas':
+        return Grid(width, height, master=master)
+    cell_size = max(1, min(Grid.CELL_SIZE, IMAGE_MAX_PIXELS // max(width, height)))
+    return PixelGrid(width, height, cell_size=cell_size, master=master)
+
 
 class StartStopButton(Button):
 
@@ -129,6 +356,20 @@ class NextButton(Button):
         self.event_generate('<<Next-Click>>')
 
 
+class BackButton(Button):
+
+    def __init__(self, master=None):
+        self._master = master
+        super().__init__(text='Back',
+                         width=10,
+                         master=self._master,
+                         command=self._translate_click_event)
+
+    def _translate_click_event(self):
+        logger.debug('BackButton <Button-1> received. Translating into <<Back-Click>>')
+        self.event_generate('<<Back-Click>>')
+
+
 class SpeedSlider(Scale):
 
     def __init__(self, master=None):
@@ -142,13 +383,34 @@ class SpeedSlider(Scale):
                          command=self._translate_click_event)
 
     def _translate_click_event(self, value):
-        logger.debug('SpeedSlider value {} received.'
-                     ' Translating into <<Speed-Change>>.'.format(value))
+        logger.debug('SpeedSlider value %s received.'
+                     ' Translating into <<Speed-Change>>.', value)
         # XXX: I use attribute "x" to carry the value information.
         # Also, it must be an int :(
         self.event_generate('<<Speed-Change>>', x=value)
 
 
+class GenerationScale(Scale):
+
+    def __init__(self, master=None):
+        self._master = master
+        super().__init__(from_=0,
+                         to=0,
+                         orient=HORIZONTAL,
+                         master=self._master,
+                         label='Generation',
+                         command=self._translate_click_event)
+
+    def set_range(self, first, last):
+        self.config(from_=first, to=last)
+
+    def _translate_click_event(self, value):
+        logger.debug('GenerationScale value %s received.'
+                     ' Translating into <<Generation-Change>>.', value)
+        # XXX: Same as SpeedSlider, attribute "x" carries the generation.
+        self.event_generate('<<Generation-Change>>', x=int(float(value)))
+
+
 class PatternOptionMenu(OptionMenu):
 
     def __init__(self, master=None, options=None, default_index=0):
@@ -177,37 +439,56 @@ class PatternOptionMenu(OptionMenu):
         self._var.set(options[default_index])
 
     def _on_selection_changed(self, index, option):
-        logger.debug('selection changed to {}:{}'.format(index, option))
+        logger.debug('selection changed to %s:%s', index, option)
         self._var.set(option)
         self.event_generate('<<PatternOption-Change>>', x=index)
 
 
 class MainView(Frame):
 
-    def __init__(self, grid_width, grid_height, pattern_options, master=None):
+    def __init__(self, grid_width, grid_height, pattern_options, master=None,
+                 renderer='auto'):
         self._master = master
         super().__init__(bg='white',
                          master=self._master)
 
-        self.world_grid = Grid(width=grid_width, height=grid_height, master=self)
+        self.world_grid = create_grid(grid_width, grid_height, renderer=renderer, master=self)
+        self.back_button = BackButton(master=self)
         self.startstop_button = StartStopButton(master=self)
         self.next_button = NextButton(master=self)
         self.speed_slider = SpeedSlider(master=self)
         self.pattern_option_menu = PatternOptionMenu(master=self,
                                                      options=pattern_options)
-
-        self.world_grid.grid(row=0, column=0, columnspan=4)
-        self.startstop_button.grid(row=1, column=0, pady=5, padx=5)
-        self.next_button.grid(row=1, column=1, pady=5, padx=5)
-        self.speed_slider.grid(row=1, column=2, pady=5, padx=5)
-        self.pattern_option_menu.grid(row=1, column=3, pady=5, padx=5)
+        self.generation_scale = GenerationScale(master=self)
+        self.rates_label = Label(master=self, bg='white')
+
+        self.world_grid.grid(row=0, column=0, columnspan=5)
+        self.back_button.grid(row=1, column=0, pady=5, padx=5)
+        self.startstop_button.grid(row=1, column=1, pady=5, padx=5)
+        self.next_button.grid(row=1, column=2, pady=5, padx=5)
+        self.speed_slider.grid(row=1, column=3, pady=5, padx=5)
+        self.pattern_option_menu.grid(row=1, column=4, pady=5, padx=5)
+        self.generation_scale.grid(row=2, column=0, columnspan=5, sticky='we', padx=5)
+        self.rates_label.grid(row=3, column=0, columnspan=5, pady=5)
 
         self.pack()
 
-    def update(self, alives=None, startstop_text=None, pattern_options=None):
+    def update(self, alives=None, startstop_text=None, pattern_options=None,
+               generation=None, generation_range=None, rates=None, delta=None):
         if alives is not None:
             self.world_grid.set_alives(alives)
+        if delta is not None:
+            # (births, deaths) since the last update, cheaper than alives.
+            self.world_grid.apply_delta(*delta)
         if startstop_text is not None:
             self.startstop_button.config(text=startstop_text)
         if pattern_options is not None:
             self.pattern_option_menus.update_options(pattern_options)
+        if generation_range is not None:
+            self.generation_scale.set_range(*generation_range)
+        if generation is not None:
+            self.generation_scale.set(generation)
+        if rates is not None:
+            # Generations stepped and frames drawn per second differ when
+            # stepping in the background.
+            self.rates_label.config(text='generations/s: {:.1f}   frames/s: {:.1f}'.format(*rates))
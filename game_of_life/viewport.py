@@ -0,0 +1,85 @@
+"""The part of a world shown in the window."""
+
+
+class Viewport(object):
+    """Window of columns x rows cells onto a world, at the cell (x, y).
+
+    The window is kept inside the world, or at (0, 0) if it is larger than
+    the world. Cells in the window are given to the view in view
+    coordinates, relative to the top left cell of the window.
+    """
+
+    def __init__(self, world_width, world_height, columns, rows):
+        if world_width <= 0 or world_height <= 0:
+            raise ValueError('world size must be larger than 0')
+        if columns <= 0 or rows <= 0:
+            raise ValueError('columns and rows must be larger than 0')
+
+        self._world_size = (world_width, world_height)
+        self._columns = columns
+        self._rows = rows
+        # Start at the center of the world, where the patterns are placed.
+        self._x = (world_width - columns) // 2
+        self._y = (world_height - rows) // 2
+        self._clamp()
+
+    @property
+    def x(self):
+        return self._x
+
+    @property
+    def y(self):
+        return self._y
+
+    @property
+    def columns(self):
+        return self._columns
+
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def region(self):
+        """The (x0, y0, x1, y1) region of the world shown, x1 and y1 excluded."""
+        return (self._x, self._y, self._x + self._columns, self._y + self._rows)
+
+    @property
+    def covers_world(self):
+        width, height = self._world_size
+        return self._columns >= width and self._rows >= height
+
+    def _clamp(self):
+        width, height = self._world_size
+        self._x = max(0, min(self._x, width - self._columns))
+        self._y = max(0, min(self._y, height - self._rows))
+
+    def pan(self, dx, dy):
+        """Move the window by dx columns and dy rows."""
+        self._x += dx
+        self._y += dy
+        self._clamp()
+
+    def resize(self, columns, rows):
+        """Change the number of cells shown, keeping the same center."""
+        if columns <= 0 or rows <= 0:
+            raise ValueError('columns and rows must be larger than 0')
+        self._x += (self._columns - columns) // 2
+        self._y += (self._rows - rows) // 2
+        self._columns = columns
+        self._rows = rows
+        self._clamp()
+
+    def to_world(self, column, row):
+        """Return the world coordinates of a cell of the view."""
+        return (self._x + column, self._y + row)
+
+    def to_view(self, cells):
+        """Return the view coordinates of cells of the world."""
+        x0, y0 = self._x, self._y
+        return [(x - x0, y - y0) for x, y in cells]
+
+    def visible(self, cells):
+        """Return the view coordinates of the cells of the world inside the window."""
+        x0, y0, x1, y1 = self.region
+        return [(x - x0, y - y0) for x, y in cells if x0 <= x < x1 and y0 <= y < y1]
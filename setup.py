@@ -16,7 +16,7 @@ setup(
     author='John Liu',
     author_email='johnliu55tw@gmail.com',
     keywords=['game-of-life tk tkinter simple'],
-    packages=find_packages(exclude=['tests']),
+    packages=find_packages(exclude=['tests', 'benchmarks']),
     entry_points={
         'console_scripts': [
             'game-of-life=game_of_life.cli:main'
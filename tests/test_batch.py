@@ -0,0 +1,180 @@
+import unittest
+
+from game_of_life.batch import WorldBatch
+from game_of_life.model import World, BitWorld, RUNNING, STILL, DEAD, CYCLE, TORUS, create_world
+from game_of_life.sweep import soup_cells
+
+
+def make_world(cells, width=10, height=8, engine='bitwise', rule=None):
+    world = create_world(width, height, engine=engine, rule=rule)
+    for x, y in cells:
+        world.set_alive(x, y)
+    return world
+
+
+def soups(count, width, height, rule=None):
+    return [make_world(soup_cells(width, height, 0.4, seed), width, height, rule=rule)
+            for seed in range(count)]
+
+
+BLOCK = ((1, 1), (2, 1), (1, 2), (2, 2))
+BLINKER = ((4, 3), (5, 3), (6, 3))
+GLIDER = ((1, 0), (2, 1), (0, 2), (1, 2), (2, 2))
+
+
+class WorldBatchTestCase(unittest.TestCase):
+
+    def assertSameAsWorlds(self, worlds, batch):
+        for index, world in enumerate(worlds):
+            world.advance(generations=batch.generation(index) - world.generation)
+            self.assertCountEqual(batch.alives(index), world.alives)
+
+    def test_same_as_worlds(self):
+        for width in (7, 8, 16, 21):
+            worlds = soups(12, width, 9)
+            batch = WorldBatch(worlds)
+            batch.advance(generations=60)
+
+            self.assertSameAsWorlds(worlds, batch)
+
+    def test_same_as_worlds_with_rule(self):
+        for rule in ('B36/S23', 'B2/S', 'B0/S8'):
+            worlds = [BitWorld(12, 10, rule=rule) for _ in range(8)]
+            for seed, world in enumerate(worlds):
+                for x, y in soup_cells(12, 10, 0.4, seed):
+                    world.set_alive(x, y)
+            batch = WorldBatch(worlds)
+            batch.advance(generations=30)
+
+            self.assertEqual(batch.rule.notation, worlds[0].rule.notation)
+            self.assertSameAsWorlds(worlds, batch)
+
+    def test_advance_in_steps(self):
+        worlds = soups(5, 16, 16)
+        batch = WorldBatch(worlds)
+        other = WorldBatch(worlds)
+
+        batch.advance(generations=25)
+        for _ in range(25):
+            other.advance()
+
+        for index in range(len(worlds)):
+            self.assertEqual(batch.generation(index), other.generation(index))
+            self.assertEqual(batch.alives(index), other.alives(index))
+
+    def test_drop_dead_still_and_cycle(self):
+        worlds = [make_world(()), make_world(BLOCK), make_world(BLINKER),
+                  make_world(GLIDER), make_world(((5, 5),))]
+        batch = WorldBatch(worlds, check_every=1)
+
+        self.assertEqual(batch.status(0), DEAD)
+        self.assertEqual(batch.generation(0), 0)
+        self.assertEqual(batch.running, 4)
+
+        batch.advance(generations=5)
+
+        self.assertEqual(batch.status(1), STILL)
+        self.assertEqual(batch.period(1), 1)
+        self.assertEqual(batch.generation(1), 1)
+        self.assertCountEqual(batch.alives(1), BLOCK)
+        self.assertEqual(batch.status(2), CYCLE)
+        self.assertEqual(batch.period(2), 2)
+        self.assertEqual(batch.generation(2), 2)
+        self.assertEqual(batch.status(3), RUNNING)
+        self.assertIsNone(batch.period(3))
+        self.assertEqual(batch.generation(3), 5)
+        self.assertEqual(batch.status(4), DEAD)
+        self.assertIsNone(batch.period(4))
+        self.assertEqual(batch.generation(4), 1)
+        self.assertEqual(batch.running, 1)
+
+        # The glider keeps running alone after the batch was repacked.
+        batch.advance(generations=20)
+
+        glider = worlds[3]
+        glider.advance(generations=batch.generation(3))
+        self.assertCountEqual(batch.alives(3), glider.alives)
+        # Until it turns into a block in the corner.
+        self.assertEqual(batch.status(3), STILL)
+
+    def test_b0_empty_world_not_dead(self):
+        for notation, period in (('B0/S', 2), ('B0/S8', 5)):
+            world = make_world((), 8, 8, rule=notation)
+            world.track_history()
+            batch = WorldBatch([world, make_world(BLOCK, 8, 8, rule=notation)], check_every=3)
+
+            self.assertEqual(batch.status(0), RUNNING)
+            self.assertEqual(batch.running, 2)
+
+            batch.advance(generations=50)
+            while world.status == RUNNING:
+                world.advance()
+
+            self.assertEqual(batch.status(0), CYCLE)
+            self.assertEqual(batch.period(0), period)
+            self.assertEqual(batch.generation(0), world.generation)
+            self.assertCountEqual(batch.alives(0), world.alives)
+
+    def test_exact_cycle(self):
+        # A blinker, and a soup settling into blinkers at generation 67.
+        for cells, width, height in ((BLINKER, 10, 8), (soup_cells(12, 12, 0.4, 3), 12, 12)):
+            world = make_world(cells, width, height)
+            world.track_history()
+            batch = WorldBatch([world], check_every=7)
+            batch.advance(generations=200)
+            while world.status == RUNNING:
+                world.advance()
+
+            self.assertEqual(batch.status(0), CYCLE)
+            self.assertEqual(batch.period(0), 2)
+            self.assertEqual(batch.generation(0), world.generation)
+            self.assertCountEqual(batch.alives(0), world.alives)
+
+    def test_stops_once_none_running(self):
+        batch = WorldBatch([make_world(BLOCK)])
+        batch.advance(generations=100)
+
+        self.assertEqual(batch.running, 0)
+        self.assertEqual(batch.generation(0), 1)
+
+    def test_start_generation(self):
+        world = make_world(GLIDER)
+        world.advance(generations=4)
+        batch = WorldBatch([world])
+        batch.advance(generations=3)
+
+        self.assertEqual(batch.generation(0), 7)
+
+    def test_to_worlds(self):
+        worlds = soups(4, 16, 12, rule='B36/S23')
+        batch = WorldBatch(worlds)
+        batch.advance(generations=10)
+
+        results = batch.to_worlds(engine='bitwise')
+
+        self.assertEqual(len(results), 4)
+        for index, world in enumerate(results):
+            self.assertIsInstance(world, BitWorld)
+            self.assertEqual(world.size, (16, 12))
+            self.assertEqual(world.rule, batch.rule)
+            self.assertEqual(world.generation, batch.generation(index))
+            self.assertCountEqual(world.alives, batch.alives(index))
+
+    def test_init_error(self):
+        with self.assertRaises(ValueError):
+            WorldBatch([])
+        with self.assertRaises(ValueError):
+            WorldBatch([make_world(()), make_world((), width=11)])
+        with self.assertRaises(ValueError):
+            WorldBatch([make_world(()), make_world((), rule='B36/S23')])
+        with self.assertRaises(ValueError):
+            WorldBatch([World(10, 8, topology=TORUS)])
+        with self.assertRaises(ValueError):
+            WorldBatch([make_world(())], check_every=0)
+        with self.assertRaises(ValueError):
+            WorldBatch([make_world(())], history=0)
+
+    def test_advance_error(self):
+        with self.assertRaises(ValueError):
+            WorldBatch([make_world(BLOCK)]).advance(generations=-1)
+
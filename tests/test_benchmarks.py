@@ -0,0 +1,45 @@
+import unittest
+
+from benchmarks import suite, workloads
+
+
+class WorkloadsTestCase(unittest.TestCase):
+
+    def test_soup(self):
+        cells = workloads.soup(0.5, seed=1)(10, 10)
+
+        self.assertEqual(cells, workloads.soup(0.5, seed=1)(10, 10))
+        self.assertTrue(0 < len(cells) < 100)
+
+    def test_glider_gun(self):
+        self.assertEqual(len(workloads.glider_gun(50, 50)), 36)
+
+
+class SuiteTestCase(unittest.TestCase):
+
+    def test_bench_advance(self):
+        result = suite.bench_advance(workloads.glider_gun, 50, 'counting', 5, 1)
+
+        self.assertEqual(result['name'], 'advance/counting/glider_gun/50')
+        self.assertEqual(result['generations'], 5)
+        self.assertGreater(result['generations_per_s'], 0)
+        self.assertEqual(result['cells_per_s'], result['generations_per_s'] * 50 * 50)
+        self.assertGreater(result['peak_memory_bytes'], 0)
+
+    def test_bench_grid_set_alives(self):
+        result = suite.bench_grid_set_alives(workloads.soup(0.3), 20, 3, 1)
+
+        self.assertEqual(result['name'], 'grid.set_alives/soup-0.3/20')
+        self.assertGreater(result['generations_per_s'], 0)
+
+    def test_compare(self):
+        baseline = {'results': [{'name': 'a', 'generations_per_s': 100.0},
+                                {'name': 'b', 'generations_per_s': 100.0},
+                                {'name': 'c', 'generations_per_s': 100.0}]}
+        current = {'results': [{'name': 'a', 'generations_per_s': 95.0},
+                               {'name': 'b', 'generations_per_s': 80.0},
+                               {'name': 'd', 'generations_per_s': 1.0}]}
+
+        regressions = suite.compare(baseline, current, threshold=0.1)
+
+        self.assertEqual(regressions, [('b', 100.0, 80.0)])
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from game_of_life import checkpoint
+from game_of_life.checkpoint import Checkpointer
+from game_of_life.model import World, BitWorld
+
+
+def blinker_world():
+    world = BitWorld(10, 10)
+    for x, y in ((4, 5), (5, 5), (6, 5)):
+        world.set_alive(x, y)
+    return world
+
+
+class CheckpointerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self._tmp_dir.name, 'checkpoints')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_init_error(self):
+        with self.assertRaises(ValueError):
+            Checkpointer(self.directory)
+        with self.assertRaises(ValueError):
+            Checkpointer(self.directory, every_generations=0)
+        with self.assertRaises(ValueError):
+            Checkpointer(self.directory, every_seconds=-1)
+        with self.assertRaises(ValueError):
+            Checkpointer(self.directory, every_generations=1, keep=0)
+
+    def test_checkpoint_every_generations(self):
+        world = blinker_world()
+
+        with Checkpointer(self.directory, every_generations=10, keep=3) as checkpointer:
+            checkpoint.run(world, 45, checkpointer, chunk=7)
+
+        # Checkpoints submitted while the writer is busy may be dropped, but
+        # the final one is always written.
+        paths = checkpoint.list_checkpoints(self.directory)
+        self.assertLessEqual(len(paths), 3)
+        self.assertEqual(os.path.basename(checkpoint.latest_checkpoint(self.directory)),
+                         'checkpoint-000000000045.gols')
+        self.assertFalse([f for f in os.listdir(self.directory) if f.endswith('.tmp')])
+
+    def test_checkpoint_generations(self):
+        world = blinker_world()
+        checkpointer = mock.Mock(last_generation=None)
+        checkpointer.next_generation.side_effect = lambda g: (g // 10 + 1) * 10
+        checkpointer.maybe_checkpoint.side_effect = lambda w: generations.append(w.generation)
+        generations = []
+
+        checkpoint.run(world, 45, checkpointer, chunk=7)
+
+        self.assertEqual(generations, [7, 10, 17, 20, 27, 30, 37, 40, 45])
+        checkpointer.checkpoint.assert_called_once_with(world)
+
+    def test_checkpoint_every_seconds(self):
+        world = blinker_world()
+
+        with mock.patch('game_of_life.checkpoint.time') as m_time:
+            m_time.monotonic.return_value = 0
+            checkpointer = Checkpointer(self.directory, every_seconds=5)
+            world.advance()
+            self.assertFalse(checkpointer.is_due(world))
+
+            m_time.monotonic.return_value = 5
+            checkpointer.maybe_checkpoint(world)
+            checkpointer.close()
+
+        self.assertEqual(checkpointer.last_generation, 1)
+        self.assertEqual(len(checkpoint.list_checkpoints(self.directory)), 1)
+
+    def test_checkpoint_does_not_block_on_io(self):
+        world = blinker_world()
+        written = threading.Event()
+        release = threading.Event()
+
+        def slow_write(path, data):
+            release.wait(5)
+            written.set()
+
+        with mock.patch('game_of_life.checkpoint._write_atomically', side_effect=slow_write):
+            with Checkpointer(self.directory, every_generations=1) as checkpointer:
+                checkpointer.checkpoint(world)
+                # Returns while the write is still in progress.
+                self.assertFalse(written.is_set())
+                release.set()
+
+        self.assertTrue(written.is_set())
+
+    def test_write_error_is_raised(self):
+        world = blinker_world()
+        with mock.patch('game_of_life.checkpoint._write_atomically',
+                        side_effect=OSError('disk full')):
+            checkpointer = Checkpointer(self.directory, every_generations=1)
+            checkpointer.checkpoint(world)
+            checkpointer.close()
+
+        with self.assertRaises(OSError):
+            checkpointer.checkpoint(world)
+
+    def test_resume(self):
+        world = blinker_world()
+        with Checkpointer(self.directory, every_generations=10) as checkpointer:
+            checkpoint.run(world, 25, checkpointer)
+
+        resumed = checkpoint.resume(self.directory, lambda x, y: World(x, y))
+
+        self.assertEqual(resumed.generation, 25)
+        self.assertEqual(set(resumed.alives), set(world.alives))
+
+        # Resuming continues up to the same final generation.
+        with Checkpointer(self.directory, every_generations=10) as checkpointer:
+            checkpoint.run(resumed, 30, checkpointer)
+        self.assertEqual(resumed.generation, 30)
+
+    def test_resume_without_checkpoint(self):
+        self.assertIsNone(checkpoint.resume(self.directory, World))
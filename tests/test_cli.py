@@ -0,0 +1,298 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from game_of_life import cli
+from game_of_life.model import World, BitWorld
+from game_of_life.parallel import ParallelWorld
+from game_of_life.patterns import read_cells
+from game_of_life.rules import RULES
+
+
+class CreateEngineWorldTestCase(unittest.TestCase):
+
+    def test_create_engine_world(self):
+        self.assertEqual(cli.create_engine_world(5, 6, 'classic').engine, 'classic')
+        self.assertIsInstance(cli.create_engine_world(5, 6, 'bitwise'), BitWorld)
+        self.assertEqual(cli.create_engine_world(5, 6, 'hashlife').engine, 'counting')
+
+        world = cli.create_engine_world(5, 6, 'parallel', workers=2)
+        self.assertIsInstance(world, ParallelWorld)
+        self.assertEqual(world.workers, 2)
+
+
+class BoardFileTestCase(unittest.TestCase):
+
+    def test_write_read_board(self):
+        world = World(5, 3)
+        world.set_alive(0, 0)
+        world.set_alive(4, 2)
+        world.set_alive(2, 1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'board.cells')
+            cli.write_board(world, path)
+            with open(path) as f:
+                content = f.read()
+            cells, size, _ = read_cells(path)
+
+        self.assertEqual(content, '!Generation: 0\nO....\n..O..\n....O\n')
+        self.assertCountEqual(cells, ((0, 0), (2, 1), (4, 2)))
+        self.assertEqual(size, (5, 3))
+
+
+class RunTestCase(unittest.TestCase):
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        args = cli._build_parser().parse_args(('run',) + argv)
+        cli.run(args, out=out)
+        return dict(line.split(': ', 1) for line in out.getvalue().splitlines())
+
+    def test_run_pattern(self):
+        result = self.run_cli('--size', '20x20', '--pattern', 'Glider',
+                              '--generations', '8', '--engine', 'classic')
+
+        self.assertEqual(result['engine'], 'classic')
+        self.assertEqual(result['generations'], '8')
+        self.assertEqual(result['population'], '5')
+        self.assertIn('generations/s', result)
+        self.assertIn('cells/s', result)
+
+    def test_run_engines_agree(self):
+        populations = set()
+        for engine in ('classic', 'counting', 'incremental', 'bitwise', 'parallel'):
+            result = self.run_cli('--size', '30x20', '--density', '0.4', '--seed', '3',
+                                  '--generations', '10', '--engine', engine,
+                                  '--workers', '2')
+            populations.add(result['population'])
+
+        self.assertEqual(len(populations), 1)
+
+    def test_run_rule(self):
+        conway = self.run_cli('--size', '30x20', '--density', '0.4', '--seed', '3',
+                              '--generations', '10')
+        populations = set()
+        for engine in ('counting', 'bitwise', 'parallel'):
+            result = self.run_cli('--size', '30x20', '--density', '0.4', '--seed', '3',
+                                  '--generations', '10', '--engine', engine,
+                                  '--workers', '2', '--rule', 'B2/S')
+            populations.add(result['population'])
+
+        self.assertEqual(len(populations), 1)
+        self.assertNotEqual(populations, {conway['population']})
+
+    def test_run_topology(self):
+        populations = set()
+        for engine in ('classic', 'counting', 'incremental', 'bitwise'):
+            result = self.run_cli('--size', '30x20', '--density', '0.4', '--seed', '3',
+                                  '--generations', '10', '--engine', engine,
+                                  '--topology', 'torus')
+            populations.add(result['population'])
+
+        self.assertEqual(len(populations), 1)
+
+    def test_run_infinite_output(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = os.path.join(tmp_dir, 'out.cells')
+            for engine in ('counting', 'hashlife'):
+                result = self.run_cli('--size', '10x10', '--pattern', 'Glider',
+                                      '--generations', '40', '--engine', engine,
+                                      '--topology', 'infinite', '--output', out_path)
+
+                self.assertEqual(result['population'], '5')
+                self.assertEqual(read_cells(out_path)[0], [])
+
+    def test_topology_error(self):
+        with mock.patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                cli.main(['run', '--engine', 'parallel', '--topology', 'torus'])
+            with self.assertRaises(SystemExit):
+                cli.main(['run', '--engine', 'hashlife', '--topology', 'torus'])
+            with self.assertRaises(SystemExit):
+                cli.main(['run', '--topology', 'infinite', '--checkpoint-dir', 'foo'])
+
+    def test_rule_error(self):
+        with mock.patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                cli._build_parser().parse_args(['run', '--rule', 'B9/S23'])
+            with self.assertRaises(SystemExit):
+                cli.main(['run', '--rule', 'B0/S8', '--engine', 'counting'])
+            with self.assertRaises(SystemExit):
+                cli.main(['gui', '--rule', 'B0/S8'])
+
+    def test_run_file_output(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            in_path = os.path.join(tmp_dir, 'in.cells')
+            out_path = os.path.join(tmp_dir, 'out.cells')
+            with open(in_path, 'w') as f:
+                f.write('!Blinker\n.....\n.OOO.\n.....\n')
+
+            result = self.run_cli('--size', '5x3', '--file', in_path,
+                                  '--generations', '1', '--engine', 'hashlife',
+                                  '--output', out_path)
+
+            self.assertEqual(result['population'], '3')
+            self.assertCountEqual(read_cells(out_path)[0], ((2, 0), (2, 1), (2, 2)))
+
+    def test_run_rle_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            in_path = os.path.join(tmp_dir, 'glider.rle')
+            with open(in_path, 'w') as f:
+                f.write('x = 3, y = 3\nbo$2bo$3o!\n')
+
+            result = self.run_cli('--size', '10x10', '--file', in_path,
+                                  '--generations', '4')
+
+            self.assertEqual(result['population'], '5')
+
+    def test_run_checkpoint_resume(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = self.run_cli('--size', '30x30', '--density', '0.3', '--seed', '1',
+                                  '--generations', '20', '--checkpoint-dir', tmp_dir,
+                                  '--checkpoint-every', '5')
+            self.assertEqual(result['generations'], '20')
+
+            resumed = self.run_cli('--size', '30x30', '--generations', '30',
+                                   '--checkpoint-dir', tmp_dir, '--resume')
+            straight = self.run_cli('--size', '30x30', '--density', '0.3', '--seed', '1',
+                                    '--generations', '30')
+
+        self.assertEqual(resumed['generations'], '10')
+        self.assertEqual(resumed['population'], straight['population'])
+
+    def test_resume_requires_checkpoint_dir(self):
+        with mock.patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                cli.main(['run', '--resume'])
+
+    def test_size_error(self):
+        with mock.patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                cli._build_parser().parse_args(['run', '--size', '0x5'])
+            with self.assertRaises(SystemExit):
+                cli._build_parser().parse_args(['run', '--size', 'foo'])
+            with self.assertRaises(SystemExit):
+                cli.main(['run', '--size', '3x3', '--pattern', 'Exploder'])
+
+    def test_workers_error(self):
+        with mock.patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                cli.main(['run', '--engine', 'parallel', '--workers', '0'])
+
+    def test_run_does_not_import_tkinter(self):
+        code = ('import sys\n'
+                'from game_of_life import cli\n'
+                'cli.main(["run", "--size", "10x10", "--pattern", "Glider"])\n'
+                'assert "tkinter" not in sys.modules\n')
+        result = subprocess.run([sys.executable, '-c', code],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class SweepTestCase(unittest.TestCase):
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        args = cli._build_parser().parse_args(('sweep',) + argv)
+        cli.run_sweep(args, out=out)
+        return dict(line.split(': ', 1) for line in out.getvalue().splitlines())
+
+    def test_sweep(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'results.jsonl')
+            argv = ('--output', path, '--sizes', '16x16', '20x12', '--densities', '0.3',
+                    '--seeds', '0-2', '7', '--rules', 'life', 'B36/S23',
+                    '--generations', '30', '--workers', '2')
+            result = self.run_cli(*argv)
+            resumed = self.run_cli(*(argv + ('--resume',)))
+            with open(path) as f:
+                lines = f.readlines()
+
+        self.assertEqual(result['jobs'], '16')
+        self.assertEqual(resumed['jobs'], '0')
+        self.assertEqual(resumed['skipped'], '16')
+        self.assertEqual(len(lines), 16)
+
+    def test_sweep_batch(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'results.jsonl')
+            result = self.run_cli('--output', path, '--sizes', '16x16', '--seeds', '0-5',
+                                  '--generations', '30', '--engine', 'batch',
+                                  '--workers', '1', '--chunk-size', '4')
+            with open(path) as f:
+                lines = f.readlines()
+
+        self.assertEqual(result['jobs'], '6')
+        self.assertEqual(len(lines), 6)
+
+    def test_seeds_error(self):
+        with mock.patch('sys.stderr', io.StringIO()):
+            for seeds in ('foo', '5-2', '-1'):
+                with self.assertRaises(SystemExit):
+                    cli._build_parser().parse_args(['sweep', '-o', 'foo', '--seeds', seeds])
+            with self.assertRaises(SystemExit):
+                cli.main(['sweep', '-o', 'foo', '--engine', 'counting', '--rules', 'B0/S8'])
+            with self.assertRaises(SystemExit):
+                cli.main(['sweep', '-o', 'foo', '--engine', 'bitwise', '--topology', 'infinite'])
+            with self.assertRaises(SystemExit):
+                cli.main(['sweep', '-o', 'foo', '--engine', 'batch', '--topology', 'torus'])
+
+
+class MainTestCase(unittest.TestCase):
+
+    @mock.patch('game_of_life.presenter.GameOfLifePresenter')
+    def test_main_gui(self, m_presenter):
+        cli.main([])
+
+        m_presenter.assert_called_once_with(50, 50, 50, pattern_library=None, renderer='auto', threaded=False, rule=None, topology='bounded')
+        m_presenter.return_value.run.assert_called_once_with()
+
+    @mock.patch('game_of_life.cli.PatternLibrary')
+    @mock.patch('game_of_life.presenter.GameOfLifePresenter')
+    def test_main_gui_pattern_dir(self, m_presenter, m_library):
+        cli.main(['gui', '--pattern-dir', 'foo'])
+
+        m_library.assert_called_once_with('foo')
+        m_presenter.assert_called_once_with(50, 50, 50, pattern_library=m_library.return_value,
+                                            renderer='auto', threaded=False, rule=None, topology='bounded')
+
+    @mock.patch('game_of_life.presenter.GameOfLifePresenter')
+    def test_main_gui_size_and_renderer(self, m_presenter):
+        cli.main(['gui', '--size', '300x200', '--renderer', 'image'])
+
+        m_presenter.assert_called_once_with(300, 200, 50, pattern_library=None,
+                                            renderer='image', threaded=False, rule=None, topology='bounded')
+
+    @mock.patch('game_of_life.presenter.GameOfLifePresenter')
+    def test_main_gui_threaded(self, m_presenter):
+        cli.main(['gui', '--threaded', '--min-delay', '0'])
+
+        m_presenter.assert_called_once_with(50, 50, 0, pattern_library=None,
+                                            renderer='auto', threaded=True, rule=None, topology='bounded')
+
+    @mock.patch('game_of_life.presenter.GameOfLifePresenter')
+    def test_main_gui_rule(self, m_presenter):
+        cli.main(['gui', '--rule', 'highlife'])
+
+        self.assertEqual(m_presenter.call_args[1]['rule'], RULES['highlife'])
+
+    @mock.patch('game_of_life.cli.run')
+    def test_main_run(self, m_run):
+        cli.main(['run', '--generations', '5'])
+
+        self.assertEqual(m_run.call_args[0][0].generations, 5)
+
+    @mock.patch('game_of_life.cli.logging')
+    @mock.patch('game_of_life.cli.run')
+    def test_main_log_level(self, m_run, m_logging):
+        cli.main(['run'])
+        m_logging.basicConfig.assert_called_with(level=m_logging.WARNING)
+
+        cli.main(['--verbose', 'run'])
+        m_logging.basicConfig.assert_called_with(level=m_logging.DEBUG)
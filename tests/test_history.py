@@ -0,0 +1,102 @@
+from unittest import TestCase
+
+from game_of_life.history import History, CELL_BYTES
+from game_of_life.model import World
+
+
+def glider_world():
+    world = World(10, 10, engine='counting')
+    for x, y in ((1, 0), (2, 1), (0, 2), (1, 2), (2, 2)):
+        world.set_alive(x, y)
+    return world
+
+
+class HistoryTestCase(TestCase):
+
+    def record_run(self, history, world, generations):
+        states = {world.generation: frozenset(world.alives)}
+        history.record(world)
+        for _ in range(generations):
+            world.advance()
+            history.record(world)
+            states[world.generation] = frozenset(world.alives)
+        return states
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            History(keyframe_interval=0)
+        with self.assertRaises(ValueError):
+            History(max_bytes=0)
+
+    def test_seek(self):
+        history = History(keyframe_interval=4)
+        states = self.record_run(history, glider_world(), 20)
+
+        self.assertEqual(history.first_generation, 0)
+        self.assertEqual(history.last_generation, 20)
+        self.assertEqual(len(history), 21)
+        for generation, alives in states.items():
+            self.assertEqual(history.seek(generation), alives)
+
+    def test_seek_missing_generation(self):
+        history = History()
+        self.record_run(history, glider_world(), 3)
+
+        with self.assertRaises(KeyError):
+            history.seek(4)
+        self.assertNotIn(4, history)
+        self.assertIn(3, history)
+
+    def test_deltas_are_stored_between_keyframes(self):
+        history = History(keyframe_interval=10)
+        self.record_run(history, glider_world(), 9)
+
+        # A keyframe of 5 cells, then 4 cells changed per generation.
+        self.assertEqual(history.size_bytes, (5 + 9 * 4) * CELL_BYTES)
+
+    def test_record_after_rewind_drops_the_future(self):
+        history = History(keyframe_interval=4)
+        world = glider_world()
+        states = self.record_run(history, world, 10)
+
+        world.restore(history.seek(6), 6)
+        world.toggle_aliveness(9, 9)
+        history.record(world)
+
+        self.assertEqual(history.last_generation, 6)
+        self.assertEqual(history.seek(6), frozenset(world.alives))
+        self.assertEqual(history.seek(5), states[5])
+
+        world.advance()
+        history.record(world)
+        self.assertEqual(history.seek(7), frozenset(world.alives))
+
+    def test_jump_records_a_keyframe(self):
+        history = History()
+        world = glider_world()
+        history.record(world)
+        world.advance(generations=4)
+        history.record(world)
+
+        self.assertEqual(history.seek(4), frozenset(world.alives))
+        self.assertNotIn(2, history)
+
+    def test_evict_oldest_segments(self):
+        history = History(keyframe_interval=4, max_bytes=30 * CELL_BYTES)
+        states = self.record_run(history, glider_world(), 20)
+
+        self.assertLessEqual(history.size_bytes, 30 * CELL_BYTES)
+        self.assertGreater(history.first_generation, 0)
+        self.assertEqual(history.last_generation, 20)
+        for generation in range(history.first_generation, 21):
+            self.assertEqual(history.seek(generation), states[generation])
+
+    def test_clear(self):
+        history = History()
+        self.record_run(history, glider_world(), 3)
+
+        history.clear()
+
+        self.assertEqual(len(history), 0)
+        self.assertIsNone(history.first_generation)
+        self.assertEqual(history.size_bytes, 0)
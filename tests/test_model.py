@@ -1,6 +1,16 @@
+import random
 import unittest
+from unittest import mock
 
+from game_of_life import model
+from game_of_life import rules
 from game_of_life.model import World
+from game_of_life.model import DenseWorld
+from game_of_life.model import BitWorld
+from game_of_life.model import create_world
+from game_of_life.model import HashLife
+from game_of_life.model import Patterns
+from game_of_life.model import RUNNING, STILL, DEAD, CYCLE
 from game_of_life.model import Pattern
 from game_of_life.model import OutOfBoundError
 
@@ -159,6 +169,20 @@ class WorldTestCase(unittest.TestCase):
         with self.assertRaises(OutOfBoundError):
             world.toggle_aliveness(20, 30)
 
+    def test_restore(self):
+        world = World(20, 30)
+        world.set_alive(2, 3)
+        world.set_alive(4, 5)
+        world.advance()
+
+        world.restore([(4, 5), (6, 7)], 7)
+
+        self.assertEqual(set(world.alives), {(4, 5), (6, 7)})
+        self.assertEqual(world.generation, 7)
+        self.assertEqual(world.changed, frozenset())
+        with self.assertRaises(ValueError):
+            world.restore([], -1)
+
     def test_get_alives(self):
         world = World(20, 30)
 
@@ -441,3 +465,881 @@ class WorldTestCase(unittest.TestCase):
                                (8, 9),
                                (9, 8),
                                (8, 8)))
+
+    def test_init_engine(self):
+        world = World(20, 30, engine='counting')
+
+        self.assertEqual(world.engine, 'counting')
+        self.assertEqual(World(20, 30).engine, 'classic')
+
+    def test_init_engine_error(self):
+        with self.assertRaises(ValueError):
+            World(20, 30, engine='foobar')
+
+    def test_calc_neighbor_counts(self):
+        world = World(10, 10)
+        world.set_alive(0, 0)
+        world.set_alive(1, 0)
+
+        counts = world._calc_neighbor_counts()
+
+        self.assertEqual(counts[(0, 0)], 1)
+        self.assertEqual(counts[(1, 0)], 1)
+        self.assertEqual(counts[(0, 1)], 2)
+        self.assertEqual(counts[(1, 1)], 2)
+        self.assertEqual(counts[(2, 1)], 1)
+        self.assertEqual(counts[(-1, -1)], 1)
+
+    def test_advance_counting_corner(self):
+        world = World(10, 10, engine='counting')
+        world.set_alive(9, 9)
+        world.set_alive(8, 9)
+        world.set_alive(9, 8)
+
+        world.advance()
+
+        self.assertCountEqual(world.alives,
+                              ((9, 9),
+                               (8, 9),
+                               (9, 8),
+                               (8, 8)))
+
+    def test_advance_incremental_same_as_classic(self):
+        classic = random_soup(World(40, 30, engine='classic'), 0.3, 1234)
+        incremental = random_soup(World(40, 30, engine='incremental'), 0.3, 1234)
+
+        for i in range(30):
+            if i == 10:
+                # Cells set by hand are taken into account too.
+                for world in (classic, incremental):
+                    world.toggle_aliveness(0, 0)
+                    world.toggle_aliveness(20, 15)
+            classic.advance()
+            incremental.advance()
+
+            self.assertEqual(set(classic.alives), set(incremental.alives))
+
+    def test_changed(self):
+        for engine in World.ENGINES:
+            world = World(10, 10, engine=engine)
+            self.assertEqual(world.changed, frozenset())
+            world.set_alive(9, 9)
+            world.set_alive(8, 9)
+            world.set_alive(9, 8)
+            world.set_alive(0, 0)
+
+            world.advance()
+
+            self.assertEqual(world.changed, frozenset([(8, 8), (0, 0)]))
+
+            world.advance()
+
+            self.assertEqual(world.changed, frozenset())
+
+    def test_advance_generations(self):
+        for engine in World.ENGINES:
+            stepped = random_soup(World(30, 30, engine=engine), 0.3, 99)
+            world = random_soup(World(30, 30, engine=engine), 0.3, 99)
+            start = set(world.alives)
+
+            for _ in range(12):
+                stepped.advance()
+            world.advance(generations=12)
+
+            self.assertEqual(set(world.alives), set(stepped.alives))
+            self.assertEqual(world.changed, start ^ set(world.alives))
+            self.assertEqual(world.generation, 12)
+
+    def test_advance_generations_stops_when_stable(self):
+        world = World(10, 10)
+        world.set_alive(9, 9)
+        world.set_alive(8, 9)
+        world.set_alive(9, 8)
+
+        with mock.patch.object(world, '_step', wraps=world._step) as m_step:
+            world.advance(generations=1000)
+
+        self.assertEqual(m_step.call_count, 2)
+        self.assertEqual(world.generation, 1000)
+        self.assertEqual(world.changed, frozenset([(8, 8)]))
+
+    def test_advance_zero_generations(self):
+        world = World(10, 10)
+        world.set_alive(5, 5)
+
+        world.advance(generations=0)
+
+        self.assertEqual(world.alives, ((5, 5),))
+        self.assertEqual(world.generation, 0)
+        self.assertEqual(world.changed, frozenset())
+
+    def test_advance_generations_error(self):
+        with self.assertRaises(ValueError):
+            World(10, 10).advance(generations=-1)
+
+    def test_advance_counting_same_as_classic(self):
+        rand = random.Random(1234)
+        classic = World(40, 30, engine='classic')
+        counting = World(40, 30, engine='counting')
+        for x in range(40):
+            for y in range(30):
+                if rand.random() < 0.4:
+                    classic.set_alive(x, y)
+                    counting.set_alive(x, y)
+
+        for _ in range(30):
+            classic.advance()
+            counting.advance()
+
+            self.assertEqual(set(classic.alives), set(counting.alives))
+
+
+def random_soup(world, density, seed):
+    rand = random.Random(seed)
+    for x in range(world.size[0]):
+        for y in range(world.size[1]):
+            if rand.random() < density:
+                world.set_alive(x, y)
+    return world
+
+
+@unittest.skipIf(model.numpy is None, 'NumPy is not installed')
+class DenseWorldTestCase(unittest.TestCase):
+
+    def test_init(self):
+        world = DenseWorld(20, 30)
+
+        self.assertIsInstance(world, World)
+        self.assertEqual(world.size, (20, 30))
+        self.assertEqual(world.engine, 'numpy')
+        self.assertEqual(world.alives, tuple())
+
+    def test_set_alive_set_dead(self):
+        world = DenseWorld(20, 30)
+
+        world.set_alive(2, 3)
+        self.assertEqual(world.is_alive(2, 3), True)
+        self.assertEqual(world.alives, ((2, 3),))
+
+        world.set_dead(2, 3)
+        self.assertEqual(world.is_alive(2, 3), False)
+
+    def test_toggle_aliveness(self):
+        world = DenseWorld(20, 30)
+
+        world.toggle_aliveness(19, 29)
+        self.assertEqual(world.is_alive(19, 29), True)
+
+        world.toggle_aliveness(19, 29)
+        self.assertEqual(world.is_alive(19, 29), False)
+
+    def test_out_of_bound(self):
+        world = DenseWorld(20, 30)
+
+        with self.assertRaises(OutOfBoundError):
+            world.set_alive(20, 30)
+        with self.assertRaises(OutOfBoundError):
+            world.is_alive(-1, 0)
+
+    def test_advance_corner(self):
+        world = DenseWorld(10, 10)
+        world.set_alive(9, 9)
+        world.set_alive(8, 9)
+        world.set_alive(9, 8)
+
+        world.advance()
+
+        self.assertCountEqual(world.alives,
+                              ((9, 9),
+                               (8, 9),
+                               (9, 8),
+                               (8, 8)))
+
+    def test_advance_same_as_world(self):
+        world = random_soup(World(40, 30), 0.5, 42)
+        dense = random_soup(DenseWorld(40, 30), 0.5, 42)
+
+        for _ in range(30):
+            world.advance()
+            dense.advance()
+
+            self.assertEqual(set(world.alives), set(dense.alives))
+            self.assertEqual(world.changed, dense.changed)
+
+    def test_advance_generations(self):
+        world = random_soup(World(40, 30), 0.5, 42)
+        dense = random_soup(DenseWorld(40, 30), 0.5, 42)
+
+        world.advance(generations=25)
+        dense.advance(generations=25)
+
+        self.assertEqual(set(world.alives), set(dense.alives))
+        self.assertEqual(world.changed, dense.changed)
+        self.assertEqual(dense.generation, 25)
+
+
+class BitWorldTestCase(unittest.TestCase):
+
+    def test_init(self):
+        world = BitWorld(20, 30)
+
+        self.assertIsInstance(world, World)
+        self.assertEqual(world.size, (20, 30))
+        self.assertEqual(world.engine, 'bitwise')
+        self.assertEqual(world.alives, tuple())
+
+    def test_set_alive_set_dead(self):
+        world = BitWorld(20, 30)
+
+        world.set_alive(2, 3)
+        world.set_alive(19, 3)
+        self.assertEqual(world.is_alive(2, 3), True)
+        self.assertEqual(world.is_alive(19, 3), True)
+        self.assertEqual(world.alives, ((2, 3), (19, 3)))
+
+        world.set_dead(2, 3)
+        self.assertEqual(world.is_alive(2, 3), False)
+        self.assertEqual(world.is_alive(19, 3), True)
+
+    def test_toggle_aliveness(self):
+        world = BitWorld(20, 30)
+
+        world.toggle_aliveness(19, 29)
+        self.assertEqual(world.is_alive(19, 29), True)
+
+        world.toggle_aliveness(19, 29)
+        self.assertEqual(world.is_alive(19, 29), False)
+
+    def test_out_of_bound(self):
+        world = BitWorld(20, 30)
+
+        with self.assertRaises(OutOfBoundError):
+            world.set_alive(20, 30)
+        with self.assertRaises(OutOfBoundError):
+            world.is_alive(-1, 0)
+
+    def test_advance_corners(self):
+        world = BitWorld(10, 10)
+        for x, y in ((9, 9), (8, 9), (9, 8), (0, 0), (1, 0), (0, 1)):
+            world.set_alive(x, y)
+
+        world.advance()
+
+        self.assertCountEqual(world.alives,
+                              ((9, 9), (8, 9), (9, 8), (8, 8),
+                               (0, 0), (1, 0), (0, 1), (1, 1)))
+
+    def test_advance_single_row(self):
+        world = BitWorld(5, 1)
+        for x in range(5):
+            world.set_alive(x, 0)
+
+        world.advance()
+
+        self.assertCountEqual(world.alives, ((1, 0), (2, 0), (3, 0)))
+
+    def test_advance_same_as_world(self):
+        for density in (0.1, 0.5, 0.9):
+            world = random_soup(World(40, 30), density, 42)
+            bitwise = random_soup(BitWorld(40, 30), density, 42)
+
+            for _ in range(30):
+                world.advance()
+                bitwise.advance()
+
+                self.assertEqual(set(world.alives), set(bitwise.alives))
+                self.assertEqual(world.changed, bitwise.changed)
+
+    def test_advance_generations(self):
+        world = random_soup(World(40, 30), 0.5, 42)
+        bitwise = random_soup(BitWorld(40, 30), 0.5, 42)
+
+        world.advance(generations=25)
+        bitwise.advance(generations=25)
+
+        self.assertEqual(set(world.alives), set(bitwise.alives))
+        self.assertEqual(world.changed, bitwise.changed)
+        self.assertEqual(bitwise.generation, 25)
+
+
+class CreateWorldTestCase(unittest.TestCase):
+
+    def test_create_world(self):
+        world = create_world(20, 30, engine='classic')
+
+        self.assertIs(type(world), World)
+        self.assertEqual(world.engine, 'classic')
+
+    def test_create_world_bitwise(self):
+        world = create_world(20, 30, engine='bitwise')
+
+        self.assertIsInstance(world, BitWorld)
+
+    @unittest.skipIf(model.numpy is None, 'NumPy is not installed')
+    def test_create_world_numpy(self):
+        world = create_world(20, 30, engine='numpy')
+
+        self.assertIsInstance(world, DenseWorld)
+
+    def test_create_world_numpy_missing(self):
+        with mock.patch('game_of_life.model.numpy', None):
+            world = create_world(20, 30, engine='numpy')
+
+        self.assertIs(type(world), World)
+        self.assertEqual(world.engine, 'counting')
+
+    def test_dense_world_numpy_missing(self):
+        with mock.patch('game_of_life.model.numpy', None):
+            with self.assertRaises(ImportError):
+                DenseWorld(20, 30)
+
+
+class AlivesInTestCase(unittest.TestCase):
+
+    def assert_alives_in(self, engine):
+        expected = random_soup(World(37, 23), 0.3, 5)
+        world = random_soup(create_world(37, 23, engine=engine), 0.3, 5)
+
+        for region in ((0, 0, 37, 23), (3, 4, 20, 11), (30, 20, 50, 40),
+                       (-5, -5, 2, 2), (10, 10, 10, 15), (5, 5, 1, 1)):
+            x0, y0, x1, y1 = region
+            cells = {(x, y) for x, y in expected.alives
+                     if x0 <= x < x1 and y0 <= y < y1}
+            self.assertEqual(set(world.alives_in(*region)), cells, region)
+
+    def test_alives_in_world(self):
+        self.assert_alives_in('counting')
+
+    def test_alives_in_sparse_world(self):
+        world = World(1000, 1000)
+        world.set_alive(500, 500)
+        world.set_alive(2, 3)
+
+        self.assertEqual(world.alives_in(0, 0, 10, 10), ((2, 3),))
+
+    def test_alives_in_bit_world(self):
+        self.assert_alives_in('bitwise')
+
+    @unittest.skipIf(model.numpy is None, 'NumPy is not installed')
+    def test_alives_in_dense_world(self):
+        self.assert_alives_in('numpy')
+
+
+class DeltaTestCase(unittest.TestCase):
+
+    def assert_delta(self, engine):
+        world = random_soup(create_world(30, 20, engine=engine), 0.4, 3)
+        world.advance()
+        before = set(world.alives)
+
+        world.advance(generations=2)
+
+        after = set(world.alives)
+        self.assertEqual(world.delta.births, frozenset(after - before))
+        self.assertEqual(world.delta.deaths, frozenset(before - after))
+
+    def test_delta(self):
+        for engine in World.ENGINES + BitWorld.ENGINES:
+            self.assert_delta(engine)
+
+    @unittest.skipIf(model.numpy is None, 'NumPy is not installed')
+    def test_delta_dense_world(self):
+        self.assert_delta('numpy')
+
+    def test_delta_reset(self):
+        world = World(20, 30)
+        world.set_alive(2, 3)
+        self.assertEqual(world.delta, (frozenset(), frozenset()))
+
+        world.advance()
+        self.assertEqual(world.delta.deaths, frozenset([(2, 3)]))
+
+        world.restore([], 0)
+        self.assertEqual(world.delta, (frozenset(), frozenset()))
+
+
+class WorldObserverTestCase(unittest.TestCase):
+
+    def test_add_observer(self):
+        world = World(10, 10)
+        for x, y in ((9, 9), (8, 9), (9, 8), (0, 0)):
+            world.set_alive(x, y)
+        observer = mock.Mock()
+        world.add_observer(observer)
+
+        world.advance(generations=2)
+
+        observer.assert_called_once_with(mock.ANY)
+        stats = observer.call_args[0][0]
+        self.assertEqual(stats.generation, 2)
+        self.assertEqual(stats.generations, 2)
+        self.assertGreaterEqual(stats.seconds, 0)
+        self.assertEqual(stats.births, 1)
+        self.assertEqual(stats.deaths, 1)
+        self.assertEqual(stats.population, 4)
+
+    def test_remove_observer(self):
+        world = World(10, 10)
+        observer = mock.Mock()
+        world.add_observer(observer)
+
+        world.remove_observer(observer)
+        world.advance()
+
+        observer.assert_not_called()
+
+
+class WorldHistoryTestCase(unittest.TestCase):
+
+    def test_status_not_tracked(self):
+        world = World(10, 10)
+
+        self.assertIsNone(world.status)
+        self.assertIsNone(world.state_hash)
+
+    def test_track_history_size_error(self):
+        with self.assertRaises(ValueError):
+            World(10, 10).track_history(size=0)
+
+    def test_state_hash(self):
+        world = World(10, 10)
+        world.track_history()
+        self.assertEqual(world.state_hash, 0)
+
+        world.set_alive(2, 3)
+        world.set_alive(4, 5)
+        first_hash = world.state_hash
+        world.set_dead(2, 3)
+        world.set_alive(2, 3)
+
+        self.assertNotEqual(first_hash, 0)
+        self.assertEqual(world.state_hash, first_hash)
+
+    def test_state_hash_follows_advance(self):
+        for cls in (World, BitWorld):
+            world = random_soup(cls(30, 30), 0.3, 5)
+            world.track_history()
+
+            world.advance(generations=3)
+            world.advance()
+
+            self.assertEqual(world.state_hash, model._hash_cells(world.alives))
+
+    def test_status_running(self):
+        world = random_soup(World(30, 30), 0.3, 5)
+        world.track_history()
+
+        world.advance()
+
+        self.assertEqual(world.status, RUNNING)
+        self.assertIsNone(world.period)
+
+    def test_status_dead(self):
+        world = World(10, 10)
+        world.track_history()
+        world.set_alive(5, 5)
+
+        world.advance()
+
+        self.assertEqual(world.status, DEAD)
+
+    def test_status_still(self):
+        world = World(10, 10)
+        world.track_history()
+        for x, y in ((1, 1), (1, 2), (2, 1), (2, 2)):
+            world.set_alive(x, y)
+
+        world.advance()
+
+        self.assertEqual(world.status, STILL)
+        self.assertEqual(world.period, 1)
+
+    def test_status_cycle(self):
+        for cls in (World, BitWorld):
+            world = cls(10, 10)
+            world.track_history()
+            for x, y in ((4, 5), (5, 5), (6, 5)):
+                world.set_alive(x, y)
+
+            world.advance()
+            self.assertEqual(world.status, RUNNING)
+            world.advance()
+
+            self.assertEqual(world.status, CYCLE)
+            self.assertEqual(world.period, 2)
+
+    def test_status_b0_empty_world_not_dead(self):
+        # B0/S alternates between empty and full, B0/S8 empties at the fifth
+        # generation of a cycle of 5.
+        for notation, period in (('B0/S', 2), ('B0/S8', 5)):
+            world = BitWorld(8, 8, rule=notation)
+            world.track_history()
+            self.assertEqual(world.status, RUNNING)
+
+            world.advance(generations=period)
+
+            self.assertEqual(world.alives, ())
+            self.assertEqual(world.status, CYCLE)
+            self.assertEqual(world.period, period)
+
+    def test_status_cycle_size_of_history(self):
+        for size, period in ((1, None), (2, 2)):
+            world = World(10, 10)
+            world.track_history(size=size)
+            for x, y in ((4, 5), (5, 5), (6, 5)):
+                world.set_alive(x, y)
+
+            world.advance(generations=1)
+            world.advance(generations=1)
+            world.advance(generations=1)
+
+            self.assertEqual(world.period, period)
+
+    def test_edit_resets_history(self):
+        world = World(10, 10)
+        world.track_history()
+        for x, y in ((1, 1), (1, 2), (2, 1), (2, 2)):
+            world.set_alive(x, y)
+        world.advance()
+        self.assertEqual(world.status, STILL)
+
+        world.set_alive(8, 8)
+
+        self.assertEqual(world.status, RUNNING)
+        self.assertIsNone(world.period)
+
+
+class HashLifeTestCase(unittest.TestCase):
+
+    def test_init_max_nodes_error(self):
+        with self.assertRaises(ValueError):
+            HashLife(max_nodes=0)
+
+    def test_set_alive(self):
+        life = HashLife()
+
+        life.set_alive(2, 3)
+        life.set_alive(-100, 50)
+
+        self.assertCountEqual(life.alives, ((2, 3), (-100, 50)))
+        self.assertEqual(life.population, 2)
+        self.assertEqual(life.is_alive(2, 3), True)
+        self.assertEqual(life.is_alive(3, 2), False)
+        self.assertEqual(life.is_alive(10000, 10000), False)
+
+    def test_set_alive_same_as_from_world(self):
+        world = World(60, 40, engine='counting')
+        life = HashLife()
+        rand = random.Random(5)
+        for _ in range(300):
+            x, y = rand.randrange(60), rand.randrange(40)
+            world.set_alive(x, y)
+            life.set_alive(x, y)
+        # Setting an alive cell again changes nothing.
+        life.set_alive(x, y)
+
+        self.assertCountEqual(life.alives, world.alives)
+        self.assertEqual(life.population, len(world.alives))
+        built = HashLife.from_world(world)
+        life.advance(20)
+        built.advance(20)
+        self.assertCountEqual(life.alives, built.alives)
+
+    def test_set_alive_after_advance(self):
+        life = HashLife.from_pattern(Patterns[1])
+        life.advance(100)
+
+        life.set_alive(-5000, 7000)
+
+        self.assertEqual(life.population, 6)
+        self.assertTrue(life.is_alive(-5000, 7000))
+
+    def test_advance_same_as_world(self):
+        world = World(200, 200, engine='counting')
+        rand = random.Random(3)
+        for x in range(85, 115):
+            for y in range(85, 115):
+                if rand.random() < 0.4:
+                    world.set_alive(x, y)
+        life = HashLife.from_world(world)
+
+        for generations in (1, 2, 3, 7, 16, 30):
+            for _ in range(generations):
+                world.advance()
+            life.advance(generations)
+
+            self.assertEqual(set(life.alives), set(world.alives))
+
+        self.assertEqual(life.generation, 59)
+
+    def test_advance_glider_far(self):
+        life = HashLife.from_pattern(Patterns[1])
+
+        life.advance(10 ** 9)
+
+        # A glider travels one cell diagonally every 4 generations.
+        moved = 10 ** 9 // 4
+        self.assertEqual(life.generation, 10 ** 9)
+        self.assertCountEqual(life.alives,
+                              tuple((x + moved, -y + moved)
+                                    for x, y in Patterns[1].alives))
+
+    def test_advance_negative_error(self):
+        with self.assertRaises(ValueError):
+            HashLife().advance(-1)
+
+    def test_cache_eviction(self):
+        life = HashLife.from_pattern(Patterns[3], max_nodes=200)
+
+        life.advance(1000)
+        world = World(100, 100, engine='counting')
+        for x, y in Patterns[3].as_screen_coordinate(100, 100):
+            world.set_alive(x, y)
+        for _ in range(1000):
+            world.advance()
+
+        self.assertLessEqual(life.node_count, 200)
+        self.assertCountEqual(life.to_pattern('Exploder').as_screen_coordinate(100, 100),
+                              world.alives)
+
+    def test_to_world_clips(self):
+        world = World(10, 10)
+        world.set_alive(0, 0)
+        life = HashLife.from_world(world)
+        life.set_alive(-1, 0)
+        life.set_alive(10, 9)
+
+        result = life.to_world()
+
+        self.assertEqual(result.size, (10, 10))
+        self.assertEqual(result.alives, ((0, 0),))
+
+    def test_to_world_size_error(self):
+        with self.assertRaises(ValueError):
+            HashLife().to_world()
+
+    def test_pattern_round_trip(self):
+        life = HashLife.from_pattern(Patterns[1])
+
+        self.assertCountEqual(life.to_pattern('Glider').alives, Patterns[1].alives)
+
+
+def step_by_rule(alives, size, rule):
+    """Step a set of cells by counting the neighbors of every cell of the board."""
+    width, height = size
+    next_alives = set()
+    for x in range(width):
+        for y in range(height):
+            count = sum((x + dx, y + dy) in alives
+                        for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+            if rule.table[9 * ((x, y) in alives) + count]:
+                next_alives.add((x, y))
+    return next_alives
+
+
+class RuleTestCase(unittest.TestCase):
+
+    RULES = ('B36/S23', 'B2/S', 'B3678/S34678', 'B1357/S1357', 'S0123/B3')
+
+    def engine_worlds(self, rule):
+        worlds = [World(24, 18, engine=engine, rule=rule) for engine in World.ENGINES]
+        worlds.append(BitWorld(24, 18, rule=rule))
+        if model.numpy is not None:
+            worlds.append(DenseWorld(24, 18, rule=rule))
+        return worlds
+
+    def test_init_rule(self):
+        self.assertEqual(World(5, 5).rule, rules.CONWAY)
+        self.assertEqual(World(5, 5, rule='highlife').rule, rules.RULES['highlife'])
+        self.assertEqual(create_world(5, 5, engine='bitwise', rule='B2/S').rule,
+                         rules.RULES['seeds'])
+
+    def test_init_rule_error(self):
+        with self.assertRaises(ValueError):
+            World(5, 5, rule='B3/S9')
+
+    def test_init_b0_error(self):
+        for engine in World.ENGINES:
+            with self.assertRaises(ValueError):
+                World(5, 5, engine=engine, rule='B0/S8')
+
+    def test_engines_follow_rule(self):
+        for notation in self.RULES:
+            rule = rules.Rule.parse(notation)
+            worlds = [random_soup(world, 0.3, 7) for world in self.engine_worlds(rule)]
+            expected = set(worlds[0].alives)
+            for _ in range(8):
+                expected = step_by_rule(expected, (24, 18), rule)
+                for world in worlds:
+                    world.advance()
+                    self.assertEqual(set(world.alives), expected,
+                                     '{} {}'.format(notation, world.engine))
+
+    def test_highlife_replicator(self):
+        # The replicator of HighLife dies out under Conway's rule.
+        cells = ((11, 10), (12, 10), (13, 10), (10, 11), (13, 11),
+                 (9, 12), (13, 12), (9, 13), (12, 13), (9, 14), (10, 14), (11, 14))
+        highlife = World(30, 30, engine='counting', rule='highlife')
+        conway = World(30, 30, engine='counting')
+        for x, y in cells:
+            highlife.set_alive(x, y)
+            conway.set_alive(x, y)
+
+        highlife.advance(generations=12)
+        conway.advance(generations=12)
+
+        self.assertNotEqual(set(highlife.alives), set(conway.alives))
+
+    def test_b0_rule_bit_world(self):
+        rule = rules.Rule.parse('B0/S')
+        world = BitWorld(8, 5, rule=rule)
+        world.set_alive(3, 2)
+
+        world.advance()
+        expected = step_by_rule({(3, 2)}, (8, 5), rule)
+
+        self.assertEqual(set(world.alives), expected)
+        self.assertEqual(len(expected), 8 * 5 - 9)
+
+    @unittest.skipIf(model.numpy is None, 'NumPy is not installed')
+    def test_b0_rule_dense_world(self):
+        world = random_soup(DenseWorld(12, 9, rule='B0123/S45'), 0.5, 1)
+        expected = set(world.alives)
+
+        for _ in range(4):
+            world.advance()
+            expected = step_by_rule(expected, (12, 9), world.rule)
+            self.assertEqual(set(world.alives), expected)
+
+    def test_hashlife_rule(self):
+        world = random_soup(World(60, 60, engine='counting', rule='highlife'), 0.4, 5)
+        life = HashLife.from_world(world)
+
+        self.assertEqual(life.rule, rules.RULES['highlife'])
+        for generations in (1, 3, 8):
+            world.advance(generations=generations)
+            life.advance(generations)
+            # Cells escaping the world differ, so only compare the center.
+            self.assertEqual(set(world.alives_in(20, 20, 40, 40)),
+                             set(life.to_world().alives_in(20, 20, 40, 40)))
+
+        self.assertEqual(life.to_world().rule, rules.RULES['highlife'])
+
+    def test_hashlife_b0_error(self):
+        with self.assertRaises(ValueError):
+            HashLife(rule='B0/S8')
+
+
+def step_torus(alives, size, rule=rules.CONWAY):
+    """Step a set of cells on a torus, wrapping the neighbors with a modulo."""
+    width, height = size
+    next_alives = set()
+    for x in range(width):
+        for y in range(height):
+            count = sum(((x + dx) % width, (y + dy) % height) in alives
+                        for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+            if rule.table[9 * ((x, y) in alives) + count]:
+                next_alives.add((x, y))
+    return next_alives
+
+
+class TopologyTestCase(unittest.TestCase):
+
+    def torus_worlds(self, x, y):
+        worlds = [World(x, y, engine=engine, topology=model.TORUS)
+                  for engine in World.ENGINES]
+        worlds.append(BitWorld(x, y, topology=model.TORUS))
+        if model.numpy is not None:
+            worlds.append(DenseWorld(x, y, topology=model.TORUS))
+        return worlds
+
+    def test_init_topology(self):
+        self.assertEqual(World(5, 5).topology, model.BOUNDED)
+        self.assertEqual(World(5, 5, topology=model.TORUS).topology, model.TORUS)
+        self.assertEqual(create_world(5, 5, engine='bitwise', topology=model.TORUS).topology,
+                         model.TORUS)
+
+    def test_init_topology_error(self):
+        with self.assertRaises(ValueError):
+            World(5, 5, topology='sphere')
+        with self.assertRaises(ValueError):
+            BitWorld(5, 5, topology=model.INFINITE)
+        with self.assertRaises(ValueError):
+            World(2, 5, topology=model.TORUS)
+
+    def test_calc_neighbors_torus(self):
+        world = World(20, 30, topology=model.TORUS)
+
+        self.assertCountEqual(world._calc_neighbors(0, 29),
+                              ((19, 28), (19, 29), (19, 0),
+                               (0, 28), (0, 0),
+                               (1, 28), (1, 29), (1, 0)))
+
+    def test_torus_same_as_reference(self):
+        worlds = [random_soup(world, 0.35, 11) for world in self.torus_worlds(17, 13)]
+        expected = set(worlds[0].alives)
+
+        for _ in range(10):
+            expected = step_torus(expected, (17, 13))
+            for world in worlds:
+                world.advance()
+                self.assertEqual(set(world.alives), expected, world.engine)
+
+    def test_torus_glider_comes_back(self):
+        for world in self.torus_worlds(12, 12):
+            for x, y in Patterns[1].as_screen_coordinate(12, 12):
+                world.set_alive(x, y)
+            start = set(world.alives)
+
+            world.advance(generations=4 * 12)
+
+            self.assertEqual(set(world.alives), start, world.engine)
+
+    def test_torus_out_of_bound(self):
+        world = World(5, 5, topology=model.TORUS)
+
+        with self.assertRaises(OutOfBoundError):
+            world.set_alive(5, 0)
+
+    def test_bounded_drops_cells_outside(self):
+        for engine in World.ENGINES:
+            world = World(5, 5, engine=engine)
+            # A blinker on the edge would grow out of the world.
+            for x, y in ((0, 1), (0, 2), (0, 3)):
+                world.set_alive(x, y)
+
+            world.advance()
+
+            self.assertCountEqual(world.alives, ((0, 2), (1, 2)), engine)
+
+    def test_infinite_glider_leaves_the_world(self):
+        for engine in World.ENGINES:
+            world = World(10, 10, engine=engine, topology=model.INFINITE)
+            for x, y in Patterns[1].as_screen_coordinate(10, 10):
+                world.set_alive(x, y)
+            start = set(world.alives)
+
+            world.advance(generations=400)
+
+            self.assertEqual(set(world.alives),
+                             set((x + 100, y + 100) for x, y in start), engine)
+            self.assertEqual(world.alives_in(0, 0, 10, 10), ())
+
+    def test_infinite_cells_anywhere(self):
+        world = World(10, 10, topology=model.INFINITE)
+        world.set_alive(-5, 1000)
+
+        self.assertTrue(world.is_alive(-5, 1000))
+        self.assertEqual(world.alives_in(-10, 990, 0, 1010), ((-5, 1000),))
+
+    def test_infinite_save_error(self):
+        with self.assertRaises(ValueError):
+            World(10, 10, topology=model.INFINITE)._to_bitmap()
+
+    def test_hashlife_to_infinite_world(self):
+        world = World(10, 10, topology=model.INFINITE)
+        world.set_alive(-1, 20)
+        life = HashLife.from_world(world)
+
+        self.assertEqual(life.to_world().alives, ())
+        self.assertEqual(life.to_world(topology=model.INFINITE).alives, ((-1, 20),))
@@ -0,0 +1,176 @@
+import random
+import unittest
+
+from game_of_life import parallel
+from game_of_life.model import World
+from game_of_life.model import BitWorld
+from game_of_life.model import OutOfBoundError
+from game_of_life.parallel import ParallelWorld
+from game_of_life.parallel import SharedMemoryWorld
+
+
+def random_soup(world, density, seed):
+    rand = random.Random(seed)
+    for x in range(world.size[0]):
+        for y in range(world.size[1]):
+            if rand.random() < density:
+                world.set_alive(x, y)
+    return world
+
+
+class ParallelWorldTestCase(unittest.TestCase):
+
+    def test_init(self):
+        world = ParallelWorld(20, 30, workers=3)
+
+        self.assertIsInstance(world, World)
+        self.assertEqual(world.engine, 'parallel')
+        self.assertEqual(world.workers, 3)
+
+    def test_init_workers_error(self):
+        with self.assertRaises(ValueError):
+            ParallelWorld(20, 30, workers=0)
+
+    def test_calc_tiles(self):
+        world = ParallelWorld(20, 10, workers=3)
+
+        self.assertEqual(world._calc_tiles(), ((0, 3), (3, 6), (6, 10)))
+
+    def test_calc_tiles_more_workers_than_rows(self):
+        world = ParallelWorld(20, 2, workers=4)
+
+        self.assertEqual(world._calc_tiles(), ((0, 1), (1, 2)))
+
+    def test_advance_same_as_world(self):
+        world = random_soup(World(40, 30, engine='counting'), 0.4, 7)
+
+        with random_soup(ParallelWorld(40, 30, workers=3), 0.4, 7) as parallel:
+            for _ in range(20):
+                world.advance()
+                parallel.advance()
+
+                self.assertEqual(set(world.alives), set(parallel.alives))
+                self.assertEqual(world.changed, parallel.changed)
+
+    def test_advance_rule(self):
+        world = random_soup(BitWorld(40, 30, rule='B1357/S1357'), 0.4, 7)
+
+        with random_soup(ParallelWorld(40, 30, workers=3, rule='B1357/S1357'),
+                         0.4, 7) as parallel:
+            for _ in range(5):
+                world.advance()
+                parallel.advance()
+
+                self.assertEqual(set(world.alives), set(parallel.alives))
+
+    def test_close(self):
+        world = ParallelWorld(10, 10, workers=2)
+        world.advance()
+
+        world.close()
+        world.close()
+
+        self.assertIsNone(world._executor)
+
+
+@unittest.skipIf(parallel.SharedMemory is None, 'Shared memory needs Python 3.8')
+class SharedMemoryWorldTestCase(unittest.TestCase):
+
+    def test_init(self):
+        with SharedMemoryWorld(20, 30, workers=3) as world:
+            self.assertIsInstance(world, World)
+            self.assertEqual(world.engine, 'sharedmem')
+            self.assertEqual(world.workers, 3)
+            self.assertEqual(world.alives, tuple())
+
+    def test_init_workers_error(self):
+        with self.assertRaises(ValueError):
+            SharedMemoryWorld(20, 30, workers=0)
+
+    def test_set_alive_set_dead(self):
+        with SharedMemoryWorld(20, 30, workers=2) as world:
+            world.set_alive(2, 3)
+            world.set_alive(19, 29)
+            self.assertEqual(world.is_alive(2, 3), True)
+            self.assertEqual(world.is_alive(19, 29), True)
+            self.assertEqual(world.alives, ((2, 3), (19, 29)))
+
+            world.set_dead(2, 3)
+            world.toggle_aliveness(19, 29)
+            self.assertEqual(world.is_alive(2, 3), False)
+            self.assertEqual(world.is_alive(19, 29), False)
+
+            with self.assertRaises(OutOfBoundError):
+                world.set_alive(20, 30)
+
+    def test_delta(self):
+        with random_soup(SharedMemoryWorld(43, 30, workers=2), 0.4, 7) as world:
+            before = set(world.alives)
+            world.advance()
+            after = set(world.alives)
+
+            self.assertEqual(world.delta.births, frozenset(after - before))
+            self.assertEqual(world.delta.deaths, frozenset(before - after))
+
+    def test_alives_in(self):
+        with random_soup(SharedMemoryWorld(43, 30, workers=2), 0.4, 7) as world:
+            cells = {(x, y) for x, y in world.alives if 5 <= x < 40 and 3 <= y < 9}
+
+            self.assertEqual(set(world.alives_in(5, 3, 40, 9)), cells)
+            self.assertEqual(world.alives_in(50, 3, 60, 9), ())
+
+    def test_advance_same_as_world(self):
+        world = random_soup(World(43, 30, engine='counting'), 0.4, 7)
+
+        with random_soup(SharedMemoryWorld(43, 30, workers=3), 0.4, 7) as shared:
+            for i in range(20):
+                if i == 10:
+                    for w in (world, shared):
+                        w.toggle_aliveness(0, 0)
+                world.advance()
+                shared.advance()
+
+                self.assertEqual(set(world.alives), set(shared.alives))
+                self.assertEqual(world.changed, shared.changed)
+
+    def test_advance_generations(self):
+        world = random_soup(World(43, 30, engine='counting'), 0.4, 7)
+
+        with random_soup(SharedMemoryWorld(43, 30, workers=3), 0.4, 7) as shared:
+            world.advance(generations=15)
+            shared.advance(generations=15)
+
+            self.assertEqual(set(world.alives), set(shared.alives))
+            self.assertEqual(world.changed, shared.changed)
+            self.assertEqual(shared.generation, 15)
+
+    def test_advance_rule(self):
+        world = random_soup(BitWorld(43, 30, rule='B0/S2'), 0.4, 7)
+
+        with random_soup(SharedMemoryWorld(43, 30, workers=3, rule='B0/S2'),
+                         0.4, 7) as shared:
+            world.advance(generations=4)
+            shared.advance(generations=4)
+
+            self.assertEqual(set(world.alives), set(shared.alives))
+
+    def test_advance_generations_stops_when_stable(self):
+        with SharedMemoryWorld(10, 10, workers=2) as shared:
+            for x, y in ((1, 1), (1, 2), (2, 1), (2, 2)):
+                shared.set_alive(x, y)
+
+            shared.advance(generations=1000)
+
+            self.assertEqual(shared.generation, 1000)
+            self.assertEqual(shared.changed, frozenset())
+            self.assertEqual(len(shared.alives), 4)
+
+    def test_close(self):
+        world = SharedMemoryWorld(10, 10, workers=2)
+        world.advance()
+
+        world.close()
+        world.close()
+
+        self.assertIsNone(world._processes)
+        self.assertIsNone(world._shm)
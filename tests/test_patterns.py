@@ -0,0 +1,115 @@
+import io
+import os
+import tempfile
+import unittest
+
+from game_of_life.model import Pattern
+from game_of_life.patterns import read_rle, read_plaintext, read_info
+from game_of_life.patterns import load_pattern, PatternLibrary
+
+
+GLIDER_RLE = '''#N Glider
+#C A comment.
+x = 3, y = 3, rule = B3/S23
+bob$2bo$3o!
+'''
+
+GLIDER_CELLS = '''!Name: Glider
+!A comment.
+.O.
+..O
+OOO
+'''
+
+
+class ReadRleTestCase(unittest.TestCase):
+
+    def test_read_rle(self):
+        info = dict()
+
+        cells = list(read_rle(io.StringIO(GLIDER_RLE), info))
+
+        self.assertEqual(cells, [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)])
+        self.assertEqual(info, {'name': 'Glider', 'width': 3, 'height': 3, 'rule': 'B3/S23'})
+
+    def test_read_rle_counts_across_lines(self):
+        stream = io.StringIO('x = 14, y = 3\n1\n2o2$\n1\n2b2o!\n')
+
+        cells = list(read_rle(stream))
+
+        self.assertEqual(cells, [(x, 0) for x in range(12)] + [(12, 2), (13, 2)])
+
+    def test_read_rle_stops_at_end(self):
+        stream = io.StringIO('x = 1, y = 1\no!\nooo\n')
+
+        self.assertEqual(list(read_rle(stream)), [(0, 0)])
+
+    def test_read_rle_is_lazy(self):
+        lines = iter(['x = 2, y = 2\n', 'o$\n'])
+
+        cells = read_rle(lines)
+
+        self.assertEqual(next(cells), (0, 0))
+
+
+class ReadPlaintextTestCase(unittest.TestCase):
+
+    def test_read_plaintext(self):
+        info = dict()
+
+        cells = list(read_plaintext(io.StringIO(GLIDER_CELLS), info))
+
+        self.assertEqual(cells, [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)])
+        self.assertEqual(info, {'name': 'Glider'})
+
+
+class PatternFileTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_dir = self._tmp_dir.name
+        self.write('glider.rle', GLIDER_RLE)
+        self.write('glider.cells', GLIDER_CELLS.replace('Glider', 'Glider 2'))
+        self.write('blinker.cells', '.....\nOOO..\n')
+        self.write('readme.txt', 'Not a pattern.')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def write(self, filename, content):
+        with open(os.path.join(self.tmp_dir, filename), 'w') as f:
+            f.write(content)
+
+    def test_read_info(self):
+        rle_info = read_info(os.path.join(self.tmp_dir, 'glider.rle'))
+        cells_info = read_info(os.path.join(self.tmp_dir, 'blinker.cells'))
+
+        self.assertEqual(rle_info.name, 'Glider')
+        self.assertEqual((rle_info.width, rle_info.height, rle_info.population), (3, 3, 5))
+        self.assertEqual(cells_info.name, 'blinker')
+        self.assertEqual((cells_info.width, cells_info.height, cells_info.population),
+                         (3, 2, 3))
+
+    def test_load_pattern(self):
+        pattern = load_pattern(os.path.join(self.tmp_dir, 'glider.rle'))
+
+        self.assertIsInstance(pattern, Pattern)
+        self.assertEqual(pattern.name, 'Glider')
+        # Centered at (0, 0) with y pointing upward.
+        self.assertCountEqual(pattern.alives,
+                              ((0, 1), (1, 0), (-1, -1), (0, -1), (1, -1)))
+
+    def test_library(self):
+        library = PatternLibrary(self.tmp_dir, cache_size=1)
+
+        self.assertEqual(len(library), 3)
+        self.assertEqual(library.names, ('blinker', 'Glider 2', 'Glider'))
+        self.assertEqual(library.cache_info().currsize, 0)
+
+        glider = library[2]
+        self.assertEqual(glider.name, 'Glider')
+        self.assertIs(library[2], glider)
+        self.assertEqual(library.cache_info().hits, 1)
+
+        library[0]
+        self.assertEqual(library.cache_info().currsize, 1)
@@ -1,12 +1,15 @@
+import time
 from unittest import TestCase, mock
 
 from game_of_life import presenter
-from game_of_life.model import Patterns
+from game_of_life.model import Patterns, RUNNING, STILL, DEAD, CYCLE
+from game_of_life.model import AdvanceStats, Delta, INFINITE
 
 
 @mock.patch('game_of_life.presenter.tkinter')
 @mock.patch('game_of_life.presenter.MainView')
 @mock.patch('game_of_life.presenter.World')
+@mock.patch('game_of_life.presenter.History')
 class GameOfLifePresenterTestCase(TestCase):
 
     def setUp(self):
@@ -15,7 +18,7 @@ class GameOfLifePresenterTestCase(TestCase):
     def tearDown(self):
         pass
 
-    def test_constructor(self, m_world, m_main_view, m_tkinter):
+    def test_constructor(self, m_history, m_world, m_main_view, m_tkinter):
         p = presenter.GameOfLifePresenter(5, 6, 123)
 
         self.assertIsInstance(p, presenter.GameOfLifePresenter)
@@ -25,6 +28,7 @@ class GameOfLifePresenterTestCase(TestCase):
         self.assertEqual(p.main_view, m_main_view.return_value)
         self.assertEqual(p.world, m_world.return_value)
         self.assertEqual(p.root, m_tkinter.Tk.return_value)
+        p.world.track_history.assert_called_once_with()
 
         p.main_view.bind_all.assert_has_calls([
             mock.call('<<Cell-Click>>', p.on_cell_click),
@@ -33,14 +37,14 @@ class GameOfLifePresenterTestCase(TestCase):
             mock.call('<<Speed-Change>>', p.on_speed_change),
         ])
 
-    def test_is_running_property(self, m_world, m_main_view, m_tkinter):
+    def test_is_running_property(self, m_history, m_world, m_main_view, m_tkinter):
         p = presenter.GameOfLifePresenter(5, 6, 123)
 
         self.assertEqual(p.is_running, False)
         with self.assertRaises(AttributeError):
             p.is_running = True
 
-    def test_run(self, m_world, m_main_view, m_tkinter):
+    def test_run(self, m_history, m_world, m_main_view, m_tkinter):
         root_inst = mock.Mock()
         m_tkinter.Tk.return_value = root_inst
         main_view_inst = m_main_view.return_value
@@ -54,7 +58,7 @@ class GameOfLifePresenterTestCase(TestCase):
             main_view_inst.update.assert_called_with(alives=world_inst.alives)
             root_inst.mainloop.assert_called_once_with()
 
-    def test_start(self, m_world, m_main_view, m_tkinter):
+    def test_start(self, m_history, m_world, m_main_view, m_tkinter):
         root_inst = mock.Mock()
         m_tkinter.Tk.return_value = root_inst
         main_view_inst = m_main_view.return_value
@@ -67,7 +71,7 @@ class GameOfLifePresenterTestCase(TestCase):
         self.assertTrue(p.is_running)
         main_view_inst.update.assert_called_with(startstop_text='Stop')
 
-    def test_stop(self, m_world, m_main_view, m_tkinter):
+    def test_stop(self, m_history, m_world, m_main_view, m_tkinter):
         main_view_inst = m_main_view.return_value
         p = presenter.GameOfLifePresenter(5, 6, 123)
         p.run()
@@ -77,7 +81,7 @@ class GameOfLifePresenterTestCase(TestCase):
         self.assertFalse(p.is_running)
         main_view_inst.update.assert_called_with(startstop_text='Start')
 
-    def test_set_speed(self, m_world, m_main_view, m_tkinter):
+    def test_set_speed(self, m_history, m_world, m_main_view, m_tkinter):
         p = presenter.GameOfLifePresenter(5, 6, 123)
         p.run()
 
@@ -90,7 +94,7 @@ class GameOfLifePresenterTestCase(TestCase):
         p.set_speed(1)
         self.assertEqual(p._timer_delay, int(123/1))
 
-    def test_set_speed_out_of_bound(self, m_world, m_main_view, m_tkinter):
+    def test_set_speed_out_of_bound(self, m_history, m_world, m_main_view, m_tkinter):
         p = presenter.GameOfLifePresenter(5, 6, 123)
         p.run()
 
@@ -103,7 +107,8 @@ class GameOfLifePresenterTestCase(TestCase):
         with self.assertRaises(ValueError):
             p.set_speed(-0.001)
 
-    def test_on_timer_when_is_running(self, m_world, m_main_view, m_tkinter):
+    def test_on_timer_when_is_running(self, m_history, m_world, m_main_view, m_tkinter):
+        m_world.return_value.status = RUNNING
         p = presenter.GameOfLifePresenter(5, 6, 123)
         p.run()
         p.start()
@@ -115,10 +120,35 @@ class GameOfLifePresenterTestCase(TestCase):
         root_inst = m_tkinter.Tk.return_value
 
         world_inst.advance.assert_called_once_with()
-        main_view_inst.update.assert_called_with(alives=world_inst.alives)
+        main_view_inst.update.assert_any_call(alives=world_inst.alives)
         root_inst.after.assert_called_with(p._timer_delay, p.on_timer)
 
-    def test_on_timer_when_not_is_running(self, m_world, m_main_view, m_tkinter):
+    def test_on_timer_stops_when_world_settled(self, m_history, m_world, m_main_view, m_tkinter):
+        for status in (STILL, DEAD):
+            m_world.return_value.status = status
+            p = presenter.GameOfLifePresenter(5, 6, 123)
+            p.run()
+            p.start()
+            root_inst = m_tkinter.Tk.return_value
+            root_inst.reset_mock()
+
+            p.on_timer()
+
+            self.assertFalse(p.is_running)
+            root_inst.after.assert_not_called()
+
+    def test_on_timer_keeps_running_when_world_cycles(self, m_history, m_world, m_main_view, m_tkinter):
+        m_world.return_value.status = CYCLE
+        p = presenter.GameOfLifePresenter(5, 6, 123)
+        p.run()
+        p.start()
+
+        p.on_timer()
+
+        self.assertTrue(p.is_running)
+        m_tkinter.Tk.return_value.after.assert_called_with(p._timer_delay, p.on_timer)
+
+    def test_on_timer_when_not_is_running(self, m_history, m_world, m_main_view, m_tkinter):
         p = presenter.GameOfLifePresenter(5, 6, 123)
         p.run()
 
@@ -132,7 +162,7 @@ class GameOfLifePresenterTestCase(TestCase):
         main_view_inst.set_alives.assert_not_called()
         root_inst.after.assert_not_called()
 
-    def test_on_cell_click(self, m_world, m_main_view, m_tkinter):
+    def test_on_cell_click(self, m_history, m_world, m_main_view, m_tkinter):
         p = presenter.GameOfLifePresenter(5, 6, 123)
         p.run()
         fake_event = mock.Mock()
@@ -145,9 +175,9 @@ class GameOfLifePresenterTestCase(TestCase):
         main_view_inst = m_main_view.return_value
 
         world_inst.toggle_aliveness.assert_called_with(fake_event.x, fake_event.y)
-        main_view_inst.update.assert_called_with(alives=world_inst.alives)
+        main_view_inst.update.assert_any_call(alives=world_inst.alives)
 
-    def test_on_startstop_toggle_when_is_running(self, m_world, m_main_view, m_tkinter):
+    def test_on_startstop_toggle_when_is_running(self, m_history, m_world, m_main_view, m_tkinter):
         p = presenter.GameOfLifePresenter(5, 6, 123)
         p.run()
         p.start()
@@ -156,7 +186,7 @@ class GameOfLifePresenterTestCase(TestCase):
             p.on_startstop_toggle(mock.Mock())
             p.stop.assert_called_once_with()
 
-    def test_on_startstop_toggle_when_not_running(self, m_world, m_main_view, m_tkinter):
+    def test_on_startstop_toggle_when_not_running(self, m_history, m_world, m_main_view, m_tkinter):
         p = presenter.GameOfLifePresenter(5, 6, 123)
         p.run()
         p.start()
@@ -166,7 +196,7 @@ class GameOfLifePresenterTestCase(TestCase):
             p.on_startstop_toggle(mock.Mock())
             p.start.assert_called_once_with()
 
-    def test_on_next_click_when_is_running(self, m_world, m_main_view, m_tkinter):
+    def test_on_next_click_when_is_running(self, m_history, m_world, m_main_view, m_tkinter):
         p = presenter.GameOfLifePresenter(5, 6, 123)
         p.run()
         p.start()
@@ -177,9 +207,9 @@ class GameOfLifePresenterTestCase(TestCase):
         p.on_next_click(mock.Mock())
 
         p.world.advance.assert_called_once_with()
-        p.main_view.update.assert_called_with(alives=p.world.alives)
+        p.main_view.update.assert_any_call(delta=p.world.delta)
 
-    def test_on_speed_change(self, m_world, m_main_view, m_tkinter):
+    def test_on_speed_change(self, m_history, m_world, m_main_view, m_tkinter):
         p = presenter.GameOfLifePresenter(5, 6, 123)
         p.run()
         p.start()
@@ -190,7 +220,7 @@ class GameOfLifePresenterTestCase(TestCase):
             p.on_speed_change(fake_event)
             p.set_speed.assert_called_with(0.3)
 
-    def test_on_pattern_change(self, m_world, m_main_view, m_tkinter):
+    def test_on_pattern_change(self, m_history, m_world, m_main_view, m_tkinter):
         p = presenter.GameOfLifePresenter(10, 10, 123)
         p.run()
         p.start()
@@ -207,4 +237,318 @@ class GameOfLifePresenterTestCase(TestCase):
         world_inst.set_alive.assert_has_calls(
             [mock.call(x, y)
              for x, y in Patterns[1].as_screen_coordinate(10, 10)])
-        main_view_inst.update.assert_called_with(alives=world_inst.alives)
+        main_view_inst.update.assert_any_call(alives=world_inst.alives)
+
+    def test_rule(self, m_history, m_world, m_main_view, m_tkinter):
+        p = presenter.GameOfLifePresenter(10, 10, 123, rule='highlife')
+        m_world.assert_called_once_with(10, 10, rule='highlife', topology='bounded')
+        fake_event = mock.Mock()
+        fake_event.x = 1
+
+        p.on_pattern_option_change(fake_event)
+
+        m_world.assert_called_with(10, 10, rule='highlife', topology='bounded')
+
+    def test_add_observer(self, m_history, m_world, m_main_view, m_tkinter):
+        p = presenter.GameOfLifePresenter(5, 6, 123)
+        world_inst = m_world.return_value
+        grid = m_main_view.return_value.world_grid
+        grid.itemconfig_calls = 10
+        world_inst.status = RUNNING
+
+        def update(delta=None, **kwargs):
+            if delta is not None:
+                grid.itemconfig_calls += 3
+        m_main_view.return_value.update.side_effect = update
+
+        def advance():
+            p._on_world_advance(AdvanceStats(generation=7, generations=1, seconds=0.5,
+                                             births=2, deaths=1, population=4))
+        world_inst.advance.side_effect = advance
+
+        observer = mock.Mock()
+        p.add_observer(observer)
+        world_inst.add_observer.assert_called_once_with(p._on_world_advance)
+        p.run()
+        p.start()
+
+        p.on_timer()
+
+        observer.assert_called_once_with(mock.ANY)
+        stats = observer.call_args[0][0]
+        self.assertEqual(stats.generation, 7)
+        self.assertEqual(stats.advance_seconds, 0.5)
+        self.assertGreaterEqual(stats.alives_seconds, 0)
+        self.assertGreaterEqual(stats.update_seconds, 0)
+        self.assertEqual(stats.itemconfig_calls, 3)
+        self.assertEqual((stats.births, stats.deaths, stats.population), (2, 1, 4))
+
+    def test_remove_observer(self, m_history, m_world, m_main_view, m_tkinter):
+        p = presenter.GameOfLifePresenter(5, 6, 123)
+        observer = mock.Mock()
+        p.add_observer(observer)
+
+        p.remove_observer(observer)
+        p.on_next_click(mock.Mock())
+
+        p.world.remove_observer.assert_called_once_with(p._on_world_advance)
+        observer.assert_not_called()
+
+    def test_pattern_library(self, m_history, m_world, m_main_view, m_tkinter):
+        library = mock.MagicMock()
+        library.names = ('Foo', 'Bar')
+        library.__getitem__.return_value = Patterns[1]
+        p = presenter.GameOfLifePresenter(10, 10, 123, pattern_library=library)
+
+        options = m_main_view.call_args[1]['pattern_options']
+        self.assertEqual(options, [pt.name for pt in Patterns] + ['Foo', 'Bar'])
+
+        fake_event = mock.Mock()
+        fake_event.x = len(Patterns) + 1
+        world_inst = m_world.return_value
+        world_inst.reset_mock()
+
+        p.on_pattern_option_change(fake_event)
+
+        library.__getitem__.assert_called_once_with(1)
+        world_inst.set_alive.assert_has_calls(
+            [mock.call(x, y)
+             for x, y in Patterns[1].as_screen_coordinate(10, 10)])
+
+    def test_on_pattern_change_too_large(self, m_history, m_world, m_main_view, m_tkinter):
+        p = presenter.GameOfLifePresenter(3, 3, 123)
+        world_inst = p.world
+        fake_event = mock.Mock()
+        fake_event.x = 3
+
+        with self.assertLogs('game_of_life.presenter', level='WARNING'):
+            p.on_pattern_option_change(fake_event)
+
+        self.assertIs(p.world, world_inst)
+
+    def test_advance_records_history(self, m_history, m_world, m_main_view, m_tkinter):
+        p = presenter.GameOfLifePresenter(5, 6, 123)
+        history_inst = m_history.return_value
+        history_inst.reset_mock()
+
+        p.on_next_click(mock.Mock())
+
+        history_inst.record.assert_called_once_with(m_world.return_value)
+
+    def test_on_back_click(self, m_history, m_world, m_main_view, m_tkinter):
+        world_inst = m_world.return_value
+        world_inst.generation = 5
+        history_inst = m_history.return_value
+        history_inst.seek.return_value = frozenset([(1, 1)])
+        p = presenter.GameOfLifePresenter(5, 6, 123)
+        p.start()
+
+        p.on_back_click(mock.Mock())
+
+        self.assertFalse(p.is_running)
+        history_inst.seek.assert_called_once_with(4)
+        world_inst.restore.assert_called_once_with(frozenset([(1, 1)]), 4)
+        m_main_view.return_value.update.assert_any_call(alives=world_inst.alives, generation=4)
+
+    def test_on_generation_change_out_of_history(self, m_history, m_world, m_main_view, m_tkinter):
+        world_inst = m_world.return_value
+        world_inst.generation = 5
+        m_history.return_value.seek.side_effect = KeyError(1)
+        p = presenter.GameOfLifePresenter(5, 6, 123)
+        fake_event = mock.Mock()
+        fake_event.x = 1
+
+        p.on_generation_change(fake_event)
+
+        world_inst.restore.assert_not_called()
+
+    def test_on_generation_change(self, m_history, m_world, m_main_view, m_tkinter):
+        world_inst = m_world.return_value
+        world_inst.generation = 5
+        m_history.return_value.seek.return_value = frozenset([(1, 1)])
+        p = presenter.GameOfLifePresenter(5, 6, 123)
+        p.start()
+        fake_event = mock.Mock()
+        fake_event.x = 2
+
+        p.on_generation_change(fake_event)
+
+        self.assertFalse(p.is_running)
+        world_inst.restore.assert_called_once_with(frozenset([(1, 1)]), 2)
+
+    def test_on_generation_change_sent_back_by_the_scale(self, m_history, m_world, m_main_view,
+                                                         m_tkinter):
+        world_inst = m_world.return_value
+        world_inst.generation = 5
+        p = presenter.GameOfLifePresenter(5, 6, 123)
+        p.start()
+        p.on_timer()
+        # The world was advanced since the scale was set to 5.
+        world_inst.generation = 6
+        fake_event = mock.Mock()
+        fake_event.x = 5
+
+        p.on_generation_change(fake_event)
+
+        self.assertTrue(p.is_running)
+        world_inst.restore.assert_not_called()
+
+    def test_large_world_shows_the_viewport(self, m_history, m_world, m_main_view, m_tkinter):
+        world_inst = m_world.return_value
+        world_inst.alives_in.return_value = [(200, 300)]
+        p = presenter.GameOfLifePresenter(1000, 1000, 123)
+
+        self.assertEqual(m_main_view.call_args[0][:2], (800, 800))
+        self.assertEqual(p.viewport.region, (100, 100, 900, 900))
+
+        fake_event = mock.Mock()
+        fake_event.x = 5
+        fake_event.y = -3
+        p.on_view_pan(fake_event)
+
+        world_inst.alives_in.assert_called_with(95, 103, 895, 903)
+        m_main_view.return_value.update.assert_called_with(alives=[(105, 197)])
+
+    def test_infinite_world_shows_its_size(self, m_history, m_world, m_main_view, m_tkinter):
+        world_inst = m_world.return_value
+        world_inst.alives_in.return_value = [(3, 4)]
+        p = presenter.GameOfLifePresenter(10, 10, 123, topology=INFINITE)
+
+        p.run()
+
+        world_inst.alives_in.assert_called_with(0, 0, 10, 10)
+        m_main_view.return_value.update.assert_any_call(alives=[(3, 4)])
+
+    def test_advance_draws_visible_delta(self, m_history, m_world, m_main_view, m_tkinter):
+        world_inst = m_world.return_value
+        world_inst.delta = Delta(births=frozenset([(50, 50), (200, 300)]),
+                                 deaths=frozenset([(899, 899), (900, 900)]))
+        p = presenter.GameOfLifePresenter(1000, 1000, 123)
+
+        p.on_next_click(mock.Mock())
+
+        m_main_view.return_value.update.assert_any_call(
+            delta=Delta(births=[(100, 200)], deaths=[(799, 799)]))
+
+    def test_on_cell_click_in_viewport(self, m_history, m_world, m_main_view, m_tkinter):
+        p = presenter.GameOfLifePresenter(1000, 1000, 123)
+        fake_event = mock.Mock()
+        fake_event.x = 2
+        fake_event.y = 3
+
+        p.on_cell_click(fake_event)
+
+        m_world.return_value.toggle_aliveness.assert_called_with(102, 103)
+
+    def test_on_view_zoom(self, m_history, m_world, m_main_view, m_tkinter):
+        grid = m_main_view.return_value.world_grid
+        grid.zoom.return_value = True
+        grid.width = grid.height = 400
+        p = presenter.GameOfLifePresenter(1000, 1000, 123)
+        fake_event = mock.Mock()
+        fake_event.x = 1
+
+        p.on_view_zoom(fake_event)
+
+        grid.zoom.assert_called_once_with(1)
+        self.assertEqual(p.viewport.region, (300, 300, 700, 700))
+
+    @mock.patch('game_of_life.presenter.Stepper')
+    def test_start_threaded(self, m_stepper, m_history, m_world, m_main_view, m_tkinter):
+        p = presenter.GameOfLifePresenter(5, 6, 123, threaded=True)
+
+        p.start()
+
+        m_stepper.assert_called_once_with(p._step_in_background,
+                                          delay=p._timer_delay / 1000,
+                                          until=mock.ANY)
+        m_stepper.return_value.start.assert_called_once_with()
+        m_tkinter.Tk.return_value.after.assert_called_with(presenter.FRAME_DELAY, p.on_frame)
+
+        p.stop()
+
+        m_stepper.return_value.stop.assert_called_once_with()
+        self.assertFalse(p.is_running)
+
+    @mock.patch('game_of_life.presenter.Stepper')
+    def test_on_frame_draws_latest_frame(self, m_stepper, m_history, m_world, m_main_view, m_tkinter):
+        p = presenter.GameOfLifePresenter(5, 6, 123, threaded=True)
+        p.start()
+        frame = presenter.Frame(generation=7, alives=((1, 1),), region=p.viewport.region,
+                                status=RUNNING, generation_range=(0, 7))
+        stepper_inst = m_stepper.return_value
+        stepper_inst.is_alive.return_value = True
+        stepper_inst.take.return_value = (frame, True)
+
+        p.on_frame()
+
+        m_main_view.return_value.update.assert_called_with(
+            alives=((1, 1),), generation_range=(0, 7), generation=7)
+        m_tkinter.Tk.return_value.after.assert_called_with(presenter.FRAME_DELAY, p.on_frame)
+
+        m_main_view.return_value.reset_mock()
+        stepper_inst.take.return_value = (frame, False)
+        p.on_frame()
+
+        m_main_view.return_value.update.assert_not_called()
+
+    @mock.patch('game_of_life.presenter.Stepper')
+    def test_on_frame_generation_sent_back_by_the_scale(self, m_stepper, m_history, m_world,
+                                                        m_main_view, m_tkinter):
+        world_inst = m_world.return_value
+        world_inst.generation = 0
+        p = presenter.GameOfLifePresenter(5, 6, 123, threaded=True)
+        p.start()
+        stepper_inst = m_stepper.return_value
+        stepper_inst.is_alive.return_value = True
+        stepper_inst.take.return_value = (
+            presenter.Frame(generation=7, alives=(), region=p.viewport.region,
+                            status=RUNNING, generation_range=(0, 7)), True)
+        p.on_frame()
+        # The Stepper thread went on while Tk was busy.
+        world_inst.generation = 9
+        fake_event = mock.Mock()
+        fake_event.x = 7
+
+        p.on_generation_change(fake_event)
+
+        self.assertTrue(p.is_running)
+        world_inst.restore.assert_not_called()
+
+    @mock.patch('game_of_life.presenter.Stepper')
+    def test_on_frame_stops_when_stepper_stopped(self, m_stepper, m_history, m_world, m_main_view, m_tkinter):
+        p = presenter.GameOfLifePresenter(5, 6, 123, threaded=True)
+        p.start()
+        stepper_inst = m_stepper.return_value
+        stepper_inst.is_alive.return_value = False
+        stepper_inst.take.return_value = (None, False)
+        m_tkinter.Tk.return_value.after.reset_mock()
+
+        p.on_frame()
+
+        self.assertFalse(p.is_running)
+        m_tkinter.Tk.return_value.after.assert_not_called()
+
+
+@mock.patch('game_of_life.presenter.tkinter')
+@mock.patch('game_of_life.presenter.MainView')
+class ThreadedPresenterTestCase(TestCase):
+
+    def test_step_in_background(self, m_main_view, m_tkinter):
+        p = presenter.GameOfLifePresenter(10, 10, 123, threaded=True)
+        for x in (4, 5, 6):
+            p.on_cell_click(mock.Mock(x=x, y=5))
+        p.set_speed(1)
+        p.start()
+        try:
+            deadline = time.monotonic() + 5
+            while p.world.generation < 5 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            p.on_frame()
+        finally:
+            p.stop()
+
+        self.assertGreaterEqual(p.world.generation, 5)
+        self.assertEqual(p.history.seek(p.world.generation), frozenset(p.world.alives))
+        m_main_view.return_value.update.assert_any_call(
+            alives=mock.ANY, generation_range=mock.ANY, generation=mock.ANY)
@@ -0,0 +1,71 @@
+import unittest
+
+from game_of_life.rules import Rule, CONWAY, RULES, as_rule
+
+
+class RuleTestCase(unittest.TestCase):
+
+    def test_parse(self):
+        rule = Rule.parse('B36/S23')
+
+        self.assertEqual(rule.births, frozenset((3, 6)))
+        self.assertEqual(rule.survivals, frozenset((2, 3)))
+        self.assertEqual(rule.notation, 'B36/S23')
+
+    def test_parse_reversed_and_lowercase(self):
+        self.assertEqual(Rule.parse('s23/b36'), Rule.parse('B36/S23'))
+
+    def test_parse_empty_counts(self):
+        rule = Rule.parse('B2/S')
+
+        self.assertEqual(rule.survivals, frozenset())
+        self.assertEqual(rule, RULES['seeds'])
+
+    def test_parse_name(self):
+        self.assertEqual(Rule.parse('HighLife'), Rule.parse('B36/S23'))
+        self.assertIs(Rule.parse('life'), CONWAY)
+
+    def test_parse_error(self):
+        for notation in ('', 'B3', 'B9/S23', 'B3/S23/C2', 'foo'):
+            with self.assertRaises(ValueError):
+                Rule.parse(notation)
+
+    def test_init_error(self):
+        with self.assertRaises(ValueError):
+            Rule((3, 9), (2, 3))
+
+    def test_table(self):
+        table = CONWAY.table
+
+        self.assertEqual(len(table), 18)
+        self.assertEqual([count for count in range(9) if table[count]], [3])
+        self.assertEqual([count for count in range(9) if table[9 + count]], [2, 3])
+
+    def test_block_table(self):
+        table = CONWAY.block_table
+
+        self.assertEqual(len(table), 512)
+        # Dead center with 3 alive neighbors.
+        self.assertTrue(table[0b000000111])
+        # Alive center with 2 alive neighbors.
+        self.assertTrue(table[0b000010011])
+        # Alive center with 1 alive neighbor.
+        self.assertFalse(table[0b000010001])
+        # Alive center with 4 alive neighbors.
+        self.assertFalse(table[0b100010111])
+
+    def test_has_b0(self):
+        self.assertFalse(CONWAY.has_b0)
+        self.assertTrue(Rule.parse('B0/S8').has_b0)
+
+    def test_str_repr(self):
+        self.assertEqual(str(RULES['highlife']), 'B36/S23')
+        self.assertEqual(repr(CONWAY), '<Rule B3/S23>')
+
+    def test_hash(self):
+        self.assertEqual(hash(Rule.parse('B36/S23')), hash(RULES['highlife']))
+
+    def test_as_rule(self):
+        self.assertIs(as_rule(None), CONWAY)
+        self.assertIs(as_rule(CONWAY), CONWAY)
+        self.assertEqual(as_rule('B36/S23'), RULES['highlife'])
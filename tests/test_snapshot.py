@@ -0,0 +1,144 @@
+import os
+import random
+import tempfile
+import unittest
+
+from game_of_life import model
+from game_of_life import parallel
+from game_of_life import snapshot
+from game_of_life.model import World, BitWorld, DenseWorld
+from game_of_life.parallel import SharedMemoryWorld
+from game_of_life.snapshot import SnapshotError
+
+
+def random_soup(world, density, seed):
+    rand = random.Random(seed)
+    for x in range(world.size[0]):
+        for y in range(world.size[1]):
+            if rand.random() < density:
+                world.set_alive(x, y)
+    return world
+
+
+class SnapshotTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp_dir.name, 'world.gols')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def encoding(self):
+        with open(self.path, 'rb') as f:
+            return f.read(6)[5]
+
+    def test_save_load_bitmap(self):
+        world = random_soup(World(37, 21), 0.4, 1)
+        world.advance(generations=3)
+
+        world.save(self.path)
+        loaded = World.load(self.path)
+
+        self.assertEqual(self.encoding(), snapshot.BITMAP)
+        self.assertEqual(loaded.size, (37, 21))
+        self.assertEqual(loaded.generation, 3)
+        self.assertEqual(set(loaded.alives), set(world.alives))
+
+    def test_save_load_sparse(self):
+        world = World(1000, 1000)
+        world.set_alive(0, 0)
+        world.set_alive(999, 999)
+
+        world.save(self.path)
+        loaded = World.load(self.path)
+
+        self.assertEqual(self.encoding(), snapshot.SPARSE)
+        self.assertLess(os.path.getsize(self.path), 100)
+        self.assertCountEqual(loaded.alives, ((0, 0), (999, 999)))
+
+    def test_save_load_empty(self):
+        World(10, 10).save(self.path)
+
+        self.assertEqual(World.load(self.path).alives, tuple())
+
+    def test_load_other_class(self):
+        classes = [World, BitWorld]
+        if model.numpy is not None:
+            classes.append(DenseWorld)
+        for save_cls in classes:
+            for load_cls in classes:
+                world = random_soup(save_cls(29, 13), 0.5, 2)
+                world.save(self.path)
+
+                loaded = load_cls.load(self.path)
+
+                self.assertIsInstance(loaded, load_cls)
+                self.assertEqual(set(loaded.alives), set(world.alives))
+
+    @unittest.skipIf(parallel.SharedMemory is None, 'Shared memory needs Python 3.8')
+    def test_load_shared_memory_world(self):
+        world = random_soup(BitWorld(29, 13), 0.5, 2)
+        world.save(self.path)
+
+        with SharedMemoryWorld.load(self.path, workers=2) as loaded:
+            self.assertEqual(set(loaded.alives), set(world.alives))
+            loaded.save(self.path)
+
+        self.assertEqual(set(BitWorld.load(self.path).alives), set(world.alives))
+
+    def test_loaded_world_advances(self):
+        world = random_soup(World(30, 30, engine='incremental'), 0.3, 3)
+        world.save(self.path)
+        loaded = World.load(self.path, engine='incremental')
+
+        world.advance(generations=5)
+        loaded.advance(generations=5)
+
+        self.assertEqual(set(loaded.alives), set(world.alives))
+
+    def test_save_load_rule(self):
+        world = random_soup(BitWorld(20, 20, rule='B36/S23'), 0.4, 4)
+        world.save(self.path)
+
+        self.assertEqual(snapshot.read_header(self.path).rule, world.rule)
+        self.assertEqual(World.load(self.path).rule, world.rule)
+        self.assertEqual(BitWorld.load(self.path, rule='highlife').rule, world.rule)
+
+    def test_load_other_rule_error(self):
+        World(10, 10, rule='highlife').save(self.path)
+
+        with self.assertRaises(SnapshotError):
+            World.load(self.path, rule='B3/S23')
+
+    def test_load_unknown_rule_error(self):
+        world = World(10, 10)
+        world.save(self.path)
+        with open(self.path, 'r+b') as f:
+            f.seek(snapshot._HEADER.size + 1)
+            f.write(b'9')
+
+        with self.assertRaises(SnapshotError):
+            World.load(self.path)
+
+    def test_load_not_snapshot(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'x' * 100)
+
+        with self.assertRaises(SnapshotError):
+            World.load(self.path)
+
+    def test_load_too_short(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'GOLS')
+
+        with self.assertRaises(SnapshotError):
+            World.load(self.path)
+
+    def test_load_truncated(self):
+        random_soup(World(30, 30), 0.5, 3).save(self.path)
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+
+        with self.assertRaises(SnapshotError):
+            World.load(self.path)
@@ -0,0 +1,53 @@
+import threading
+import time
+from unittest import TestCase
+
+from game_of_life.stepper import Stepper
+
+
+class StepperTestCase(TestCase):
+
+    def test_invalid_delay(self):
+        with self.assertRaises(ValueError):
+            Stepper(lambda: None, delay=-1)
+
+    def test_take_latest_only(self):
+        count = iter(range(1000000))
+        stepper = Stepper(lambda: next(count), until=lambda n: n == 100)
+        stepper.start()
+        stepper.join(5)
+
+        self.assertFalse(stepper.is_alive())
+        self.assertEqual(stepper.take(), (100, True))
+        self.assertEqual(stepper.take(), (100, False))
+        self.assertGreater(stepper.dropped, 0)
+
+    def test_stop(self):
+        stepped = threading.Event()
+
+        def step():
+            stepped.set()
+            return 1
+
+        stepper = Stepper(step, delay=10)
+        stepper.start()
+        self.assertTrue(stepped.wait(5))
+
+        start = time.monotonic()
+        stepper.stop()
+
+        # The delay between steps is interrupted.
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertFalse(stepper.is_alive())
+
+    def test_step_error(self):
+        def step():
+            raise RuntimeError('boom')
+
+        stepper = Stepper(step)
+        with self.assertLogs('game_of_life.stepper', level='ERROR'):
+            stepper.start()
+            stepper.join(5)
+
+        self.assertIsInstance(stepper.error, RuntimeError)
+        self.assertEqual(stepper.take(), (None, False))
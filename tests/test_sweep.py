@@ -0,0 +1,188 @@
+import json
+import os
+import tempfile
+import unittest
+
+from game_of_life import sweep
+from game_of_life.model import World, RUNNING, DEAD, CYCLE, STILL
+from game_of_life.sweep import Job
+
+
+class JobTestCase(unittest.TestCase):
+
+    def test_make_jobs(self):
+        jobs = list(sweep.make_jobs([(10, 10), (20, 10)], [0.3, 0.5], range(3),
+                                    ['B3/S23', 'highlife']))
+
+        self.assertEqual(len(jobs), 2 * 2 * 3 * 2)
+        self.assertEqual(jobs[0], Job(10, 10, 0.3, 0, 'B3/S23'))
+        self.assertEqual(jobs[1], Job(10, 10, 0.3, 0, 'B36/S23'))
+        self.assertEqual(len(set(sweep.job_id(job) for job in jobs)), len(jobs))
+
+    def test_job_id(self):
+        self.assertEqual(sweep.job_id(Job(64, 32, 0.35, 7, 'B3/S23')), '64x32/0.35/7/B3/S23')
+
+    def test_soup_cells(self):
+        cells = sweep.soup_cells(30, 20, 0.4, 3)
+
+        self.assertEqual(cells, sweep.soup_cells(30, 20, 0.4, 3))
+        self.assertNotEqual(cells, sweep.soup_cells(30, 20, 0.4, 4))
+        self.assertTrue(all(0 <= x < 30 and 0 <= y < 20 for x, y in cells))
+        self.assertEqual(sweep.soup_cells(30, 20, 0, 3), [])
+
+
+class RunJobTestCase(unittest.TestCase):
+
+    def test_run_job_same_as_world(self):
+        job = Job(24, 24, 0.4, 5, 'B3/S23')
+        world = World(24, 24, engine='counting')
+        for x, y in sweep.soup_cells(24, 24, 0.4, 5):
+            world.set_alive(x, y)
+        world.advance(generations=10)
+
+        result = sweep.run_job(job, 10, engine='counting')
+
+        self.assertEqual(result['id'], sweep.job_id(job))
+        self.assertEqual(result['seed'], 5)
+        self.assertEqual(result['rule'], 'B3/S23')
+        self.assertEqual(result['generation'], 10)
+        self.assertEqual(result['population'], len(world.alives))
+
+    def test_run_job_running(self):
+        result = sweep.run_job(Job(32, 32, 0.35, 1, 'B3/S23'), 3)
+
+        self.assertEqual(result['status'], RUNNING)
+        self.assertIsNone(result['lifetime'])
+
+    def test_run_job_dead(self):
+        result = sweep.run_job(Job(10, 10, 0.0, 1, 'B3/S23'), 100)
+
+        self.assertEqual(result['status'], DEAD)
+        self.assertEqual(result['lifetime'], 0)
+        self.assertEqual(result['population'], 0)
+
+    def test_run_job_b0_empty_soup(self):
+        result = sweep.run_job(Job(8, 8, 0.0, 1, 'B0/S'), 100)
+
+        self.assertEqual(result['status'], CYCLE)
+        self.assertEqual(result['period'], 2)
+        self.assertEqual(result['lifetime'], 0)
+
+    def test_run_job_lifetime(self):
+        result = sweep.run_job(Job(32, 32, 0.35, 0, 'B3/S23'), 1000)
+        self.assertIn(result['status'], (STILL, CYCLE))
+
+        world = World(32, 32, engine='counting')
+        for x, y in sweep.soup_cells(32, 32, 0.35, 0):
+            world.set_alive(x, y)
+        world.advance(generations=result['lifetime'])
+        settled = set(world.alives)
+        world.advance(generations=result['period'])
+
+        self.assertEqual(set(world.alives), settled)
+
+
+class RunBatchTestCase(unittest.TestCase):
+
+    def test_run_batch_same_as_run_job(self):
+        jobs = list(sweep.make_jobs([(16, 16), (20, 12)], [0.0, 0.4], range(3),
+                                    ['B3/S23', 'highlife']))
+
+        results = sweep.run_batch(jobs, 40)
+
+        self.assertCountEqual([r['id'] for r in results], [sweep.job_id(job) for job in jobs])
+        for result in results:
+            expected = sweep.run_job(Job(*(result[f] for f in Job._fields)), 40)
+            if result['status'] == RUNNING:
+                self.assertEqual(result['population'], expected['population'])
+            else:
+                del result['seconds'], expected['seconds']
+                self.assertEqual(result, expected)
+
+    def test_run_batch_b0(self):
+        jobs = list(sweep.make_jobs([(8, 8)], [0.0, 0.3], range(3), ['B0/S', 'B0/S8']))
+
+        for result in sweep.run_batch(jobs, 50):
+            expected = sweep.run_job(Job(*(result[f] for f in Job._fields)), 50)
+            del result['seconds'], expected['seconds']
+            self.assertEqual(result, expected)
+
+    def test_run_batch_exact_cycles(self):
+        jobs = list(sweep.make_jobs([(64, 64)], [0.35], [3, 16, 17]))
+
+        for result in sweep.run_batch(jobs, 300):
+            expected = sweep.run_job(Job(*(result[f] for f in Job._fields)), 300)
+            self.assertEqual(result['status'], CYCLE)
+            self.assertEqual(result['period'], expected['period'])
+            self.assertEqual(result['lifetime'], expected['lifetime'])
+
+    def test_run_sweep_batch(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'results.jsonl')
+            jobs = list(sweep.make_jobs([(16, 16)], [0.3], range(6)))
+            stats = sweep.run_sweep(jobs, path, 50, engine='batch', workers=1, chunk_size=4)
+
+        self.assertEqual(stats.completed, 6)
+class RunSweepTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp_dir.name, 'results.jsonl')
+        self.jobs = list(sweep.make_jobs([(16, 16)], [0.3, 0.5], range(5)))
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def read_results(self):
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_run_sweep(self):
+        stats = sweep.run_sweep(iter(self.jobs), self.path, 50, workers=2, chunk_size=3)
+
+        results = self.read_results()
+        self.assertEqual(stats.completed, 10)
+        self.assertEqual(stats.skipped, 0)
+        self.assertCountEqual([r['id'] for r in results],
+                              [sweep.job_id(job) for job in self.jobs])
+        self.assertEqual(set(results[0]),
+                         set(Job._fields) | {'id', 'status', 'lifetime', 'period',
+                                             'generation', 'population', 'seconds'})
+
+    def test_run_sweep_same_as_run_job(self):
+        sweep.run_sweep(self.jobs[:2], self.path, 50, workers=1)
+
+        for result in self.read_results():
+            expected = sweep.run_job(Job(*(result[f] for f in Job._fields)), 50)
+            del result['seconds'], expected['seconds']
+            self.assertEqual(result, expected)
+
+    def test_run_sweep_resume(self):
+        sweep.run_sweep(self.jobs[:4], self.path, 50, workers=1)
+        # Interrupted while writing a result.
+        with open(self.path, 'a') as f:
+            f.write('{"id": "16x16/0.5/4')
+
+        stats = sweep.run_sweep(self.jobs, self.path, 50, workers=2, resume=True)
+
+        self.assertEqual(stats.completed, 6)
+        self.assertEqual(stats.skipped, 4)
+        self.assertCountEqual([r['id'] for r in self.read_results()],
+                              [sweep.job_id(job) for job in self.jobs])
+
+    def test_run_sweep_overwrites_without_resume(self):
+        sweep.run_sweep(self.jobs[:4], self.path, 50, workers=1)
+        sweep.run_sweep(self.jobs[:2], self.path, 50, workers=1)
+
+        self.assertEqual(len(self.read_results()), 2)
+
+    def test_completed_ids_missing_file(self):
+        self.assertEqual(sweep.completed_ids(self.path), set())
+
+    def test_run_sweep_error(self):
+        with self.assertRaises(ValueError):
+            sweep.run_sweep(self.jobs, self.path, 50, workers=0)
+        with self.assertRaises(ValueError):
+            sweep.run_sweep(self.jobs, self.path, 50, chunk_size=0)
+        with self.assertRaises(ValueError):
+            sweep.run_sweep(self.jobs, self.path, -1)
@@ -0,0 +1,232 @@
+import tkinter
+from unittest import TestCase, mock
+
+from game_of_life import cli, view
+from game_of_life.view import Grid, PixelGrid, create_grid, visible_size
+
+
+class GridTestCase(TestCase):
+
+    def setUp(self):
+        items = iter(range(1, 1000))
+        patches = (mock.patch.object(tkinter.Canvas, '__init__', return_value=None),
+                   mock.patch.object(tkinter.Canvas, 'bind'),
+                   mock.patch.object(tkinter.Canvas, 'create_rectangle',
+                                     side_effect=lambda *args, **kwargs: next(items)))
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+        # A Tcl interpreter without Tk, where the canvas is a command
+        # recording its arguments.
+        self.tcl = tkinter.Tcl()
+        self.tcl.eval('proc .grid {args} {lappend ::calls $args}')
+        self.grid = Grid(3, 2)
+        self.grid.tk = self.tcl.tk
+        self.grid._w = '.grid'
+
+    def calls(self):
+        calls = self.tcl.eval('if {[info exists ::calls]} {set ::calls}')
+        self.tcl.eval('set ::calls {}')
+        return [tuple(call.split()) for call in self.tcl.splitlist(calls)]
+
+    def test_set_alives_recolors_in_one_call_per_color(self):
+        self.grid.set_alives([(0, 0), (2, 1)])
+
+        self.assertEqual(sorted(self.calls()), [
+            ('itemconfigure', '1', '-fill', Grid.ALIVE_COLOR),
+            ('itemconfigure', '6', '-fill', Grid.ALIVE_COLOR),
+        ])
+        self.assertEqual(self.grid.itemconfig_calls, 1)
+
+        self.grid.set_alives([(2, 1), (1, 0)])
+
+        self.assertEqual(sorted(self.calls()), [
+            ('itemconfigure', '1', '-fill', Grid.DEAD_COLOR),
+            ('itemconfigure', '3', '-fill', Grid.ALIVE_COLOR),
+        ])
+        self.assertEqual(self.grid.itemconfig_calls, 3)
+
+    def test_apply_delta(self):
+        self.grid.set_alives([(0, 0), (2, 1)])
+        self.calls()
+
+        self.grid.apply_delta(births=[(1, 1)], deaths=[(0, 0)])
+
+        self.assertEqual(sorted(self.calls()), [
+            ('itemconfigure', '1', '-fill', Grid.DEAD_COLOR),
+            ('itemconfigure', '4', '-fill', Grid.ALIVE_COLOR),
+        ])
+        # The cells drawn are kept in sync for the next set_alives().
+        self.grid.set_alives([(1, 1), (2, 1)])
+        self.assertEqual(self.calls(), [])
+
+    def test_set_alives_unchanged(self):
+        self.grid.set_alives([(0, 0)])
+        self.calls()
+
+        self.grid.set_alives([(0, 0)])
+
+        self.assertEqual(self.calls(), [])
+        self.assertEqual(self.grid.itemconfig_calls, 1)
+
+
+class PixelGridTestCase(TestCase):
+
+    def setUp(self):
+        patches = (mock.patch.object(tkinter.Canvas, '__init__', return_value=None),
+                   mock.patch.object(tkinter.Canvas, 'bind'),
+                   mock.patch.object(tkinter.Canvas, 'create_image'),
+                   mock.patch('game_of_life.view.PhotoImage'))
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_constructor(self):
+        grid = PixelGrid(4, 3, cell_size=2)
+
+        view.PhotoImage.assert_called_once_with(width=8, height=6, master=grid)
+        grid._image.put.assert_called_once_with(PixelGrid.DEAD_COLOR, to=(0, 0, 8, 6))
+        with self.assertRaises(ValueError):
+            PixelGrid(4, 3, cell_size=0)
+
+    def test_set_alives_puts_runs_of_changed_rows(self):
+        grid = PixelGrid(4, 5)
+        grid._image.reset_mock()
+        a, d = PixelGrid.ALIVE_COLOR, PixelGrid.DEAD_COLOR
+
+        grid.set_alives([(1, 0), (3, 1), (2, 4)])
+
+        grid._image.put.assert_has_calls([
+            mock.call('{{{} {} {}}} {{{} {} {}}}'.format(a, d, d, d, d, a), to=(1, 0)),
+            mock.call('{{{}}}'.format(a), to=(2, 4)),
+        ])
+        self.assertEqual(grid._image.put.call_count, 2)
+        self.assertEqual(grid.itemconfig_calls, 2)
+
+    def test_set_alives_cell_size(self):
+        grid = PixelGrid(4, 5, cell_size=2)
+        grid._image.reset_mock()
+        a = PixelGrid.ALIVE_COLOR
+
+        grid.set_alives([(1, 2)])
+
+        row = '{{{0} {0}}}'.format(a)
+        grid._image.put.assert_called_once_with(row + ' ' + row, to=(2, 4))
+
+    def test_apply_delta(self):
+        grid = PixelGrid(4, 5)
+        grid.set_alives([(1, 0), (3, 1)])
+        grid._image.reset_mock()
+        a, d = PixelGrid.ALIVE_COLOR, PixelGrid.DEAD_COLOR
+
+        grid.apply_delta(births=[(2, 3)], deaths=[(3, 1)])
+
+        grid._image.put.assert_has_calls([
+            mock.call('{{{}}}'.format(d), to=(3, 1)),
+            mock.call('{{{}}}'.format(a), to=(2, 3)),
+        ])
+        self.assertEqual(grid._alive_cells, {(1, 0), (2, 3)})
+
+    def test_set_alives_unchanged(self):
+        grid = PixelGrid(4, 5)
+        grid.set_alives([(1, 2)])
+        grid._image.reset_mock()
+
+        grid.set_alives([(1, 2)])
+
+        grid._image.put.assert_not_called()
+
+    def test_zoom(self):
+        grid = PixelGrid(40, 20, cell_size=2)
+        grid.set_alives([(1, 2)])
+        grid._image.reset_mock()
+
+        self.assertTrue(grid.zoom(1))
+
+        self.assertEqual((grid.cell_size, grid.width, grid.height), (4, 20, 10))
+        grid._image.put.assert_called_once_with(PixelGrid.DEAD_COLOR, to=(0, 0, 80, 40))
+        # The cleared image gets all the cells again.
+        grid.set_alives([(1, 2)])
+        self.assertEqual(grid._image.put.call_count, 2)
+
+        self.assertTrue(grid.zoom(-5))
+        self.assertEqual((grid.cell_size, grid.width, grid.height), (1, 80, 40))
+        self.assertFalse(grid.zoom(-1))
+
+    def test_drag_emits_pan_events(self):
+        grid = PixelGrid(40, 20, cell_size=4)
+        with mock.patch.object(grid, 'event_generate') as m_event_generate:
+            grid._start_drag(mock.Mock(x=10, y=10))
+            grid._translate_drag_event(mock.Mock(x=12, y=10))
+            m_event_generate.assert_not_called()
+
+            grid._translate_drag_event(mock.Mock(x=19, y=1))
+            m_event_generate.assert_called_once_with('<<View-Pan>>', x=2, y=-2)
+
+            # The remainder of the drag is kept.
+            grid._translate_drag_event(mock.Mock(x=19, y=-2))
+            m_event_generate.assert_called_with('<<View-Pan>>', x=0, y=-1)
+
+    def test_get_cell_from_pixel_coor(self):
+        grid = PixelGrid(4, 5, cell_size=3)
+
+        self.assertEqual(grid._get_cell_from_pixel_coor(0, 0), (0, 0))
+        self.assertEqual(grid._get_cell_from_pixel_coor(11, 14), (3, 4))
+        self.assertIsNone(grid._get_cell_from_pixel_coor(12, 0))
+        self.assertIsNone(grid._get_cell_from_pixel_coor(0, 15))
+
+
+class CreateGridTestCase(TestCase):
+
+    @mock.patch('game_of_life.view.PixelGrid')
+    @mock.patch('game_of_life.view.Grid', CELL_SIZE=15)
+    def test_renderers(self, m_grid, m_pixel_grid):
+        self.assertEqual(create_grid(50, 50), m_grid.return_value)
+        self.assertEqual(create_grid(1000, 500), m_pixel_grid.return_value)
+        m_pixel_grid.assert_called_with(1000, 500, cell_size=1, master=None)
+        create_grid(50, 50, renderer='image')
+        m_pixel_grid.assert_called_with(50, 50, cell_size=15, master=None)
+        self.assertEqual(create_grid(1000, 500, renderer='canvas'), m_grid.return_value)
+
+        with self.assertRaises(ValueError):
+            create_grid(50, 50, renderer='foo')
+
+    def test_visible_size(self):
+        self.assertEqual(visible_size(50, 60), (50, 60))
+        self.assertEqual(visible_size(300, 50, renderer='canvas'), (100, 50))
+        self.assertEqual(visible_size(1000, 500), (800, 500))
+
+    def test_cli_renderers(self):
+        self.assertEqual(cli.RENDERERS, view.RENDERERS)
+
+
+class MainViewTestCase(TestCase):
+
+    def setUp(self):
+        # Only the Tk widgets are patched, so every widget class of the view
+        # is still built.
+        patches = [mock.patch.object(cls, '__init__', return_value=None)
+                   for cls in (tkinter.Frame, tkinter.Canvas, tkinter.Button, tkinter.Scale,
+                               tkinter.OptionMenu, tkinter.Label)]
+        patches += [mock.patch.object(tkinter.Canvas, 'bind'),
+                    mock.patch.object(tkinter.Canvas, 'create_rectangle'),
+                    mock.patch.object(tkinter.OptionMenu, '__getitem__'),
+                    mock.patch.object(tkinter.Grid, 'grid'),
+                    mock.patch.object(tkinter.Pack, 'pack'),
+                    mock.patch('game_of_life.view.StringVar')]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_constructor(self):
+        main_view = view.MainView(10, 8, ['Glider', 'Blinker'])
+
+        self.assertIsInstance(main_view.world_grid, Grid)
+        self.assertIsInstance(main_view.back_button, view.BackButton)
+        self.assertIsInstance(main_view.startstop_button, view.StartStopButton)
+        self.assertIsInstance(main_view.next_button, view.NextButton)
+        self.assertIsInstance(main_view.speed_slider, view.SpeedSlider)
+        self.assertIsInstance(main_view.pattern_option_menu, view.PatternOptionMenu)
+        self.assertIsInstance(main_view.generation_scale, view.GenerationScale)
+        tkinter.Pack.pack.assert_called_once_with()
@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+from game_of_life.viewport import Viewport
+
+
+class ViewportTestCase(TestCase):
+
+    def test_init(self):
+        viewport = Viewport(100, 50, 20, 10)
+
+        self.assertEqual(viewport.region, (40, 20, 60, 30))
+        self.assertFalse(viewport.covers_world)
+
+        with self.assertRaises(ValueError):
+            Viewport(0, 50, 20, 10)
+        with self.assertRaises(ValueError):
+            Viewport(100, 50, 20, 0)
+
+    def test_covers_world(self):
+        viewport = Viewport(10, 10, 20, 15)
+
+        self.assertTrue(viewport.covers_world)
+        self.assertEqual(viewport.region, (0, 0, 20, 15))
+
+    def test_pan_stays_in_world(self):
+        viewport = Viewport(100, 50, 20, 10)
+
+        viewport.pan(-5, 3)
+        self.assertEqual((viewport.x, viewport.y), (35, 23))
+
+        viewport.pan(-1000, 1000)
+        self.assertEqual((viewport.x, viewport.y), (0, 40))
+
+    def test_resize_keeps_center(self):
+        viewport = Viewport(100, 50, 20, 10)
+
+        viewport.resize(10, 6)
+        self.assertEqual(viewport.region, (45, 22, 55, 28))
+
+        viewport.resize(200, 100)
+        self.assertEqual(viewport.region, (0, 0, 200, 100))
+        self.assertTrue(viewport.covers_world)
+
+    def test_coordinates(self):
+        viewport = Viewport(100, 50, 20, 10)
+
+        self.assertEqual(viewport.to_world(1, 2), (41, 22))
+        self.assertEqual(viewport.to_view([(41, 22), (59, 29)]), [(1, 2), (19, 9)])
+        self.assertEqual(viewport.visible([(41, 22), (60, 22), (39, 25)]), [(1, 2)])